@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Mikro-benchmark GSCATRecord.from_bytes / to_bytes
+
+Porovnava povodne dekodovanie (struct.unpack na jednotlivych vyrezoch)
+s predkompilovanym struct.Struct (unpack_from / pack_into) a lazy
+GSCATView, ktory dekoduje len citane polia.
+
+Pouzitie: python scripts/benchmark_gscat_codec.py [pocet_zaznamov]
+"""
+
+import struct
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from models.gscat import GSCATRecord
+from models.views import GSCATView
+
+
+def legacy_from_bytes(data: bytes, encoding: str = 'cp852') -> GSCATRecord:
+    """Povodny GSCATRecord.from_bytes (pred prechodom na struct.Struct)"""
+    if len(data) < 705:
+        raise ValueError(f"Invalid record size: {len(data)} bytes (expected 705)")
+
+    gs_code = struct.unpack('<i', data[0:4])[0]
+    gs_name = str(data[4:84], encoding, 'ignore').rstrip('\x00 ')
+    gs_name2 = str(data[84:164], encoding, 'ignore').rstrip('\x00 ')
+    gs_short_name = str(data[164:194], encoding, 'ignore').rstrip('\x00 ')
+    mglst_code = struct.unpack('<i', data[194:198])[0]
+    unit = str(data[198:208], encoding, 'ignore').rstrip('\x00 ')
+    unit_coef = Decimal(str(struct.unpack('<d', data[208:216])[0]))
+    price_buy = Decimal(str(round(struct.unpack('<d', data[216:224])[0], 2)))
+    price_sell = Decimal(str(round(struct.unpack('<d', data[224:232])[0], 2)))
+    vat_rate = Decimal(str(round(struct.unpack('<d', data[232:240])[0], 1)))
+    stock_min = Decimal(str(round(struct.unpack('<d', data[240:248])[0], 2)))
+    stock_max = Decimal(str(round(struct.unpack('<d', data[248:256])[0], 2)))
+    stock_current = Decimal(str(round(struct.unpack('<d', data[256:264])[0], 2)))
+    active = bool(data[264])
+    discontinued = bool(data[265])
+    supplier_code = struct.unpack('<i', data[266:270])[0]
+    supplier_item_code = str(data[270:300], encoding, 'ignore').rstrip('\x00 ')
+    note = str(data[300:500], encoding, 'ignore').rstrip('\x00 ')
+    note2 = str(data[500:600], encoding, 'ignore').rstrip('\x00 ')
+    mod_user = str(data[600:608], encoding, 'ignore').rstrip('\x00 ')
+    mod_date_int = struct.unpack('<i', data[608:612])[0]
+    mod_date = GSCATRecord._decode_delphi_date(mod_date_int) if mod_date_int > 0 else None
+    mod_time_int = struct.unpack('<i', data[612:616])[0]
+    mod_time = GSCATRecord._decode_delphi_time(mod_time_int) if mod_time_int >= 0 else None
+    created_date_int = struct.unpack('<i', data[616:620])[0]
+    created_date = GSCATRecord._decode_delphi_date(created_date_int) if created_date_int > 0 else None
+    created_user = str(data[620:628], encoding, 'ignore').rstrip('\x00 ')
+
+    return GSCATRecord(
+        gs_code=gs_code, gs_name=gs_name, gs_name2=gs_name2, gs_short_name=gs_short_name,
+        mglst_code=mglst_code, unit=unit, unit_coef=unit_coef, price_buy=price_buy,
+        price_sell=price_sell, vat_rate=vat_rate, stock_min=stock_min, stock_max=stock_max,
+        stock_current=stock_current, active=active, discontinued=discontinued,
+        supplier_code=supplier_code, supplier_item_code=supplier_item_code, note=note,
+        note2=note2, mod_user=mod_user, mod_date=mod_date, mod_time=mod_time,
+        created_date=created_date, created_user=created_user,
+    )
+
+
+def legacy_to_bytes(record: GSCATRecord, encoding: str = 'cp852') -> bytes:
+    """Povodny GSCATRecord.to_bytes (po poliach cez slice a pack_into)"""
+    result = bytearray(705)
+    struct.pack_into('<i', result, 0, record.gs_code)
+    for offset, size, value in ((4, 80, record.gs_name), (84, 80, record.gs_name2),
+                                (164, 30, record.gs_short_name), (198, 10, record.unit),
+                                (270, 30, record.supplier_item_code), (300, 200, record.note),
+                                (500, 100, record.note2), (600, 8, record.mod_user),
+                                (620, 8, record.created_user)):
+        raw = value.encode(encoding)[:size]
+        result[offset:offset + len(raw)] = raw
+    struct.pack_into('<i', result, 194, record.mglst_code)
+    for offset, value in ((208, record.unit_coef), (216, record.price_buy), (224, record.price_sell),
+                          (232, record.vat_rate), (240, record.stock_min), (248, record.stock_max),
+                          (256, record.stock_current)):
+        struct.pack_into('<d', result, offset, float(value))
+    result[264] = 1 if record.active else 0
+    result[265] = 1 if record.discontinued else 0
+    struct.pack_into('<i', result, 266, record.supplier_code)
+    if record.mod_date:
+        struct.pack_into('<i', result, 608, record._encode_delphi_date(record.mod_date))
+    if record.mod_time:
+        struct.pack_into('<i', result, 612, record._encode_delphi_time(record.mod_time))
+    if record.created_date:
+        struct.pack_into('<i', result, 616, record._encode_delphi_date(record.created_date))
+    return bytes(result)
+
+
+def sample_records(count: int) -> list:
+    """Syntetické záznamy s vyplnenými textami, cenami a dátumami"""
+    records = []
+    for code in range(1, count + 1):
+        records.append(GSCATRecord(
+            gs_code=code,
+            gs_name=f"Produkt č. {code} - žltý kôň",
+            gs_short_name=f"P{code}",
+            mglst_code=code % 50 + 1,
+            unit='ks',
+            price_buy=Decimal(f"{code % 1000 / 7:.2f}"),
+            price_sell=Decimal(f"{code % 1000 / 5:.2f}"),
+            stock_current=Decimal(code % 37),
+            supplier_code=code % 300,
+            supplier_item_code=f"SUP-{code:06d}",
+            note='Poznámka' if code % 4 == 0 else '',
+            mod_user='ADMIN',
+            mod_date=datetime(2025, 1, 1 + code % 28),
+            mod_time=datetime(2025, 1, 1, 10, 30),
+            created_date=datetime(2020, 6, 15),
+        ).to_bytes())
+    return records
+
+
+def read_view(data) -> tuple:
+    """Typicky pristup - PLU, nazov a nakupna cena"""
+    view = GSCATView(data)
+    return view.gs_code, view.gs_name, view.price_buy
+
+
+def measure(label: str, func, items: list, repeat: int = 3) -> float:
+    """Najlepsi cas z repeat behov, vypise zaznamy/s"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = len(items) / best
+    print(f"{label:<36} {best:>10.3f} {rate:>14,.0f}")
+    return rate
+
+
+def main():
+    """Hlavna funkcia"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    raw_records = sample_records(count)
+    views = [memoryview(data) for data in raw_records]
+
+    # Kontrola zhody (mod_time zavisi od datetime.now() - porovnava sa bez neho)
+    for data in raw_records[:1000]:
+        old, new = legacy_from_bytes(data), GSCATRecord.from_bytes(data)
+        old.mod_time = new.mod_time = None
+        if old != new:
+            print(f"❌ Rozdielny výsledok dekódovania: {old} / {new}")
+            return 1
+        if legacy_to_bytes(new) != new.to_bytes():
+            print(f"❌ Rozdielny výsledok kódovania: {new}")
+            return 1
+
+    decoded = [GSCATRecord.from_bytes(data) for data in raw_records]
+
+    print(f"GSCAT záznamov: {count}\n")
+    print(f"{'Variant':<36} {'Čas [s]':>10} {'Záznamov/s':>14}")
+    print("-" * 62)
+    old = measure('from_bytes povodny (bytes)', legacy_from_bytes, raw_records)
+    new = measure('from_bytes Struct (bytes)', GSCATRecord.from_bytes, raw_records)
+    measure('from_bytes Struct (memoryview)', GSCATRecord.from_bytes, views)
+    measure('GSCATView (3 polia)', read_view, views)
+    print(f"{'  zrýchlenie':<36} {'':>10} {new / old:>13.2f}x")
+    old = measure('to_bytes povodny', legacy_to_bytes, decoded)
+    new = measure('to_bytes Struct', GSCATRecord.to_bytes, decoded)
+    print(f"{'  zrýchlenie':<36} {'':>10} {new / old:>13.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+r"""
+Benchmark plneho prechodu GSCAT.BTR
+
+Porovnava:
+  1. get_first/get_next cez bytes API (povodny sposob)
+  2. iter_records v poradi kluca GsCode (Get First/Next)
+  3. iter_records vo fyzickom poradi (Step First/Next)
+  4. iter_extended - Step Next Extended s projekciou GsCode + BarCode
+
+Pouzitie: python scripts/benchmark_gscat_scan.py [nex_path]
+          python scripts/benchmark_gscat_scan.py --fake [pocet_produktov]
+"""
+
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from btrieve.btrieve_client import BtrieveClient
+from btrieve.extended import ExtractField
+from models.gscat import GSCATRecord
+
+
+def scan_legacy(client: BtrieveClient, path: str) -> int:
+    """Povodny get_first/get_next cyklus"""
+    status, pos_block = client.open_file(path)
+    if status != BtrieveClient.STATUS_SUCCESS:
+        raise RuntimeError(f"Failed to open {path}: {client.get_status_message(status)}")
+
+    count = 0
+    try:
+        status, data = client.get_first(pos_block, key_num=0)
+        while status == BtrieveClient.STATUS_SUCCESS:
+            count += 1
+            status, data = client.get_next(pos_block)
+    finally:
+        client.close_file(pos_block)
+    return count
+
+
+def scan_keyed(client: BtrieveClient, path: str) -> int:
+    """iter_records v poradi kluca GsCode"""
+    return sum(1 for _ in client.iter_records(path, key_num=GSCATRecord.KEY_GSCODE, copy=False,
+                                              record_length=GSCATRecord.RECORD_SIZE))
+
+
+def scan_physical(client: BtrieveClient, path: str) -> int:
+    """iter_records vo fyzickom poradi (Step operacie)"""
+    return sum(1 for _ in client.iter_records(path, physical=True, copy=False,
+                                              record_length=GSCATRecord.RECORD_SIZE))
+
+
+def scan_extended(client: BtrieveClient, path: str) -> int:
+    """iter_extended - davky zaznamov len s GsCode a BarCode"""
+    fields = [ExtractField(0, 4), ExtractField(GSCATRecord.BAR_CODE_OFFSET, GSCATRecord.BAR_CODE_SIZE)]
+    return sum(len(batch) for batch in client.iter_extended(path, fields,
+                                                            record_length=GSCATRecord.RECORD_SIZE))
+
+
+def run(client: BtrieveClient, path: str, repeat: int = 3) -> None:
+    """Spusti vsetky varianty a vypise zaznamy/s"""
+    print(f"{'Variant':<32} {'Zaznamov':>10} {'Cas [s]':>10} {'Zaznamov/s':>14}")
+    print("-" * 70)
+    for name, scan in (('get_first/get_next (bytes)', scan_legacy),
+                       ('iter_records (GsCode)', scan_keyed),
+                       ('iter_records (Step)', scan_physical),
+                       ('iter_extended (GsCode+BarCode)', scan_extended)):
+        best = None
+        count = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = scan(client, path)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{name:<32} {count:>10} {best:>10.3f} {count / best if best else 0:>14,.0f}")
+
+
+def run_path(client: BtrieveClient, nex_path: Path) -> None:
+    """Benchmark GSCAT.BTR v NEX adresari"""
+    gscat_path = str(Path(nex_path) / 'STORES' / 'GSCAT.BTR')
+    print(f"GSCAT.BTR: {gscat_path}\n")
+    run(client, gscat_path)
+
+
+def main():
+    """Hlavna funkcia"""
+    if len(sys.argv) > 1 and sys.argv[1] == '--fake':
+        from fake_nex_catalog import build_fake_nex
+
+        products = int(sys.argv[2]) if len(sys.argv) > 2 else 80000
+        print(f"Generujem syntetický katalóg ({products} produktov)...")
+        engine, nex_path = build_fake_nex(products)
+        try:
+            run_path(BtrieveClient(backend=engine), nex_path)
+        finally:
+            shutil.rmtree(nex_path, ignore_errors=True)
+    else:
+        nex_path = Path(sys.argv[1] if len(sys.argv) > 1 else r"C:\NEX\YEARACT")
+        run_path(BtrieveClient(), nex_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+r"""
+Benchmark NexLookupService.lookup_by_ean nad nahratymi Btrieve volaniami
+
+Rezimy:
+  --fake [produktov]           syntetický katalóg, nahrá volania a prehrá ich
+                               s rôznou latenciou (0 / 0.1 ms / 1 ms na volanie)
+  --record subor.json [nex]    nahrá volania nad skutočným Pervasive DLL
+                               (Windows) - EAN z GSCAT.BTR + neexistujúce EAN
+  --replay subor.json [ms]     prehrá nahrávku (bez ms = nahrané časy volaní)
+
+Pouzitie: python scripts/benchmark_nex_lookup.py --fake 20000
+          python scripts/benchmark_nex_lookup.py --record lookup.json C:\NEX\YEARACT
+          python scripts/benchmark_nex_lookup.py --replay lookup.json 0.2
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from btrieve.backends import RecordingBackend, ReplayBackend
+from btrieve.btrieve_client import BtrieveClient
+from btrieve.instrumentation import InstrumentedBackend
+from business.nex_lookup_service import NexLookupService
+from models.gscat import GSCATRecord
+
+LOOKUPS = 1000
+
+
+def run_lookups(nex_path: Path, client: BtrieveClient, eans: List[str]) -> Tuple[float, int]:
+    """Vyhlada vsetky EAN, vrati (cas v sekundach, pocet najdenych)"""
+    service = NexLookupService(str(nex_path), client=client)
+    try:
+        start = time.perf_counter()
+        hits = sum(1 for ean in eans if service.lookup_by_ean(ean))
+        return time.perf_counter() - start, hits
+    finally:
+        service.close()
+
+
+def empty_nex_dir() -> Path:
+    """Prazdny YEARACT adresar pre prehravanie (NexLookupService overuje cesty)"""
+    nex_path = Path(tempfile.mkdtemp(prefix='replay_nex_'))
+    stores = nex_path / 'STORES'
+    stores.mkdir()
+    for name in ('GSCAT.BTR', 'BARCODE.BTR'):
+        (stores / name).touch()
+    return nex_path
+
+
+def report(label: str, eans: List[str], elapsed: float, hits: int) -> None:
+    """Vypise riadok vysledkov"""
+    print(f"{label:<20} {len(eans):>8} {hits:>8} {elapsed:>10.3f} {len(eans) / elapsed:>12,.0f}")
+
+
+def replay(backend: ReplayBackend, eans: List[str]) -> None:
+    """Prehra nahrane volania a vypise vysledok"""
+    nex_path = empty_nex_dir()
+    try:
+        elapsed, hits = run_lookups(nex_path, BtrieveClient(backend=backend), eans)
+    finally:
+        shutil.rmtree(nex_path, ignore_errors=True)
+    latency = backend.latency
+    report('nahrané časy' if latency is None else f"{latency * 1000:.1f} ms/volanie", eans, elapsed, hits)
+
+
+def print_operations(instrumented: InstrumentedBackend, lookups: int) -> None:
+    """Vypise pocet Btrieve volani na jeden lookup podla operacie"""
+    print(f"\n{'Operácia':<20} {'Volaní/lookup':>14} {'p50 [ms]':>10} {'p99 [ms]':>10}")
+    print("-" * 58)
+    for name, stats in instrumented.snapshot()['operations'].items():
+        print(f"{name:<20} {stats['count'] / lookups:>14.2f} {stats['p50_ms']:>10.4f} {stats['p99_ms']:>10.4f}")
+    print()
+
+
+def fake_workload(products: int) -> List[str]:
+    """EAN zo syntetickeho katalogu - GSCAT, BARCODE aj neexistujuce"""
+    from fake_nex_catalog import barcode_ean, gscat_ean
+
+    step = max(products // LOOKUPS, 1)
+    eans = []
+    for i, code in enumerate(range(1, products + 1, step)):
+        if i % 3 == 0:
+            eans.append(gscat_ean(code | 1))
+        elif i % 3 == 1:
+            eans.append(barcode_ean(code - (code - 1) % 3))
+        else:
+            eans.append(f"000{code:010d}")
+    return eans[:LOOKUPS]
+
+
+def nex_workload(client: BtrieveClient, nex_path: Path) -> List[str]:
+    """EAN z GSCAT.BTR doplnene o neexistujuce EAN"""
+    gscat_path = nex_path / 'STORES' / 'GSCAT.BTR'
+    eans = []
+    for ean in client.iter_records(str(gscat_path), decoder=GSCATRecord.read_bar_code,
+                                   record_length=GSCATRecord.RECORD_SIZE):
+        if ean:
+            eans.append(ean)
+        if len(eans) >= LOOKUPS * 9 // 10:
+            break
+    eans += [f"000{i:010d}" for i in range(LOOKUPS - len(eans))]
+    return eans
+
+
+def main():
+    """Hlavna funkcia"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ('--fake', '--record', '--replay'):
+        print(__doc__)
+        return 1
+
+    print(f"{'Latencia':<20} {'Lookupov':>8} {'Nájdené':>8} {'Čas [s]':>10} {'Lookupov/s':>12}")
+    print("-" * 62)
+
+    if sys.argv[1] == '--fake':
+        from fake_nex_catalog import build_fake_nex
+
+        products = int(sys.argv[2]) if len(sys.argv) > 2 else 80000
+        engine, nex_path = build_fake_nex(products)
+        eans = fake_workload(products)
+
+        instrumented = InstrumentedBackend(engine)
+        recording = RecordingBackend(instrumented)
+        try:
+            elapsed, hits = run_lookups(nex_path, BtrieveClient(backend=recording), eans)
+        finally:
+            shutil.rmtree(nex_path, ignore_errors=True)
+        report('fake engine', eans, elapsed, hits)
+        print_operations(instrumented, len(eans))
+        for latency in (0.0, 0.0001, 0.001):
+            replay(ReplayBackend(recording.calls, latency=latency), eans)
+        return 0
+
+    if len(sys.argv) < 3:
+        print(__doc__)
+        return 1
+    path = Path(sys.argv[2])
+
+    if sys.argv[1] == '--record':
+        nex_path = Path(sys.argv[3] if len(sys.argv) > 3 else r"C:\NEX\YEARACT")
+        client = BtrieveClient()
+        eans = nex_workload(client, nex_path)
+
+        recording = RecordingBackend(client.backend)
+        elapsed, hits = run_lookups(nex_path, BtrieveClient(backend=recording), eans)
+        report('Pervasive DLL', eans, elapsed, hits)
+        recording.save(path, metadata={'eans': eans, 'nex_path': str(nex_path)})
+        print(f"\n✅ Nahrávka uložená: {path} ({len(recording.calls)} volaní)")
+        return 0
+
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else None
+    backend = ReplayBackend.load(path, latency=latency)
+    replay(backend, backend.metadata['eans'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Pamatova narocnost reprezentacii NEX Genesis zaznamov
+
+Pre GSCAT, BARCODE, MGLST a PAB porovna bajty na zaznam (tracemalloc):
+- dataclass (from_bytes - Money ceny, datetime datumy, __dict__)
+- compact trieda so __slots__ (ceny v centoch, Delphi int datumy)
+- surove bytes zaznamu
+- GSCAT aj lazy view a NumPy struktururovane pole
+
+Pouzitie: python scripts/benchmark_record_memory.py [pocet_zaznamov]
+"""
+
+import sys
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, List
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from models.barcode import BarcodeRecord
+from models.bulk import NUMPY_AVAILABLE, gscat_array
+from models.compact import CompactBarcode, CompactGSCAT, CompactMGLST, CompactPAB
+from models.gscat import GSCATRecord
+from models.mglst import MGLSTRecord
+from models.pab import PABRecord
+from models.views import GSCATView
+
+MODIFIED = datetime(2025, 3, 14, 9, 30)
+CREATED = datetime(2021, 6, 1)
+
+
+def gscat_rows(count: int) -> List[bytes]:
+    """GSCAT zaznamy s typickym obsahom (nazov, jednotka, ceny, datumy)"""
+    return [GSCATRecord(
+        gs_code=code,
+        gs_name=f"Produkt {code} balenie {code % 12 + 1} ks",
+        gs_short_name=f"PROD{code}",
+        mglst_code=code % 120 + 1,
+        unit=('ks', 'kg', 'bal', 'm')[code % 4],
+        price_buy=Decimal(code % 5000) / 7,
+        price_sell=Decimal(code % 5000) / 5,
+        stock_current=Decimal(code % 300),
+        supplier_code=code % 400 + 1,
+        supplier_item_code=f"D{code:07d}",
+        note='Sezónny tovar' if code % 10 == 0 else '',
+        mod_user='ADMIN',
+        mod_date=MODIFIED,
+        mod_time=MODIFIED,
+        created_date=CREATED,
+        created_user='IMPORT',
+    ).to_bytes() for code in range(1, count + 1)]
+
+
+def barcode_rows(count: int) -> List[bytes]:
+    return [BarcodeRecord(gs_code=code, bar_code=f"859{code:010d}", mod_user='ADMIN',
+                          mod_date=MODIFIED, mod_time=MODIFIED).to_bytes()
+            for code in range(1, count + 1)]
+
+
+def mglst_rows(count: int) -> List[bytes]:
+    rows = []
+    for code in range(1, count + 1):
+        data = bytearray(472)
+        data[0:4] = code.to_bytes(4, 'little')
+        name = f"Skupina {code}".encode('cp852')
+        data[4:4 + len(name)] = name
+        data[114:118] = (code // 10).to_bytes(4, 'little')
+        data[118:122] = (1 if code < 10 else 2).to_bytes(4, 'little')
+        rows.append(bytes(data))
+    return rows
+
+
+def pab_rows(count: int) -> List[bytes]:
+    rows = []
+    for code in range(1, count + 1):
+        data = bytearray(PABRecord.RECORD_SIZE)
+        data[0:4] = code.to_bytes(4, 'little')
+        for offset, text in ((4, f"Partner {code} s.r.o."), (244, f"Hlavná {code}"),
+                             (324, 'Bratislava'), (374, '81101'), (384, 'SK'),
+                             (664, f"{code:08d}")):
+            raw = text.encode('cp852')
+            data[offset:offset + len(raw)] = raw
+        rows.append(bytes(data))
+    return rows
+
+
+def measure(build: Callable[[], object], count: int) -> float:
+    """Bajty na zaznam alokovane pri vytvoreni reprezentacie"""
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size / count
+
+
+def touched_views(rows: List[bytes]) -> List[GSCATView]:
+    """Views po citani PLU, nazvu a nakupnej ceny"""
+    views = [GSCATView(data) for data in rows]
+    for view in views:
+        view.gs_code, view.gs_name, view.price_buy
+    return views
+
+
+def main():
+    """Hlavna funkcia"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    tables = [
+        ('GSCAT', gscat_rows(count), GSCATRecord, CompactGSCAT),
+        ('BARCODE', barcode_rows(count), BarcodeRecord, CompactBarcode),
+        ('MGLST', mglst_rows(count), MGLSTRecord, CompactMGLST),
+        ('PAB', pab_rows(count), PABRecord, CompactPAB),
+    ]
+
+    print(f"Záznamov na tabuľku: {count}\n")
+    print(f"{'Tabuľka':<10} {'Reprezentácia':<28} {'Bajtov/záznam':>14} {'MB / 100k':>10}")
+    print("-" * 66)
+    for table, rows, record_class, compact_class in tables:
+        results = [
+            ('dataclass', measure(lambda: [record_class.from_bytes(data) for data in rows], count)),
+            ('compact __slots__', measure(lambda: [compact_class.from_bytes(data) for data in rows], count)),
+            ('surové bytes', measure(lambda: [bytes(memoryview(data)) for data in rows], count)),
+        ]
+        if table == 'GSCAT':
+            results.append(('lazy view (bez bytes)', measure(lambda: [GSCATView(data) for data in rows], count)))
+            results.append(('lazy view (3 polia)', measure(lambda: touched_views(rows), count)))
+            if NUMPY_AVAILABLE:
+                results.append(('numpy štruktúrované pole', measure(lambda: gscat_array(rows), count)))
+
+        for label, per_record in results:
+            print(f"{table:<10} {label:<28} {per_record:>14,.0f} {per_record * 100000 / 2**20:>10.1f}")
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+r"""
+Synteticky NEX Genesis katalog nad FakeBtrieveEngine
+Pouziva sa v benchmark skriptoch na Linuxe (bez Pervasive DLL)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from btrieve.fake_engine import FakeBtrieveEngine
+from business.nex_lookup_service import GSCAT_KEYS, BARCODE_KEYS
+from models.barcode import BarcodeRecord
+from models.gscat import GSCATRecord
+
+
+def gscat_ean(gs_code: int) -> str:
+    """Primarny EAN produktu (kazdy druhy produkt ho nema)"""
+    return f"859{gs_code:010d}" if gs_code % 2 else ""
+
+
+def barcode_ean(gs_code: int) -> str:
+    """Druhotny EAN v BARCODE.BTR"""
+    return f"777{gs_code:010d}"
+
+
+def gscat_record(gs_code: int) -> bytes:
+    """Raw GSCAT zaznam s primarnym EAN v poli BarCode"""
+    record = GSCATRecord(
+        gs_code=gs_code,
+        mglst_code=gs_code % 50 + 1,
+        unit='ks',
+        price_buy=round(gs_code % 1000 / 7, 2),
+        price_sell=round(gs_code % 1000 / 5, 2),
+    )
+    data = bytearray(record.to_bytes())
+
+    ean = gscat_ean(gs_code).encode('ascii')
+    offset = GSCATRecord.BAR_CODE_OFFSET
+    data[offset] = len(ean)
+    data[offset + 1:offset + GSCATRecord.BAR_CODE_SIZE] = ean.ljust(GSCATRecord.BAR_CODE_SIZE - 1, b'\x00')
+
+    name = f"Produkt {gs_code}".encode('cp852')
+    data[4:4 + len(name)] = name
+    return bytes(data)
+
+
+def build_fake_nex(products: int = 80000, barcode_every: int = 3,
+                   nex_path: Path = None) -> Tuple[FakeBtrieveEngine, Path]:
+    """
+    Vytvori FakeBtrieveEngine s GSCAT.BTR a BARCODE.BTR
+
+    Na disku vytvori prazdne GSCAT.BTR/BARCODE.BTR (NexLookupService overuje cesty).
+
+    Returns:
+        (engine, nex_path)
+    """
+    nex_path = Path(nex_path or tempfile.mkdtemp(prefix='fake_nex_'))
+    stores = nex_path / 'STORES'
+    stores.mkdir(parents=True, exist_ok=True)
+
+    engine = FakeBtrieveEngine()
+    for name in ('GSCAT.BTR', 'BARCODE.BTR'):
+        (stores / name).touch()
+
+    engine.add_file(
+        str(stores / 'GSCAT.BTR'), GSCAT_KEYS,
+        (gscat_record(code) for code in range(1, products + 1)),
+        record_length=GSCATRecord.RECORD_SIZE,
+    )
+    engine.add_file(
+        str(stores / 'BARCODE.BTR'), BARCODE_KEYS,
+        (BarcodeRecord(code, barcode_ean(code)).to_bytes() for code in range(1, products + 1, barcode_every)),
+    )
+    return engine, nex_path
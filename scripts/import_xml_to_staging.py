@@ -17,7 +17,9 @@ import os
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from database.postgres_client import PostgresClient
+from business.ean_index_file import default_cache_dir
 from business.nex_lookup_service import NexLookupService
+from models.text import clean_text
 from utils.config import Config
 
 
@@ -32,16 +34,8 @@ def clean_string(value):
     if not isinstance(value, str):
         return value
 
-    # Remove null bytes
-    cleaned = value.replace('\x00', '')
-
-    # Remove other control characters (except newline, tab)
-    cleaned = ''.join(char for char in cleaned if ord(char) >= 32 or char in '\n\t')
-
-    # Strip excess whitespace
-    cleaned = cleaned.strip()
-
-    return cleaned if cleaned else None
+    # Null bytes, control characters (except newline, tab), excess whitespace
+    return clean_text(value)
 
 
 def parse_isdoc_xml(xml_path: str):
@@ -134,7 +128,7 @@ def import_to_database(xml_path: str, config_path: str = 'config/config.yaml'):
 
     # NEX lookup service
     print("Initializing NEX lookup service...")
-    nex_service = NexLookupService()
+    nex_service = NexLookupService(use_index=True, index_dir=str(default_cache_dir()))
 
     # Parse XML
     print("Parsing XML...")
@@ -178,13 +172,16 @@ def import_to_database(xml_path: str, config_path: str = 'config/config.yaml'):
             found_count = 0
             missing_count = 0
 
+            # Vsetky EAN faktury naraz
+            lookups = nex_service.lookup_many(item['ean'] for item in items if item['ean'])
+            print(f"NEX lookup: {lookups['stats']['found']}/{lookups['stats']['unique']} EAN found "
+                  f"({lookups['stats']['mode']}, {lookups['stats']['seconds']:.3f}s)")
+
             for item in items:
                 ean = item['ean']
 
                 # NEX lookup
-                nex_data = None
-                if ean:
-                    nex_data = nex_service.lookup_by_ean(ean)
+                nex_data = lookups['results'].get(ean.strip()) if ean else None
 
                 if nex_data:
                     found_count += 1
@@ -20,6 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 from btrieve.btrieve_client import BtrieveClient
 from models.barcode import BarcodeRecord
 from models.gscat import GSCATRecord
+from business.nex_lookup_service import NexLookupService
 
 
 class BarcodeLookupService:
@@ -228,6 +229,10 @@ class BarcodeLookupService:
         print(f"\nKontrolujem {len(items)} poloziek v NEX Genesis...")
         print("-" * 100)
 
+        # Vsetky EAN naraz - jeden prechod katalogu namiesto vyhladania pre kazdu polozku
+        lookups = NexLookupService(str(self.nex_path)).lookup_many(item.get('ean', '') for item in items)
+        results['stats'] = lookups['stats']
+
         for idx, item in enumerate(items, 1):
             ean = item.get('ean', '').strip()
             name = item.get('name', 'N/A')
@@ -245,19 +250,18 @@ class BarcodeLookupService:
                 continue
 
             # Lookup v NEX Genesis
-            result = self.lookup_by_ean(ean)
+            product = lookups['results'].get(ean)
 
-            if result:
-                barcode, product = result
+            if product:
                 status_icon = "OK"
                 status = "found"
                 results['found'] += 1
 
                 # Zisti ci nasiel priamo v GSCAT alebo cez BARCODE
-                source = "GSCAT" if barcode is None else "BARCODE"
+                source = product['source']
 
                 print(
-                    f"  {idx}. {status_icon} {name[:50]:<50} PLU: {product.gs_code:>6} | {product.gs_name[:30]} ({source})")
+                    f"  {idx}. {status_icon} {name[:50]:<50} PLU: {product['plu']:>6} | {product['name'][:30]} ({source})")
 
                 results['items'].append({
                     'index': idx,
@@ -265,12 +269,12 @@ class BarcodeLookupService:
                     'ean': ean,
                     'status': status,
                     'in_nex': True,
-                    'plu': product.gs_code,
-                    'nex_name': product.gs_name,
-                    'nex_price_buy': float(product.price_buy),
-                    'nex_price_sell': float(product.price_sell),
-                    'nex_unit': product.unit,
-                    'nex_category': product.mglst_code,
+                    'plu': product['plu'],
+                    'nex_name': product['name'],
+                    'nex_price_buy': product['price_buy'],
+                    'nex_price_sell': product['price_sell'],
+                    'nex_unit': product['unit'],
+                    'nex_category': product['category'],
                     'found_in': source
                 })
             else:
@@ -293,6 +297,9 @@ class BarcodeLookupService:
         print(f"   Celkom poloziek:   {results['total']}")
         print(f"   OK Najdene v NEX:  {results['found']} ({results['found'] / results['total'] * 100:.1f}%)")
         print(f"   MISSING Nie su v NEX: {results['not_found']} ({results['not_found'] / results['total'] * 100:.1f}%)")
+        stats = results['stats']
+        print(f"   Vyhladavanie:      {stats['unique']} EAN, GSCAT {stats['gscat']} / BARCODE {stats['barcode']}, "
+              f"rezim {stats['mode']}, {stats['seconds']:.3f} s")
 
         return results
 
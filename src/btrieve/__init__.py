@@ -1,4 +1,3 @@
-# src/btrieve/__init__.py
 """
 Btrieve Client Module
 
@@ -6,10 +5,93 @@ Python wrapper pre Pervasive PSQL Btrieve API
 """
 
 from .btrieve_client import BtrieveClient, open_btrieve_file
+from .engine import (
+    BtrieveBackend,
+    BtrieveEngine,
+    get_configured_backend,
+    get_default_backend,
+    get_engine,
+    set_default_backend,
+    shutdown_engine,
+)
+from .registry import OpenFileRegistry, get_file_registry, shutdown_btrieve
+from .instrumentation import (
+    CallStats,
+    InstrumentedBackend,
+    enable_instrumentation,
+    get_instrumentation,
+)
+from .session import SessionBackend, make_client_id, session_client, thread_client
+from .extended import (
+    ExtractField,
+    FilterTerm,
+    EXT_EQUAL,
+    EXT_GREATER,
+    EXT_LESS,
+    EXT_NOT_EQUAL,
+    EXT_GREATER_OR_EQUAL,
+    EXT_LESS_OR_EQUAL,
+    EXT_CASE_INSENSITIVE,
+)
+from .fake_engine import FakeBtrieveEngine
+from .file_stat import BtrieveFileStat, FileFingerprint, KeySegment
+from .backends import RecordedCall, RecordingBackend, ReplayBackend
+from .keys import (
+    KeySpec,
+    KEY_TYPE_STRING,
+    KEY_TYPE_INTEGER,
+    KEY_TYPE_FLOAT,
+    KEY_TYPE_LSTRING,
+    KEY_TYPE_ZSTRING,
+    KEY_TYPE_UNSIGNED_BINARY,
+    KEY_TYPE_AUTOINCREMENT,
+)
 
 __all__ = [
     'BtrieveClient',
     'open_btrieve_file',
+    'BtrieveBackend',
+    'BtrieveEngine',
+    'get_configured_backend',
+    'get_default_backend',
+    'set_default_backend',
+    'get_engine',
+    'shutdown_engine',
+    'OpenFileRegistry',
+    'get_file_registry',
+    'shutdown_btrieve',
+    'CallStats',
+    'InstrumentedBackend',
+    'enable_instrumentation',
+    'get_instrumentation',
+    'SessionBackend',
+    'make_client_id',
+    'session_client',
+    'thread_client',
+    'ExtractField',
+    'FilterTerm',
+    'EXT_EQUAL',
+    'EXT_GREATER',
+    'EXT_LESS',
+    'EXT_NOT_EQUAL',
+    'EXT_GREATER_OR_EQUAL',
+    'EXT_LESS_OR_EQUAL',
+    'EXT_CASE_INSENSITIVE',
+    'FakeBtrieveEngine',
+    'BtrieveFileStat',
+    'FileFingerprint',
+    'KeySegment',
+    'RecordedCall',
+    'RecordingBackend',
+    'ReplayBackend',
+    'KeySpec',
+    'KEY_TYPE_STRING',
+    'KEY_TYPE_INTEGER',
+    'KEY_TYPE_FLOAT',
+    'KEY_TYPE_LSTRING',
+    'KEY_TYPE_ZSTRING',
+    'KEY_TYPE_UNSIGNED_BINARY',
+    'KEY_TYPE_AUTOINCREMENT',
 ]
 
 __version__ = '0.2.1'
\ No newline at end of file
@@ -0,0 +1,245 @@
+"""
+Alternative BTRCALL backends for BtrieveClient
+
+- FileBackend: read-only access to .BTR files through BtrieveFileReader
+  (experimental, not exported from btrieve - see btrieve.file_reader)
+- RecordingBackend: wraps another backend and captures every call
+- ReplayBackend: serves a captured call sequence with configurable latency
+
+Recording lookups against the real DLL once and replaying them elsewhere
+gives reproducible performance tests without Pervasive installed.
+"""
+import ctypes
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .btrieve_client import BtrieveClient
+from .engine import BtrieveBackend
+from .fake_engine import FakeBtrieveEngine, FakeBtrieveFile, _deref
+from .file_reader import BtrieveFileReader
+from .keys import KeySpec
+
+RECORDING_VERSION = 1
+
+
+class FileBackend(FakeBtrieveEngine):
+    """
+    Read-only backend loading .BTR files from disk on open
+
+    Experimental: the page parser has not been verified on a real NEX file,
+    import it from btrieve.backends explicitly (not exported from btrieve).
+
+    Records are copied into memory when a file is first opened. Each later
+    Open checks mtime/size and loads the file again if it changed; cursors
+    opened before keep the previous contents.
+    """
+
+    def __init__(self, keys: Optional[Dict[str, Dict[int, KeySpec]]] = None,
+                 reader: Optional[BtrieveFileReader] = None):
+        """
+        Args:
+            keys: Key definitions per file name, e.g. {'GSCAT.BTR': GSCAT_KEYS}
+                  (files without keys support only Step operations)
+            reader: File reader (None = own reader)
+        """
+        super().__init__()
+        self.keys = {name.upper(): specs for name, specs in (keys or {}).items()}
+        self.reader = reader or BtrieveFileReader()
+        self._loaded: Dict[str, Tuple[int, int]] = {}  # file -> (mtime_ns, size) when loaded
+
+    def close(self) -> None:
+        """Unmap files of the reader"""
+        self.files.clear()
+        self._loaded.clear()
+        self.reader.close_all()
+
+    def _load(self, filename: str) -> FakeBtrieveFile:
+        path = Path(filename)
+        keys = self.keys.get(path.name.upper(), {})
+        btrieve_file = self.reader.open(path, keys)
+
+        fcr = btrieve_file.fcr
+        fake_file = FakeBtrieveFile(keys, fcr.record_length, fcr.page_size, fcr.file_flags,
+                                    btrieve_file.stat().version)
+        for position, record in btrieve_file.iter_physical():
+            fake_file.add_record(record, position)
+        name = self._normalize(filename)
+        self.files[name] = fake_file
+        self._loaded[name] = (btrieve_file.mtime_ns, btrieve_file.size)
+        return fake_file
+
+    def _open(self, pos_block, key_buffer) -> int:
+        filename = key_buffer.value.decode('ascii', errors='ignore')
+        if not Path(filename).is_file():
+            return BtrieveClient.STATUS_FILE_NOT_FOUND
+        st = os.stat(filename)
+        if self._loaded.get(self._normalize(filename)) != (st.st_mtime_ns, st.st_size):
+            try:
+                self._load(filename)
+            except (OSError, ValueError):
+                return BtrieveClient.STATUS_IO_ERROR
+        return super()._open(pos_block, key_buffer)
+
+    def _insert(self, cursor, data_buffer, data_len, key_buffer) -> int:
+        return BtrieveClient.STATUS_ACCESS_DENIED
+
+    def _update(self, cursor, data_buffer, data_len) -> int:
+        return BtrieveClient.STATUS_ACCESS_DENIED
+
+    def _delete(self, cursor) -> int:
+        return BtrieveClient.STATUS_ACCESS_DENIED
+
+
+class RecordedCall(NamedTuple):
+    """One captured BTRCALL (outputs needed to replay it)"""
+
+    operation: int
+    key_num: int
+    status: int
+    data: bytes  # Data buffer after the call (data_len bytes)
+    key: bytes  # Key buffer after the call (trailing NULs stripped)
+    elapsed: float  # Call duration in seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'op': self.operation, 'key_num': self.key_num, 'status': self.status,
+            'data': self.data.hex(), 'key': self.key.hex(), 'elapsed': self.elapsed,
+        }
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> 'RecordedCall':
+        return cls(
+            entry['op'], entry['key_num'], entry['status'],
+            bytes.fromhex(entry['data']), bytes.fromhex(entry['key']), entry['elapsed'],
+        )
+
+
+def _buffer_bytes(buffer, length: int) -> bytes:
+    return bytes(memoryview(buffer).cast('B')[:min(length, ctypes.sizeof(buffer))])
+
+
+class RecordingBackend:
+    """Backend wrapper capturing every btrcall() of the inner backend (and btrcallid() if it has one)"""
+
+    def __init__(self, inner: BtrieveBackend):
+        self.inner = inner
+        self.dll = getattr(inner, 'dll', None)
+        self.calls: List[RecordedCall] = []
+        self._lock = threading.Lock()
+        if getattr(inner, 'btrcallid', None) is not None:
+            self.btrcallid = self._btrcallid
+
+    def btrcall(self, operation: int, pos_block, data_buffer, data_len,
+                key_buffer, key_len: int, key_num: int) -> int:
+        """BTRCALL entry point"""
+        start = time.perf_counter()
+        status = self.inner.btrcall(operation, pos_block, data_buffer, data_len,
+                                    key_buffer, key_len, key_num)
+        self._capture(operation, data_buffer, data_len, key_buffer, key_len, key_num,
+                      status, time.perf_counter() - start)
+        return status
+
+    def _btrcallid(self, operation: int, pos_block, data_buffer, data_len,
+                   key_buffer, key_len: int, key_num: int, client_id: bytes) -> int:
+        """BTRCALLID entry point (client ID is not part of the recording)"""
+        start = time.perf_counter()
+        status = self.inner.btrcallid(operation, pos_block, data_buffer, data_len,
+                                      key_buffer, key_len, key_num, client_id)
+        self._capture(operation, data_buffer, data_len, key_buffer, key_len, key_num,
+                      status, time.perf_counter() - start)
+        return status
+
+    def _capture(self, operation: int, data_buffer, data_len, key_buffer, key_len: int,
+                 key_num: int, status: int, elapsed: float) -> None:
+
+        call = RecordedCall(
+            operation, key_num, status,
+            _buffer_bytes(data_buffer, _deref(data_len).value),
+            _buffer_bytes(key_buffer, key_len).rstrip(b'\x00'),
+            elapsed,
+        )
+        with self._lock:
+            self.calls.append(call)
+
+    def save(self, path: Union[str, Path], metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Save captured calls (and e.g. the workload that produced them) as JSON"""
+        with self._lock:
+            calls = [call.to_dict() for call in self.calls]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': RECORDING_VERSION, 'metadata': metadata or {}, 'calls': calls}, f)
+
+
+class ReplayBackend:
+    """Backend serving a recorded call sequence"""
+
+    def __init__(self, calls: List[RecordedCall], latency: Optional[float] = 0.0,
+                 loop: bool = False, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            calls: Recorded calls in order
+            latency: Delay per call in seconds (None = recorded call durations)
+            loop: Start over when the recording is exhausted
+            metadata: Metadata saved with the recording
+        """
+        self.dll = None
+        self.calls = list(calls)
+        self.latency = latency
+        self.loop = loop
+        self.metadata = metadata or {}
+        self._index = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Union[str, Path], latency: Optional[float] = 0.0,
+             loop: bool = False) -> 'ReplayBackend':
+        """Load recording saved by RecordingBackend.save()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            recording = json.load(f)
+        if recording.get('version') != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {recording.get('version')}")
+        calls = [RecordedCall.from_dict(entry) for entry in recording['calls']]
+        return cls(calls, latency, loop, recording.get('metadata'))
+
+    def rewind(self) -> None:
+        """Restart replay from the first call"""
+        with self._lock:
+            self._index = 0
+
+    def btrcallid(self, operation: int, pos_block, data_buffer, data_len,
+                  key_buffer, key_len: int, key_num: int, client_id: bytes) -> int:
+        """BTRCALLID entry point - the recording already holds the results of each session"""
+        return self.btrcall(operation, pos_block, data_buffer, data_len, key_buffer, key_len, key_num)
+
+    def btrcall(self, operation: int, pos_block, data_buffer, data_len,
+                key_buffer, key_len: int, key_num: int) -> int:
+        """BTRCALL entry point"""
+        with self._lock:
+            if self._index >= len(self.calls):
+                if not self.loop or not self.calls:
+                    raise RuntimeError(f"Replay exhausted after {len(self.calls)} calls")
+                self._index = 0
+            index = self._index
+            self._index += 1
+        call = self.calls[index]
+
+        if call.operation != operation:
+            raise RuntimeError(
+                f"Replay diverged at call {index}: recorded operation {call.operation}, got {operation}"
+            )
+
+        delay = call.elapsed if self.latency is None else self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        data_len = _deref(data_len)
+        size = min(len(call.data), ctypes.sizeof(data_buffer))
+        memoryview(data_buffer).cast('B')[:size] = call.data[:size]
+        data_len.value = size
+
+        key_size = min(key_len, ctypes.sizeof(key_buffer))
+        memoryview(key_buffer).cast('B')[:key_size] = call.key[:key_size].ljust(key_size, b'\x00')
+        return call.status
@@ -4,8 +4,18 @@ Python wrapper pre Pervasive Btrieve API (32-bit)
 Adapted for invoice-editor Qt5 application
 """
 import ctypes
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Union, Callable, Iterator, Iterable, List, Sequence
+
+from .cursor import BtrieveCursor
+from .file_stat import BtrieveFileStat, FileFingerprint
+from .engine import BtrieveBackend, get_default_backend
+from .extended import (
+    ExtractField, FilterTerm, build_extended_request, max_batch,
+    parse_extended_response, response_size,
+)
 
 
 class BtrieveClient:
@@ -26,8 +36,22 @@ class BtrieveClient:
     B_GET_LESS_OR_EQUAL = 11
     B_GET_FIRST = 12
     B_GET_LAST = 13
+    B_STAT = 15
+    B_BEGIN_TRANSACTION = 19
+    B_END_TRANSACTION = 20
+    B_ABORT_TRANSACTION = 21
+    B_GET_POSITION = 22
+    B_GET_DIRECT = 23
     B_STEP_NEXT = 24
+    B_STEP_FIRST = 33
+    B_STEP_LAST = 34
     B_STEP_PREVIOUS = 35
+    B_GET_NEXT_EXTENDED = 36
+    B_GET_PREVIOUS_EXTENDED = 37
+    B_STEP_NEXT_EXTENDED = 38
+    B_STEP_PREVIOUS_EXTENDED = 39
+    B_GET_KEY = 50  # Added to a Get operation: key-only variant (no data pages read)
+    B_CONCURRENT = 1000  # Added to Begin Transaction: concurrent (record-level locking)
 
     # Btrieve status codes
     STATUS_SUCCESS = 0
@@ -39,60 +63,42 @@ class BtrieveClient:
     STATUS_INVALID_KEY_NUMBER = 6
     STATUS_DIFFERENT_KEY_NUMBER = 7
     STATUS_INVALID_POSITIONING = 8
+    STATUS_END_OF_FILE = 9
+    STATUS_FILE_NOT_FOUND = 12
+    STATUS_DATA_BUFFER_TOO_SHORT = 22
+    STATUS_TRANSACTION_ACTIVE = 37
+    STATUS_NO_TRANSACTION = 39
+    STATUS_INVALID_RECORD_ADDRESS = 43
+    STATUS_ACCESS_DENIED = 46
+    STATUS_REJECT_COUNT_REACHED = 60
+    STATUS_INCORRECT_DESCRIPTOR = 62
+    STATUS_FILTER_LIMIT_REACHED = 64
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, backend: Optional[BtrieveBackend] = None):
+        """
+        Initialize Btrieve client
 
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
-        """Initialize Btrieve client"""
-        self.dll = None
-        self.btrcall = None
+        Args:
+            config: Optional configuration
+            backend: Object providing btrcall() with the BTRCALL signature
+                     (e.g. FakeBtrieveEngine); None uses the default backend
+                     (shared DLL engine unless set_default_backend() was called)
+        """
+        if backend is None:
+            backend = get_default_backend()
+
+        self.backend = backend
+        self.dll = getattr(backend, 'dll', None)
+        self.btrcall = backend.btrcall
         self.config = config or {}
-        self._load_dll()
-
-    def _load_dll(self) -> None:
-        """Load Btrieve DLL"""
-        dll_names = ['w3btrv7.dll', 'wbtrv32.dll']
-        search_paths = [
-            Path(r"C:\Program Files (x86)\Pervasive Software\PSQL\bin"),
-            Path(r"C:\PVSW\bin"),
-            Path(__file__).parent.parent.parent / 'external-dlls',
-            Path(r"C:\Windows\SysWOW64"),
-        ]
-
-        for search_path in search_paths:
-            if not search_path.exists():
-                continue
-            for dll_name in dll_names:
-                dll_path = search_path / dll_name
-                if not dll_path.exists():
-                    continue
-                try:
-                    self.dll = ctypes.WinDLL(str(dll_path))
-                    try:
-                        self.btrcall = self.dll.BTRCALL
-                    except AttributeError:
-                        try:
-                            self.btrcall = self.dll.btrcall
-                        except AttributeError:
-                            continue
-
-                    self.btrcall.argtypes = [
-                        ctypes.c_uint16,
-                        ctypes.POINTER(ctypes.c_char),
-                        ctypes.POINTER(ctypes.c_char),
-                        ctypes.POINTER(ctypes.c_uint32),
-                        ctypes.POINTER(ctypes.c_char),
-                        ctypes.c_uint8,
-                        ctypes.c_uint8
-                    ]
-                    self.btrcall.restype = ctypes.c_int16
-                    print(f"✅ Loaded Btrieve DLL: {dll_name} from {search_path}")
-                    return
-                except Exception:
-                    continue
-
-        raise RuntimeError("❌ Could not load any Btrieve DLL")
 
     def open_file(self, filename: str, owner_name: str = "", mode: int = -2) -> Tuple[int, bytes]:
         """Open Btrieve file"""
+        status, pos_block = self.open_position_block(filename, owner_name, mode)
+        return status, pos_block.raw
+
+    def open_position_block(self, filename: str, owner_name: str = "", mode: int = -2) -> Tuple[int, ctypes.Array]:
+        """Open Btrieve file, returns the live position block (kept in place between calls)"""
         pos_block = ctypes.create_string_buffer(128)
         data_buffer = ctypes.create_string_buffer(256)
         data_len = ctypes.c_uint32(0)
@@ -104,11 +110,347 @@ class BtrieveClient:
             self.B_OPEN, pos_block, data_buffer,
             ctypes.byref(data_len), key_buffer, key_len, mode & 0xFF
         )
-        return status, pos_block.raw
+        return status, pos_block
+
+    def open_cursor(self, filename: str, record_length: Optional[int] = None,
+                    owner_name: str = "", mode: int = -2) -> BtrieveCursor:
+        """
+        Open Btrieve file as cursor with preallocated buffers
+
+        Args:
+            filename: Btrieve file path
+            record_length: Data buffer size (record length of the file)
+
+        Raises:
+            RuntimeError: File cannot be opened
+        """
+        cursor = BtrieveCursor(self, filename, record_length)
+        status = cursor.open(owner_name, mode)
+        if status != self.STATUS_SUCCESS:
+            raise RuntimeError(f"Failed to open {filename}: {self.get_status_message(status)}")
+        return cursor
+
+    def stat(self, file: Union[str, Path, BtrieveCursor]) -> BtrieveFileStat:
+        """
+        Stat - record count, record length, page size, flags and keys of a file
+
+        Args:
+            file: File path (opened and closed here) or open cursor
+
+        Raises:
+            RuntimeError: File cannot be opened or Stat failed
+        """
+        if isinstance(file, BtrieveCursor):
+            cursor, owned = file, False
+        else:
+            cursor, owned = self.open_cursor(str(file)), True
+
+        try:
+            status = cursor.stat()
+            if status != self.STATUS_SUCCESS:
+                raise RuntimeError(f"Stat failed for {cursor.filename}: {self.get_status_message(status)}")
+            return BtrieveFileStat.from_buffer(cursor.record)
+        finally:
+            if owned:
+                cursor.close()
+
+    def fingerprint(self, file: Union[str, Path, BtrieveCursor]) -> FileFingerprint:
+        """Stat combined with filesystem mtime/size (cheap with an open cursor)"""
+        path = file.filename if isinstance(file, BtrieveCursor) else str(file)
+        return FileFingerprint.create(path, self.stat(file))
+
+    def has_changed(self, since: FileFingerprint,
+                    file: Optional[Union[str, Path, BtrieveCursor]] = None) -> bool:
+        """
+        Check whether file changed since fingerprint was taken
+
+        Filesystem metadata is compared first; Stat catches changes still
+        held in the engine cache (record count, unused pages). In-place
+        updates are seen once the engine writes them to disk.
+
+        Args:
+            since: Earlier fingerprint
+            file: Open cursor of the same file (default: since.path, opened here)
+        """
+        try:
+            st = os.stat(since.path)
+        except OSError:
+            return True
+        if st.st_mtime_ns != since.mtime_ns or st.st_size != since.size:
+            return True
+        try:
+            return self.fingerprint(file if file is not None else since.path) != since
+        except RuntimeError:
+            return True
+
+    def iter_records(self, file: Union[str, Path, BtrieveCursor], key_num: Optional[int] = None,
+                     start_key: Optional[bytes] = None, physical: bool = True,
+                     decoder: Optional[Callable[[memoryview], Any]] = None,
+                     copy: bool = True, record_length: Optional[int] = None,
+                     positions: bool = False) -> Iterator[Any]:
+        """
+        Iterate records of a file
+
+        Traversal:
+        - start_key given: Get Greater-or-Equal on key_num (default 0), then Get Next
+        - key_num given (or physical=False): Get First/Next in key order
+        - otherwise: Step First/Next in physical order (no index traversal)
+
+        Args:
+            file: File path (opened and closed here) or open cursor
+            key_num: Key for logical order
+            start_key: Key buffer to start from
+            physical: Use Step operations when no key is requested
+            decoder: Called with zero-copy record view (e.g. GSCATRecord.from_bytes)
+            copy: Without decoder yield bytes copies; False yields memoryviews
+                  valid only until the next iteration
+            record_length: Data buffer size when file is a path
+            positions: Yield (physical position, record) - one Get Position per record
+
+        Yields:
+            Decoded objects, bytes or memoryviews
+
+        Raises:
+            RuntimeError: Btrieve error other than end of file
+        """
+        if isinstance(file, BtrieveCursor):
+            cursor, owned = file, False
+        else:
+            cursor, owned = self.open_cursor(str(file), record_length), True
+
+        try:
+            if start_key is not None:
+                status = cursor.get_greater_or_equal(start_key, key_num or 0)
+                advance = cursor.get_next
+            elif physical and key_num is None:
+                status = cursor.step_first()
+                advance = cursor.step_next
+            else:
+                status = cursor.get_first(key_num or 0)
+                advance = cursor.get_next
+
+            while status == self.STATUS_SUCCESS:
+                record = cursor.record
+                if decoder is not None:
+                    item = decoder(record)
+                else:
+                    item = record.tobytes() if copy else record
+                if positions:
+                    status, position = cursor.get_position()
+                    if status != self.STATUS_SUCCESS:
+                        break
+                    item = (position, item)
+                yield item
+                status = advance()
+
+            if status not in (self.STATUS_END_OF_FILE, self.STATUS_KEY_NOT_FOUND):
+                raise RuntimeError(f"Failed to read {cursor.filename}: {self.get_status_message(status)}")
+        finally:
+            if owned:
+                cursor.close()
+
+    def get_next_extended(self, cursor: BtrieveCursor, fields: Sequence[ExtractField],
+                          terms: Sequence[FilterTerm] = (), max_records: Optional[int] = None,
+                          max_reject: int = 0, use_current: bool = False,
+                          step: bool = False) -> Tuple[int, List[Tuple[int, bytes]]]:
+        """
+        Get/Step Next Extended - batch of filtered records with projected fields
+
+        Args:
+            cursor: Open cursor with established position
+            fields: Projected fields (concatenated in returned data)
+            terms: Filter terms joined by AND (empty = all records)
+            max_records: Records per call (default: as many as fit into the buffer)
+            max_reject: Rejected records before status 60 (0 = engine default)
+            use_current: Include the current record
+            step: Physical order (Step Next Extended) instead of key order
+
+        Returns:
+            Tuple (status, [(physical position, projected data), ...]) - records
+            are returned also with END_OF_FILE / REJECT_COUNT_REACHED /
+            FILTER_LIMIT_REACHED
+        """
+        max_records = max_records or max_batch(fields)
+        request = build_extended_request(terms, fields, max_records, max_reject, use_current)
+        operation = self.B_STEP_NEXT_EXTENDED if step else self.B_GET_NEXT_EXTENDED
+
+        status = cursor.extended(operation, request, response_size(fields, max_records))
+        if status not in (self.STATUS_SUCCESS, self.STATUS_END_OF_FILE,
+                          self.STATUS_REJECT_COUNT_REACHED, self.STATUS_FILTER_LIMIT_REACHED):
+            return status, []
+        return status, [(position, data.tobytes()) for position, data in parse_extended_response(cursor.record)]
+
+    def iter_extended(self, file: Union[str, Path, BtrieveCursor], fields: Sequence[ExtractField],
+                      terms: Sequence[FilterTerm] = (), key_num: Optional[int] = None,
+                      batch_size: Optional[int] = None, max_reject: int = 0,
+                      record_length: Optional[int] = None) -> Iterator[List[Tuple[int, bytes]]]:
+        """
+        Iterate whole file in extended batches
+
+        Physical order (Step Next Extended) unless key_num is given.
+
+        Yields:
+            Lists of (physical position, projected data)
+
+        Raises:
+            RuntimeError: Btrieve error other than end of file
+        """
+        if isinstance(file, BtrieveCursor):
+            cursor, owned = file, False
+        else:
+            cursor, owned = self.open_cursor(str(file), record_length), True
+
+        step = key_num is None
+        try:
+            status = cursor.step_first() if step else cursor.get_first(key_num)
+            use_current = True
+
+            while status == self.STATUS_SUCCESS:
+                status, records = self.get_next_extended(
+                    cursor, fields, terms, batch_size, max_reject, use_current, step)
+                use_current = False
+                if records:
+                    yield records
+                if status == self.STATUS_REJECT_COUNT_REACHED:
+                    status = self.STATUS_SUCCESS  # Continue after last rejected record
+
+            if status not in (self.STATUS_END_OF_FILE, self.STATUS_FILTER_LIMIT_REACHED):
+                raise RuntimeError(f"Failed to read {cursor.filename}: {self.get_status_message(status)}")
+        finally:
+            if owned:
+                cursor.close()
+
+    def _session_call(self, operation: int) -> int:
+        """Operation without file context (transactions)"""
+        pos_block = ctypes.create_string_buffer(128)
+        data_buffer = ctypes.create_string_buffer(1)
+        data_len = ctypes.c_uint32(0)
+        key_buffer = ctypes.create_string_buffer(1)
+
+        return self.btrcall(
+            operation, pos_block, data_buffer,
+            ctypes.byref(data_len), key_buffer, 0, 0
+        )
+
+    def begin_transaction(self, concurrent: bool = True) -> int:
+        """Begin Transaction (concurrent = record locks instead of locking whole files)"""
+        return self._session_call(self.B_BEGIN_TRANSACTION + (self.B_CONCURRENT if concurrent else 0))
+
+    def end_transaction(self) -> int:
+        """End (commit) Transaction"""
+        return self._session_call(self.B_END_TRANSACTION)
+
+    def abort_transaction(self) -> int:
+        """Abort (roll back) Transaction"""
+        return self._session_call(self.B_ABORT_TRANSACTION)
+
+    @contextmanager
+    def transaction(self, concurrent: bool = True) -> Iterator[None]:
+        """
+        Transaction context - committed on success, aborted on exception
+
+        Raises:
+            RuntimeError: Begin or End Transaction failed
+        """
+        status = self.begin_transaction(concurrent)
+        if status != self.STATUS_SUCCESS:
+            raise RuntimeError(f"Begin Transaction failed: {self.get_status_message(status)}")
+        try:
+            yield
+        except BaseException:
+            self.abort_transaction()
+            raise
+        status = self.end_transaction()
+        if status != self.STATUS_SUCCESS:
+            raise RuntimeError(f"End Transaction failed: {self.get_status_message(status)}")
+
+    def bulk_insert(self, file: Union[str, Path, BtrieveCursor], records: Iterable[bytes],
+                    batch_size: int = 500, record_length: Optional[int] = None) -> int:
+        """
+        Insert records in transactions of batch_size records
+
+        A failed insert aborts its batch only - earlier batches stay committed.
+
+        Args:
+            file: File path (opened and closed here) or open cursor
+            records: Raw records
+            batch_size: Records per transaction
+
+        Returns:
+            Number of committed records
+
+        Raises:
+            RuntimeError: Insert or transaction failed
+        """
+        def insert(cursor: BtrieveCursor, record: bytes) -> None:
+            status = cursor.insert(record)
+            if status != self.STATUS_SUCCESS:
+                raise RuntimeError(f"Insert into {cursor.filename} failed: {self.get_status_message(status)}")
+
+        return self._bulk(file, records, insert, batch_size, record_length)
+
+    def bulk_update(self, file: Union[str, Path, BtrieveCursor],
+                    updates: Iterable[Tuple[Union[bytes, int], bytes]], key_num: int = 0,
+                    batch_size: int = 500, record_length: Optional[int] = None) -> int:
+        """
+        Update records in transactions of batch_size records
+
+        Args:
+            file: File path (opened and closed here) or open cursor
+            updates: (locator, new record) - locator is a key buffer for key_num
+                     (Get Equal) or a physical position (Get Direct)
+            key_num: Key used for key locators
+            batch_size: Records per transaction
+
+        Returns:
+            Number of committed records
+
+        Raises:
+            RuntimeError: Record not found, update or transaction failed
+        """
+        def update(cursor: BtrieveCursor, item: Tuple[Union[bytes, int], bytes]) -> None:
+            locator, record = item
+            if isinstance(locator, int):
+                status = cursor.get_direct(locator, key_num)
+            else:
+                status = cursor.get_equal(locator, key_num)
+            if status == self.STATUS_SUCCESS:
+                status = cursor.update(record)
+            if status != self.STATUS_SUCCESS:
+                raise RuntimeError(f"Update of {cursor.filename} failed: {self.get_status_message(status)}")
+
+        return self._bulk(file, updates, update, batch_size, record_length)
+
+    def _bulk(self, file: Union[str, Path, BtrieveCursor], items: Iterable[Any],
+              write: Callable[[BtrieveCursor, Any], None], batch_size: int,
+              record_length: Optional[int]) -> int:
+        """Apply write to items, one transaction per batch"""
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: {batch_size}")
+        if isinstance(file, BtrieveCursor):
+            cursor, owned = file, False
+        else:
+            cursor, owned = self.open_cursor(str(file), record_length), True
+
+        committed = 0
+        try:
+            iterator = iter(items)
+            while True:
+                batch = [item for _, item in zip(range(batch_size), iterator)]
+                if not batch:
+                    break
+                with self.transaction():
+                    for item in batch:
+                        write(cursor, item)
+                committed += len(batch)
+        finally:
+            if owned:
+                cursor.close()
+        return committed
 
     def close_file(self, pos_block: bytes) -> int:
         """Close Btrieve file"""
-        pos_block_buf = ctypes.create_string_buffer(pos_block)
+        pos_block_buf = self._pos_block_buffer(pos_block)
         data_buffer = ctypes.create_string_buffer(1)
         data_len = ctypes.c_uint32(0)
         key_buffer = ctypes.create_string_buffer(1)
@@ -121,7 +463,7 @@ class BtrieveClient:
 
     def get_first(self, pos_block: bytes, key_num: int = 0) -> Tuple[int, bytes]:
         """Get first record"""
-        pos_block_buf = ctypes.create_string_buffer(pos_block)
+        pos_block_buf = self._pos_block_buffer(pos_block)
         data_buffer = ctypes.create_string_buffer(4096)
         data_len = ctypes.c_uint32(4096)
         key_buffer = ctypes.create_string_buffer(255)
@@ -137,7 +479,7 @@ class BtrieveClient:
 
     def get_next(self, pos_block: bytes) -> Tuple[int, bytes]:
         """Get next record"""
-        pos_block_buf = ctypes.create_string_buffer(pos_block)
+        pos_block_buf = self._pos_block_buffer(pos_block)
         data_buffer = ctypes.create_string_buffer(4096)
         data_len = ctypes.c_uint32(4096)
         key_buffer = ctypes.create_string_buffer(255)
@@ -151,9 +493,110 @@ class BtrieveClient:
             return status, data_buffer.raw[:data_len.value]
         return status, b''
 
+    def get_equal(self, pos_block: bytes, key: bytes, key_num: int = 0) -> Tuple[int, bytes]:
+        """Get record whose key equals key (single index descent)"""
+        return self._get_by_key(self.B_GET_EQUAL, pos_block, key, key_num)
+
+    def get_greater_or_equal(self, pos_block: bytes, key: bytes, key_num: int = 0) -> Tuple[int, bytes]:
+        """Get first record whose key is greater than or equal to key"""
+        return self._get_by_key(self.B_GET_GREATER_OR_EQUAL, pos_block, key, key_num)
+
+    def _get_by_key(self, operation: int, pos_block: bytes, key: bytes, key_num: int) -> Tuple[int, bytes]:
+        """Run keyed Get operation with key buffer built from key"""
+        pos_block_buf = self._pos_block_buffer(pos_block)
+        data_buffer = ctypes.create_string_buffer(4096)
+        data_len = ctypes.c_uint32(4096)
+        key_buffer = ctypes.create_string_buffer(key, 255)
+
+        status = self.btrcall(
+            operation, pos_block_buf, data_buffer,
+            ctypes.byref(data_len), key_buffer, 255, key_num & 0xFF
+        )
+
+        if status == self.STATUS_SUCCESS:
+            return status, data_buffer.raw[:data_len.value]
+        return status, b''
+
+    def get_key_equal(self, pos_block: bytes, key: bytes, key_num: int = 0) -> Tuple[int, bytes]:
+        """Get Key Equal - key-only lookup, returns (status, key buffer) without reading the record"""
+        pos_block_buf = self._pos_block_buffer(pos_block)
+        data_buffer = ctypes.create_string_buffer(1)
+        data_len = ctypes.c_uint32(0)
+        key_buffer = ctypes.create_string_buffer(key, 255)
+
+        status = self.btrcall(
+            self.B_GET_EQUAL + self.B_GET_KEY, pos_block_buf, data_buffer,
+            ctypes.byref(data_len), key_buffer, 255, key_num & 0xFF
+        )
+
+        if status == self.STATUS_SUCCESS:
+            return status, key_buffer.raw[:len(key)]
+        return status, b''
+
+    def get_position(self, pos_block: bytes) -> Tuple[int, int]:
+        """Get Position - physical position of the current record, returns (status, position)"""
+        pos_block_buf = self._pos_block_buffer(pos_block)
+        data_buffer = ctypes.create_string_buffer(4)
+        data_len = ctypes.c_uint32(4)
+        key_buffer = ctypes.create_string_buffer(255)
+
+        status = self.btrcall(
+            self.B_GET_POSITION, pos_block_buf, data_buffer,
+            ctypes.byref(data_len), key_buffer, 255, 0
+        )
+
+        if status == self.STATUS_SUCCESS:
+            return status, int.from_bytes(data_buffer.raw[:4], 'little')
+        return status, 0
+
+    def get_direct(self, pos_block: bytes, position: int, key_num: int = 0) -> Tuple[int, bytes]:
+        """Get Direct - fetch record at physical position (establishes key_num currency)"""
+        pos_block_buf = self._pos_block_buffer(pos_block)
+        data_buffer = ctypes.create_string_buffer(4096)
+        data_buffer[:4] = position.to_bytes(4, 'little')
+        data_len = ctypes.c_uint32(4096)
+        key_buffer = ctypes.create_string_buffer(255)
+
+        status = self.btrcall(
+            self.B_GET_DIRECT, pos_block_buf, data_buffer,
+            ctypes.byref(data_len), key_buffer, 255, key_num & 0xFF
+        )
+
+        if status == self.STATUS_SUCCESS:
+            return status, data_buffer.raw[:data_len.value]
+        return status, b''
+
+    def key_exists(self, file: Union[bytes, ctypes.Array, BtrieveCursor], key: bytes, key_num: int = 0) -> bool:
+        """
+        Check whether key exists in index key_num (Get Key Equal)
+
+        Args:
+            file: Open cursor or position block
+
+        Raises:
+            RuntimeError: Btrieve error other than key not found
+        """
+        if isinstance(file, BtrieveCursor):
+            status = file.get_key_equal(key, key_num)
+        else:
+            status, _ = self.get_key_equal(file, key, key_num)
+
+        if status == self.STATUS_SUCCESS:
+            return True
+        if status == self.STATUS_KEY_NOT_FOUND:
+            return False
+        raise RuntimeError(f"Get Key Equal failed: {self.get_status_message(status)}")
+
+    @staticmethod
+    def _pos_block_buffer(pos_block: Union[bytes, ctypes.Array]) -> ctypes.Array:
+        """Return ctypes position block (bytes are copied, ctypes buffers are used in place)"""
+        if isinstance(pos_block, ctypes.Array):
+            return pos_block
+        return ctypes.create_string_buffer(pos_block)
+
     def insert(self, pos_block: bytes, data: bytes) -> int:
         """Insert new record"""
-        pos_block_buf = ctypes.create_string_buffer(pos_block)
+        pos_block_buf = self._pos_block_buffer(pos_block)
         data_buffer = ctypes.create_string_buffer(data)
         data_len = ctypes.c_uint32(len(data))
         key_buffer = ctypes.create_string_buffer(255)
@@ -166,7 +609,7 @@ class BtrieveClient:
 
     def update(self, pos_block: bytes, data: bytes) -> int:
         """Update current record"""
-        pos_block_buf = ctypes.create_string_buffer(pos_block)
+        pos_block_buf = self._pos_block_buffer(pos_block)
         data_buffer = ctypes.create_string_buffer(data)
         data_len = ctypes.c_uint32(len(data))
         key_buffer = ctypes.create_string_buffer(255)
@@ -183,7 +626,10 @@ class BtrieveClient:
             0: "SUCCESS", 1: "INVALID_OPERATION", 2: "IO_ERROR",
             3: "FILE_NOT_OPEN", 4: "KEY_NOT_FOUND", 5: "DUPLICATE_KEY",
             6: "INVALID_KEY_NUMBER", 7: "DIFFERENT_KEY_NUMBER",
-            8: "INVALID_POSITIONING", 11: "INVALID_FILENAME", 12: "FILE_NOT_OPEN",
+            8: "INVALID_POSITIONING", 9: "END_OF_FILE", 11: "INVALID_FILENAME",
+            12: "FILE_NOT_FOUND", 22: "DATA_BUFFER_TOO_SHORT",
+            37: "TRANSACTION_ACTIVE", 39: "NO_TRANSACTION", 43: "INVALID_RECORD_ADDRESS", 46: "ACCESS_DENIED",
+            60: "REJECT_COUNT_REACHED", 62: "INCORRECT_DESCRIPTOR", 64: "FILTER_LIMIT_REACHED",
         }
         return messages.get(status_code, f"UNKNOWN_ERROR_{status_code}")
 
@@ -0,0 +1,203 @@
+"""
+Btrieve cursor - open file handle owning its call buffers
+
+Position block, data buffer, data length and key buffer are allocated once
+per handle and reused by every operation. The current record is exposed as
+a zero-copy memoryview that stays valid until the next operation.
+"""
+import ctypes
+from typing import Optional, Tuple
+
+from .file_stat import STAT_BUFFER_SIZE
+
+
+class BtrieveCursor:
+    """Open Btrieve file with preallocated ctypes buffers"""
+
+    POS_BLOCK_SIZE = 128
+    KEY_BUFFER_SIZE = 255
+    DEFAULT_RECORD_LENGTH = 4096
+
+    def __init__(self, client, filename: str, record_length: Optional[int] = None):
+        """
+        Args:
+            client: BtrieveClient used for engine calls
+            filename: Btrieve file path
+            record_length: Data buffer size (record length of the file)
+        """
+        self.client = client
+        self.filename = str(filename)
+        self.is_open = False
+        self.key_num = 0  # Key of the current position (used by Get Next/Previous)
+
+        self.pos_block = ctypes.create_string_buffer(self.POS_BLOCK_SIZE)
+        self.key_buffer = ctypes.create_string_buffer(self.KEY_BUFFER_SIZE)
+        self.data_len = ctypes.c_uint32(0)
+        self._data_len_ref = ctypes.byref(self.data_len)
+        self._key_view = memoryview(self.key_buffer).cast('B')
+        self._allocate(record_length or self.DEFAULT_RECORD_LENGTH)
+
+    def _allocate(self, size: int) -> None:
+        """(Re)allocate data buffer"""
+        self.data_buffer = ctypes.create_string_buffer(size)
+        self._data_view = memoryview(self.data_buffer).cast('B')
+        self._capacity = size
+
+    def __enter__(self) -> 'BtrieveCursor':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _call(self, operation: int, key_num: int = 0, data_len: Optional[int] = None) -> int:
+        """Run engine operation on this handle's buffers"""
+        self.data_len.value = self._capacity if data_len is None else data_len
+        return self.client.btrcall(
+            operation, self.pos_block, self.data_buffer,
+            self._data_len_ref, self.key_buffer, self.KEY_BUFFER_SIZE, key_num & 0xFF
+        )
+
+    def set_key(self, key: bytes) -> None:
+        """Copy key value into the key buffer"""
+        if len(key) > self.KEY_BUFFER_SIZE:
+            raise ValueError(f"Key too long: {len(key)} bytes (max {self.KEY_BUFFER_SIZE})")
+        self._key_view[:len(key)] = key
+
+    def set_data(self, data: bytes) -> int:
+        """Copy data into the data buffer (grows it when needed), returns length"""
+        size = len(data)
+        if size > self._capacity:
+            self._allocate(size)
+        self._data_view[:size] = data
+        return size
+
+    @property
+    def record(self) -> memoryview:
+        """Current record (zero-copy, valid until the next operation)"""
+        return self._data_view[:self.data_len.value]
+
+    def record_bytes(self) -> bytes:
+        """Copy of current record"""
+        return self._data_view[:self.data_len.value].tobytes()
+
+    @property
+    def key(self) -> memoryview:
+        """Key buffer (key value returned by last operation)"""
+        return self._key_view
+
+    def open(self, owner_name: str = "", mode: int = -2) -> int:
+        """Open file"""
+        filename_bytes = self.filename.encode('ascii') + b'\x00'
+        self.set_key(filename_bytes)
+        status = self._call(self.client.B_OPEN, key_num=mode, data_len=0)
+        self.is_open = status == self.client.STATUS_SUCCESS
+        return status
+
+    def close(self) -> int:
+        """Close file"""
+        if not self.is_open:
+            return self.client.STATUS_SUCCESS
+        self.is_open = False
+        return self._call(self.client.B_CLOSE, data_len=0)
+
+    def _get(self, operation: int, key_num: int) -> int:
+        """Positioning Get operation - remembers key of the new position"""
+        self.key_num = key_num
+        return self._call(operation, key_num)
+
+    def get_first(self, key_num: int = 0) -> int:
+        """Get first record by key"""
+        return self._get(self.client.B_GET_FIRST, key_num)
+
+    def get_last(self, key_num: int = 0) -> int:
+        """Get last record by key"""
+        return self._get(self.client.B_GET_LAST, key_num)
+
+    def get_next(self) -> int:
+        """Get next record in current key order"""
+        return self._call(self.client.B_GET_NEXT, self.key_num)
+
+    def get_previous(self) -> int:
+        """Get previous record in current key order"""
+        return self._call(self.client.B_GET_PREVIOUS, self.key_num)
+
+    def get_equal(self, key: bytes, key_num: int = 0) -> int:
+        """Get record whose key equals key"""
+        self.set_key(key)
+        return self._get(self.client.B_GET_EQUAL, key_num)
+
+    def get_greater_or_equal(self, key: bytes, key_num: int = 0) -> int:
+        """Get first record whose key is greater than or equal to key"""
+        self.set_key(key)
+        return self._get(self.client.B_GET_GREATER_OR_EQUAL, key_num)
+
+    def get_key_equal(self, key: bytes, key_num: int = 0) -> int:
+        """Get Key Equal - positions on key without reading the record (record stays empty)"""
+        self.set_key(key)
+        self.key_num = key_num
+        return self._call(self.client.B_GET_EQUAL + self.client.B_GET_KEY, key_num, data_len=0)
+
+    def key_exists(self, key: bytes, key_num: int = 0) -> bool:
+        """
+        Check key existence with Get Key Equal
+
+        Raises:
+            RuntimeError: Btrieve error other than key not found (status 4)
+        """
+        return self.client.key_exists(self, key, key_num)
+
+    def get_position(self) -> Tuple[int, int]:
+        """Get Position - returns (status, physical position of the current record)"""
+        status = self._call(self.client.B_GET_POSITION, data_len=4)
+        if status != self.client.STATUS_SUCCESS:
+            return status, 0
+        return status, int.from_bytes(self._data_view[:4], 'little')
+
+    def get_direct(self, position: int, key_num: Optional[int] = None) -> int:
+        """Get Direct - fetch record at physical position (key_num currency, default current key)"""
+        if key_num is not None:
+            self.key_num = key_num
+        self._data_view[:4] = position.to_bytes(4, 'little')
+        return self._call(self.client.B_GET_DIRECT, self.key_num)
+
+    def stat(self) -> int:
+        """Stat - file specification is left in the data buffer (record)"""
+        if self._capacity < STAT_BUFFER_SIZE:
+            self._allocate(STAT_BUFFER_SIZE)
+        return self._call(self.client.B_STAT)
+
+    def step_first(self) -> int:
+        """Get physically first record"""
+        return self._call(self.client.B_STEP_FIRST)
+
+    def step_last(self) -> int:
+        """Get physically last record"""
+        return self._call(self.client.B_STEP_LAST)
+
+    def step_next(self) -> int:
+        """Get physically next record (no index traversal)"""
+        return self._call(self.client.B_STEP_NEXT)
+
+    def step_previous(self) -> int:
+        """Get physically previous record"""
+        return self._call(self.client.B_STEP_PREVIOUS)
+
+    def extended(self, operation: int, request: bytes, response_size: int) -> int:
+        """Run extended operation - request in, response left in the data buffer"""
+        size = max(len(request), response_size)
+        if size > self._capacity:
+            self._allocate(size)
+        self._data_view[:len(request)] = request
+        return self._call(operation, self.key_num, data_len=size)
+
+    def insert(self, data: bytes) -> int:
+        """Insert new record"""
+        return self._call(self.client.B_INSERT, data_len=self.set_data(data))
+
+    def update(self, data: bytes) -> int:
+        """Update current record"""
+        return self._call(self.client.B_UPDATE, data_len=self.set_data(data))
+
+    def delete(self) -> int:
+        """Delete current record"""
+        return self._call(self.client.B_DELETE, data_len=0)
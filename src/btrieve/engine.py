@@ -0,0 +1,142 @@
+"""
+Process-wide Btrieve engine - the Pervasive DLL is loaded once per process
+"""
+import ctypes
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class BtrieveBackend(Protocol):
+    """
+    Anything with the BTRCALL entry point can serve BtrieveClient:
+    BtrieveEngine (DLL), FakeBtrieveEngine (in-memory),
+    RecordingBackend/ReplayBackend (captured call sequences)
+    """
+
+    def btrcall(self, operation: int, pos_block: Any, data_buffer: Any, data_len: Any,
+                key_buffer: Any, key_len: int, key_num: int) -> int:
+        ...
+
+
+class BtrieveEngine:
+    """Loaded Pervasive Btrieve DLL (32-bit) shared by all BtrieveClient instances"""
+
+    B_RESET = 28
+
+    def __init__(self):
+        """Load Btrieve DLL"""
+        self.dll = None
+        self.btrcall = None
+        self.btrcallid = None
+        self._load_dll()
+
+    def _load_dll(self) -> None:
+        """Load Btrieve DLL"""
+        dll_names = ['w3btrv7.dll', 'wbtrv32.dll']
+        search_paths = [
+            Path(r"C:\Program Files (x86)\Pervasive Software\PSQL\bin"),
+            Path(r"C:\PVSW\bin"),
+            Path(__file__).parent.parent.parent / 'external-dlls',
+            Path(r"C:\Windows\SysWOW64"),
+        ]
+
+        for search_path in search_paths:
+            if not search_path.exists():
+                continue
+            for dll_name in dll_names:
+                dll_path = search_path / dll_name
+                if not dll_path.exists():
+                    continue
+                try:
+                    self.dll = ctypes.WinDLL(str(dll_path))
+                    try:
+                        self.btrcall = self.dll.BTRCALL
+                    except AttributeError:
+                        try:
+                            self.btrcall = self.dll.btrcall
+                        except AttributeError:
+                            continue
+
+                    self.btrcall.argtypes = [
+                        ctypes.c_uint16,
+                        ctypes.POINTER(ctypes.c_char),
+                        ctypes.POINTER(ctypes.c_char),
+                        ctypes.POINTER(ctypes.c_uint32),
+                        ctypes.POINTER(ctypes.c_char),
+                        ctypes.c_uint8,
+                        ctypes.c_uint8
+                    ]
+                    self.btrcall.restype = ctypes.c_int16
+
+                    # Client ID variant (separate sessions per thread/handle)
+                    self.btrcallid = getattr(self.dll, 'BTRCALLID', None)
+                    if self.btrcallid is not None:
+                        self.btrcallid.argtypes = self.btrcall.argtypes + [ctypes.POINTER(ctypes.c_char)]
+                        self.btrcallid.restype = ctypes.c_int16
+                    logger.info("Loaded Btrieve DLL: %s from %s", dll_name, search_path)
+                    return
+                except Exception:
+                    continue
+
+        raise RuntimeError("❌ Could not load any Btrieve DLL")
+
+    def shutdown(self) -> int:
+        """Reset engine - releases all resources (open files, locks) of this process"""
+        pos_block = ctypes.create_string_buffer(128)
+        data_buffer = ctypes.create_string_buffer(1)
+        data_len = ctypes.c_uint32(0)
+        key_buffer = ctypes.create_string_buffer(1)
+
+        return self.btrcall(
+            self.B_RESET, pos_block, data_buffer,
+            ctypes.byref(data_len), key_buffer, 0, 0
+        )
+
+
+# Singleton instance
+_engine_instance: Optional[BtrieveEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> BtrieveEngine:
+    """Get engine singleton (loads the DLL on first use)"""
+    global _engine_instance
+    if _engine_instance is None:
+        with _engine_lock:
+            if _engine_instance is None:
+                _engine_instance = BtrieveEngine()
+    return _engine_instance
+
+
+def shutdown_engine() -> None:
+    """Reset and drop engine singleton"""
+    global _engine_instance
+    with _engine_lock:
+        if _engine_instance is not None:
+            _engine_instance.shutdown()
+            _engine_instance = None
+
+
+# Backend used by clients created without an explicit one (None = DLL engine)
+_default_backend: Optional[BtrieveBackend] = None
+
+
+def set_default_backend(backend: Optional[BtrieveBackend]) -> None:
+    """Set process-wide default backend (None restores the DLL engine)"""
+    global _default_backend
+    _default_backend = backend
+
+
+def get_configured_backend() -> Optional[BtrieveBackend]:
+    """Backend set by set_default_backend() (None = DLL engine, not loaded here)"""
+    return _default_backend
+
+
+def get_default_backend() -> BtrieveBackend:
+    """Get default backend (the DLL engine unless another one was set)"""
+    backend = _default_backend
+    return backend if backend is not None else get_engine()
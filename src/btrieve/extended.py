@@ -0,0 +1,206 @@
+"""
+Btrieve extended operations (Get/Step Next Extended)
+
+One engine call returns a batch of records that pass a filter, each reduced
+to a projected subset of fields. Request layout (data buffer):
+
+    header:    buffer length (2), 'UC' | 'EG' (2)
+    filter:    max reject count (2), number of terms (2)
+    term:      data type (1), field length (2), offset (2),
+               comparison (1), connector (1), value (field length)
+    extractor: number of records (2), number of fields (2)
+    field:     field length (2), offset (2)
+
+Response: number of records (2), then per record
+length (2), physical position (4), projected data (length).
+"""
+import struct
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+from .keys import KeySpec, KEY_TYPE_STRING
+
+# Comparison codes
+EXT_EQUAL = 1
+EXT_GREATER = 2
+EXT_LESS = 3
+EXT_NOT_EQUAL = 4
+EXT_GREATER_OR_EQUAL = 5
+EXT_LESS_OR_EQUAL = 6
+EXT_CASE_INSENSITIVE = 128  # Flag for string comparisons
+
+# Term connectors
+EXT_LAST_TERM = 0
+EXT_AND = 1
+EXT_OR = 2
+
+# Start with current record ('UC') or with the next one ('EG')
+EXT_USE_CURRENT = b'UC'
+EXT_NEXT = b'EG'
+
+MAX_EXTENDED_BUFFER = 60000  # Stay below the 64 KB data buffer limit
+
+_RECORD_HEADER = struct.Struct('<HI')
+
+
+@dataclass(frozen=True)
+class FilterTerm:
+    """Filter term: compare record field with constant value"""
+
+    offset: int
+    length: int
+    comparison: int
+    value: bytes
+    data_type: int = KEY_TYPE_STRING
+
+    def matches(self, record: bytes) -> bool:
+        """Evaluate term on record (used by backends emulating the engine)"""
+        spec = KeySpec(self.offset, self.length, self.data_type)
+        field = spec.extract(record)
+        value = self.value
+        if self.comparison & EXT_CASE_INSENSITIVE:
+            field, value = field.lower(), value.lower()
+        left, right = spec.compare_value(field), spec.compare_value(value)
+
+        comparison = self.comparison & 0x0F
+        if comparison == EXT_EQUAL:
+            return left == right
+        if comparison == EXT_GREATER:
+            return left > right
+        if comparison == EXT_LESS:
+            return left < right
+        if comparison == EXT_NOT_EQUAL:
+            return left != right
+        if comparison == EXT_GREATER_OR_EQUAL:
+            return left >= right
+        if comparison == EXT_LESS_OR_EQUAL:
+            return left <= right
+        raise ValueError(f"Invalid comparison code: {self.comparison}")
+
+
+@dataclass(frozen=True)
+class ExtractField:
+    """Projected field returned for each record"""
+
+    offset: int
+    length: int
+
+
+@dataclass(frozen=True)
+class ExtendedRequest:
+    """Decoded extended operation request"""
+
+    use_current: bool
+    max_reject: int
+    terms: Tuple[Tuple[FilterTerm, int], ...]  # (term, connector)
+    max_records: int
+    fields: Tuple[ExtractField, ...]
+
+    def matches(self, record: bytes) -> bool:
+        """Evaluate filter left to right"""
+        result = True
+        connector = EXT_AND
+        for term, next_connector in self.terms:
+            value = term.matches(record)
+            result = (result and value) if connector == EXT_AND else (result or value)
+            connector = next_connector
+        return result
+
+    def extract(self, record: bytes) -> bytes:
+        """Concatenate projected fields of record"""
+        return b''.join(bytes(record[f.offset:f.offset + f.length]) for f in self.fields)
+
+
+def response_size(fields: Sequence[ExtractField], max_records: int) -> int:
+    """Data buffer size needed for the response"""
+    return 2 + max_records * (_RECORD_HEADER.size + sum(f.length for f in fields))
+
+
+def max_batch(fields: Sequence[ExtractField]) -> int:
+    """Largest record count whose response fits into the data buffer limit"""
+    return max(1, (MAX_EXTENDED_BUFFER - 2) // (_RECORD_HEADER.size + sum(f.length for f in fields)))
+
+
+def build_extended_request(terms: Sequence[FilterTerm], fields: Sequence[ExtractField],
+                           max_records: int, max_reject: int = 0,
+                           use_current: bool = False, connector: int = EXT_AND) -> bytes:
+    """
+    Build data buffer for Get/Step Next Extended
+
+    Args:
+        terms: Filter terms (empty = all records)
+        fields: Projected fields
+        max_records: Records to return per call
+        max_reject: Rejected records before status 60 (0 = engine default)
+        use_current: Include the current record ('UC')
+        connector: Connector joining the terms (EXT_AND / EXT_OR)
+    """
+    body = bytearray(struct.pack('<HH', max_reject, len(terms)))
+    for i, term in enumerate(terms):
+        term_connector = EXT_LAST_TERM if i == len(terms) - 1 else connector
+        value = bytes(term.value[:term.length]).ljust(term.length, b'\x00')
+        body += struct.pack('<BHHBB', term.data_type, term.length, term.offset,
+                            term.comparison, term_connector)
+        body += value
+
+    body += struct.pack('<HH', max_records, len(fields))
+    for field in fields:
+        body += struct.pack('<HH', field.length, field.offset)
+
+    header = struct.pack('<H', 4 + len(body)) + (EXT_USE_CURRENT if use_current else EXT_NEXT)
+    return header + bytes(body)
+
+
+def parse_extended_request(buffer: bytes) -> ExtendedRequest:
+    """Decode extended request (used by backends emulating the engine)"""
+    view = memoryview(buffer)
+    use_current = bytes(view[2:4]) == EXT_USE_CURRENT
+    max_reject, term_count = struct.unpack_from('<HH', view, 4)
+    offset = 8
+
+    terms = []
+    for _ in range(term_count):
+        data_type, length, field_offset, comparison, connector = struct.unpack_from('<BHHBB', view, offset)
+        offset += 7
+        value = bytes(view[offset:offset + length])
+        offset += length
+        terms.append((FilterTerm(field_offset, length, comparison, value, data_type), connector))
+
+    max_records, field_count = struct.unpack_from('<HH', view, offset)
+    offset += 4
+    fields = []
+    for _ in range(field_count):
+        length, field_offset = struct.unpack_from('<HH', view, offset)
+        offset += 4
+        fields.append(ExtractField(field_offset, length))
+
+    return ExtendedRequest(use_current, max_reject, tuple(terms), max_records, tuple(fields))
+
+
+def build_extended_response(records: Sequence[Tuple[int, bytes]]) -> bytes:
+    """Build response buffer from (position, projected data) pairs"""
+    parts = [struct.pack('<H', len(records))]
+    for position, data in records:
+        parts.append(_RECORD_HEADER.pack(len(data), position))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def parse_extended_response(buffer) -> List[Tuple[int, memoryview]]:
+    """
+    Split response buffer into (physical position, projected data) pairs
+
+    Data are zero-copy views into buffer.
+    """
+    view = memoryview(buffer)
+    if len(view) < 2:
+        return []
+    count = struct.unpack_from('<H', view, 0)[0]
+    offset = 2
+    records = []
+    for _ in range(count):
+        length, position = _RECORD_HEADER.unpack_from(view, offset)
+        offset += _RECORD_HEADER.size
+        records.append((position, view[offset:offset + length]))
+        offset += length
+    return records
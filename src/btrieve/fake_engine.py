@@ -0,0 +1,416 @@
+"""
+In-memory emulation of the Btrieve BTRCALL interface
+
+Lets BtrieveClient (and everything built on it) run on Linux without the
+Pervasive DLL - records live in Python dicts and every declared key is kept
+as a sorted index, so keyed operations behave like a B-tree descent.
+"""
+import ctypes
+import os
+import struct
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .btrieve_client import BtrieveClient
+from .extended import build_extended_response, parse_extended_request
+from .file_stat import BtrieveFileStat, KeySegment
+from .keys import KeySpec
+
+_MAX_POSITION = float('inf')
+_DEFAULT_MAX_REJECT = 4095
+_KEY_FLAG_EXTENDED_TYPE = 0x0100
+
+
+def _deref(arg):
+    """Return ctypes object behind ctypes.byref() argument"""
+    return getattr(arg, '_obj', arg)
+
+
+class FakeBtrieveFile:
+    """Records and key indexes of one emulated Btrieve file"""
+
+    def __init__(self, keys: Dict[int, KeySpec], record_length: int = 0,
+                 page_size: int = 4096, file_flags: int = 0, version: int = 0x60):
+        self.keys = dict(keys)
+        self.record_length = record_length
+        self.page_size = page_size
+        self.file_flags = file_flags
+        self.version = version
+        self.records: Dict[int, bytes] = {}  # physical position -> record
+        self.positions: List[int] = []  # physical order
+        self.indexes: Dict[int, List[Tuple]] = {key_num: [] for key_num in self.keys}
+        self._next_position = 0
+
+    def add_record(self, record: bytes, position: Optional[int] = None) -> int:
+        """Store record and index it, returns physical position"""
+        record = bytes(record)
+        if position is None:
+            position = self._next_position
+        self._next_position = max(self._next_position, position + max(self.record_length, len(record), 1))
+        self.records[position] = record
+        insort(self.positions, position)
+        self._index(position, record)
+        return position
+
+    def remove_record(self, position: int) -> None:
+        """Remove record from data and indexes"""
+        record = self.records.pop(position)
+        del self.positions[bisect_left(self.positions, position)]
+        self._unindex(position, record)
+
+    def replace_record(self, position: int, record: bytes) -> None:
+        """Replace record in place (physical position is kept)"""
+        self._unindex(position, self.records[position])
+        self.records[position] = bytes(record)
+        self._index(position, self.records[position])
+
+    def stat(self) -> BtrieveFileStat:
+        """File specification as returned by Stat"""
+        return BtrieveFileStat(
+            record_length=self.record_length or max(map(len, self.records.values()), default=0),
+            page_size=self.page_size,
+            num_keys=len(self.keys),
+            version=self.version,
+            num_records=len(self.records),
+            file_flags=self.file_flags,
+            unused_pages=0,
+            segments=tuple(
+                KeySegment(spec.offset + 1, spec.length, _KEY_FLAG_EXTENDED_TYPE, 0, spec.key_type, key_num)
+                for key_num, spec in sorted(self.keys.items())
+            ),
+        )
+
+    def entry(self, key_num: int, position: int) -> Tuple:
+        """Index entry (key value, position) of stored record"""
+        spec = self.keys[key_num]
+        return spec.compare_value(spec.extract(self.records[position])), position
+
+    def _index(self, position: int, record: bytes) -> None:
+        for key_num, spec in self.keys.items():
+            insort(self.indexes[key_num], (spec.compare_value(spec.extract(record)), position))
+
+    def _unindex(self, position: int, record: bytes) -> None:
+        for key_num, spec in self.keys.items():
+            index = self.indexes[key_num]
+            del index[bisect_left(index, (spec.compare_value(spec.extract(record)), position))]
+
+
+class _FakeCursor:
+    """Per position block state"""
+
+    def __init__(self, file: FakeBtrieveFile):
+        self.file = file
+        self.key_num = 0
+        self.position: Optional[int] = None  # Current record
+
+
+class FakeBtrieveEngine:
+    """Backend emulating BTRCALL over in-memory files (for tests and benchmarks)"""
+
+    def __init__(self):
+        self.files: Dict[str, FakeBtrieveFile] = {}
+        self._cursors: Dict[int, _FakeCursor] = {}
+        self._next_handle = 1
+        self._undo: Dict[bytes, List[Tuple]] = {}  # Undo log of active transaction per client ID
+        self._client_id = b''  # Client ID of the call being processed
+        self._lock = threading.RLock()
+
+    def add_file(self, filename: str, keys: Dict[int, KeySpec],
+                 records: Iterable[bytes] = (), record_length: int = 0) -> FakeBtrieveFile:
+        """Register emulated file under filename"""
+        fake_file = FakeBtrieveFile(keys, record_length)
+        for record in records:
+            fake_file.add_record(record)
+        self.files[self._normalize(filename)] = fake_file
+        return fake_file
+
+    @staticmethod
+    def _normalize(filename: str) -> str:
+        return os.path.normcase(os.path.normpath(filename))
+
+    def btrcall(self, operation: int, pos_block, data_buffer, data_len,
+                key_buffer, key_len: int, key_num: int) -> int:
+        """BTRCALL entry point"""
+        return self.btrcallid(operation, pos_block, data_buffer, data_len,
+                              key_buffer, key_len, key_num, b'')
+
+    def btrcallid(self, operation: int, pos_block, data_buffer, data_len,
+                  key_buffer, key_len: int, key_num: int, client_id: bytes) -> int:
+        """BTRCALLID entry point - calls are serialized, transactions are per client ID"""
+        with self._lock:
+            self._client_id = bytes(client_id)
+            return self._dispatch(operation, pos_block, data_buffer, _deref(data_len), key_buffer, key_num)
+
+    def _dispatch(self, operation: int, pos_block, data_buffer, data_len, key_buffer, key_num: int) -> int:
+        if operation == BtrieveClient.B_OPEN:
+            return self._open(pos_block, key_buffer)
+        if operation % BtrieveClient.B_CONCURRENT in self._TRANSACTION_OPERATIONS:
+            return self._transaction(operation % BtrieveClient.B_CONCURRENT)
+
+        cursor = self._cursors.get(struct.unpack_from('<I', pos_block, 0)[0])
+        if cursor is None:
+            return BtrieveClient.STATUS_FILE_NOT_OPEN
+
+        if operation == BtrieveClient.B_CLOSE:
+            del self._cursors[struct.unpack_from('<I', pos_block, 0)[0]]
+            return BtrieveClient.STATUS_SUCCESS
+        if operation in self._KEYED_OPERATIONS:
+            return self._get(cursor, operation, data_buffer, data_len, key_buffer, key_num)
+        if operation - BtrieveClient.B_GET_KEY in self._KEYED_OPERATIONS:
+            return self._get(cursor, operation - BtrieveClient.B_GET_KEY, data_buffer, data_len,
+                             key_buffer, key_num, key_only=True)
+        if operation in self._STEP_OPERATIONS:
+            return self._step(cursor, operation, data_buffer, data_len)
+        if operation in self._EXTENDED_OPERATIONS:
+            return self._extended(cursor, operation, data_buffer, data_len)
+        if operation == BtrieveClient.B_GET_POSITION:
+            if cursor.position not in cursor.file.records:
+                return BtrieveClient.STATUS_INVALID_POSITIONING
+            return self._return_record(struct.pack('<I', cursor.position), data_buffer, data_len)
+        if operation == BtrieveClient.B_GET_DIRECT:
+            return self._get_direct(cursor, data_buffer, data_len, key_buffer, key_num)
+        if operation == BtrieveClient.B_STAT:
+            return self._return_record(cursor.file.stat().to_bytes(), data_buffer, data_len)
+        if operation == BtrieveClient.B_INSERT:
+            return self._insert(cursor, data_buffer, data_len, key_buffer)
+        if operation == BtrieveClient.B_UPDATE:
+            return self._update(cursor, data_buffer, data_len)
+        if operation == BtrieveClient.B_DELETE:
+            return self._delete(cursor)
+        return BtrieveClient.STATUS_INVALID_OPERATION
+
+    _TRANSACTION_OPERATIONS = (
+        BtrieveClient.B_BEGIN_TRANSACTION, BtrieveClient.B_END_TRANSACTION,
+        BtrieveClient.B_ABORT_TRANSACTION,
+    )
+
+    def _transaction(self, operation: int) -> int:
+        if operation == BtrieveClient.B_BEGIN_TRANSACTION:
+            if self._client_id in self._undo:
+                return BtrieveClient.STATUS_TRANSACTION_ACTIVE
+            self._undo[self._client_id] = []
+            return BtrieveClient.STATUS_SUCCESS
+
+        undo = self._undo.pop(self._client_id, None)
+        if undo is None:
+            return BtrieveClient.STATUS_NO_TRANSACTION
+        if operation == BtrieveClient.B_ABORT_TRANSACTION:
+            for fake_file, position, record in reversed(undo):
+                if position in fake_file.records:
+                    if record is None:
+                        fake_file.remove_record(position)
+                    else:
+                        fake_file.replace_record(position, record)
+                else:
+                    fake_file.add_record(record, position)
+        return BtrieveClient.STATUS_SUCCESS
+
+    def _log(self, fake_file: FakeBtrieveFile, position: int, record: Optional[bytes]) -> None:
+        """Remember previous state of record (None = did not exist) for abort"""
+        undo = self._undo.get(self._client_id)
+        if undo is not None:
+            undo.append((fake_file, position, record))
+
+    def _open(self, pos_block, key_buffer) -> int:
+        filename = key_buffer.value.decode('ascii', errors='ignore')
+        fake_file = self.files.get(self._normalize(filename))
+        if fake_file is None:
+            return BtrieveClient.STATUS_FILE_NOT_FOUND
+
+        handle = self._next_handle
+        self._next_handle += 1
+        self._cursors[handle] = _FakeCursor(fake_file)
+        struct.pack_into('<I', pos_block, 0, handle)
+        return BtrieveClient.STATUS_SUCCESS
+
+    _KEYED_OPERATIONS = (
+        BtrieveClient.B_GET_EQUAL, BtrieveClient.B_GET_NEXT, BtrieveClient.B_GET_PREVIOUS,
+        BtrieveClient.B_GET_GREATER, BtrieveClient.B_GET_GREATER_OR_EQUAL,
+        BtrieveClient.B_GET_LESS, BtrieveClient.B_GET_LESS_OR_EQUAL,
+        BtrieveClient.B_GET_FIRST, BtrieveClient.B_GET_LAST,
+    )
+
+    def _get(self, cursor: _FakeCursor, operation: int, data_buffer, data_len,
+             key_buffer, key_num: int, key_only: bool = False) -> int:
+        if operation in (BtrieveClient.B_GET_NEXT, BtrieveClient.B_GET_PREVIOUS):
+            key_num = cursor.key_num
+            if cursor.position is None or cursor.position not in cursor.file.records:
+                return BtrieveClient.STATUS_INVALID_POSITIONING
+        elif key_num not in cursor.file.keys:
+            return BtrieveClient.STATUS_INVALID_KEY_NUMBER
+
+        index = cursor.file.indexes[key_num]
+        spec = cursor.file.keys[key_num]
+        i = self._seek(cursor, operation, index, spec, key_buffer, key_num)
+
+        if i is None or not 0 <= i < len(index):
+            if operation == BtrieveClient.B_GET_EQUAL:
+                return BtrieveClient.STATUS_KEY_NOT_FOUND
+            return BtrieveClient.STATUS_END_OF_FILE
+        if operation == BtrieveClient.B_GET_EQUAL and index[i][0] != self._key_value(spec, key_buffer):
+            return BtrieveClient.STATUS_KEY_NOT_FOUND
+
+        position = index[i][1]
+        if key_only:
+            data_len.value = 0
+            status = BtrieveClient.STATUS_SUCCESS
+        else:
+            status = self._return_record(cursor.file.records[position], data_buffer, data_len)
+        if status == BtrieveClient.STATUS_SUCCESS:
+            cursor.key_num = key_num
+            cursor.position = position
+            self._write(key_buffer, spec.extract(cursor.file.records[position]))
+        return status
+
+    def _get_direct(self, cursor: _FakeCursor, data_buffer, data_len, key_buffer, key_num: int) -> int:
+        position = struct.unpack_from('<I', data_buffer, 0)[0]
+        record = cursor.file.records.get(position)
+        if record is None:
+            return BtrieveClient.STATUS_INVALID_RECORD_ADDRESS
+        status = self._return_record(record, data_buffer, data_len)
+        if status == BtrieveClient.STATUS_SUCCESS:
+            cursor.position = position
+            if key_num in cursor.file.keys:
+                cursor.key_num = key_num
+                self._write(key_buffer, cursor.file.keys[key_num].extract(record))
+        return status
+
+    _STEP_OPERATIONS = (
+        BtrieveClient.B_STEP_FIRST, BtrieveClient.B_STEP_LAST,
+        BtrieveClient.B_STEP_NEXT, BtrieveClient.B_STEP_PREVIOUS,
+    )
+
+    def _step(self, cursor: _FakeCursor, operation: int, data_buffer, data_len) -> int:
+        positions = cursor.file.positions
+        if operation == BtrieveClient.B_STEP_FIRST:
+            i = 0
+        elif operation == BtrieveClient.B_STEP_LAST:
+            i = len(positions) - 1
+        elif cursor.position is None:
+            return BtrieveClient.STATUS_INVALID_POSITIONING
+        elif operation == BtrieveClient.B_STEP_NEXT:
+            i = bisect_left(positions, cursor.position + 1)
+        else:
+            i = bisect_left(positions, cursor.position) - 1
+
+        if not 0 <= i < len(positions):
+            return BtrieveClient.STATUS_END_OF_FILE
+
+        status = self._return_record(cursor.file.records[positions[i]], data_buffer, data_len)
+        if status == BtrieveClient.STATUS_SUCCESS:
+            cursor.position = positions[i]
+        return status
+
+    _EXTENDED_OPERATIONS = (
+        BtrieveClient.B_GET_NEXT_EXTENDED, BtrieveClient.B_GET_PREVIOUS_EXTENDED,
+        BtrieveClient.B_STEP_NEXT_EXTENDED, BtrieveClient.B_STEP_PREVIOUS_EXTENDED,
+    )
+
+    def _extended(self, cursor: _FakeCursor, operation: int, data_buffer, data_len) -> int:
+        if cursor.position is None or cursor.position not in cursor.file.records:
+            return BtrieveClient.STATUS_INVALID_POSITIONING
+        try:
+            request = parse_extended_request(bytes(memoryview(data_buffer).cast('B')[:data_len.value]))
+        except (struct.error, ValueError):
+            return BtrieveClient.STATUS_INCORRECT_DESCRIPTOR
+
+        fake_file = cursor.file
+        if operation in (BtrieveClient.B_STEP_NEXT_EXTENDED, BtrieveClient.B_STEP_PREVIOUS_EXTENDED):
+            sequence = fake_file.positions
+            i = bisect_left(sequence, cursor.position)
+            position_at = sequence.__getitem__
+        else:
+            sequence = fake_file.indexes[cursor.key_num]
+            i = bisect_left(sequence, fake_file.entry(cursor.key_num, cursor.position))
+            position_at = lambda j: sequence[j][1]
+        step = 1 if operation in (BtrieveClient.B_GET_NEXT_EXTENDED, BtrieveClient.B_STEP_NEXT_EXTENDED) else -1
+        if not request.use_current:
+            i += step
+
+        max_reject = request.max_reject or _DEFAULT_MAX_REJECT
+        found = []
+        rejected = 0
+        status = BtrieveClient.STATUS_SUCCESS
+        while len(found) < request.max_records:
+            if not 0 <= i < len(sequence):
+                status = BtrieveClient.STATUS_END_OF_FILE
+                break
+            position = position_at(i)
+            record = fake_file.records[position]
+            cursor.position = position
+            if request.matches(record):
+                found.append((position, request.extract(record)))
+            else:
+                rejected += 1
+                if rejected >= max_reject:
+                    status = BtrieveClient.STATUS_REJECT_COUNT_REACHED
+                    break
+            i += step
+
+        response = build_extended_response(found)
+        if len(response) > min(data_len.value, ctypes.sizeof(data_buffer)):
+            return BtrieveClient.STATUS_DATA_BUFFER_TOO_SHORT
+        self._write(data_buffer, response)
+        data_len.value = len(response)
+        return status
+
+    def _seek(self, cursor: _FakeCursor, operation: int, index: List[Tuple],
+              spec: KeySpec, key_buffer, key_num: int) -> Optional[int]:
+        """Index slot the operation lands on"""
+        if operation == BtrieveClient.B_GET_FIRST:
+            return 0
+        if operation == BtrieveClient.B_GET_LAST:
+            return len(index) - 1
+        if operation in (BtrieveClient.B_GET_NEXT, BtrieveClient.B_GET_PREVIOUS):
+            i = bisect_left(index, cursor.file.entry(key_num, cursor.position))
+            return i + 1 if operation == BtrieveClient.B_GET_NEXT else i - 1
+
+        value = self._key_value(spec, key_buffer)
+        if operation in (BtrieveClient.B_GET_EQUAL, BtrieveClient.B_GET_GREATER_OR_EQUAL):
+            return bisect_left(index, (value,))
+        if operation == BtrieveClient.B_GET_GREATER:
+            return bisect_left(index, (value, _MAX_POSITION))
+        if operation == BtrieveClient.B_GET_LESS:
+            return bisect_left(index, (value,)) - 1
+        return bisect_left(index, (value, _MAX_POSITION)) - 1  # B_GET_LESS_OR_EQUAL
+
+    @staticmethod
+    def _key_value(spec: KeySpec, key_buffer):
+        return spec.compare_value(bytes(memoryview(key_buffer).cast('B')[:spec.length]))
+
+    def _insert(self, cursor: _FakeCursor, data_buffer, data_len, key_buffer) -> int:
+        record = bytes(memoryview(data_buffer).cast('B')[:data_len.value])
+        cursor.position = cursor.file.add_record(record)
+        self._log(cursor.file, cursor.position, None)
+        if cursor.key_num in cursor.file.keys:
+            self._write(key_buffer, cursor.file.keys[cursor.key_num].extract(record))
+        return BtrieveClient.STATUS_SUCCESS
+
+    def _update(self, cursor: _FakeCursor, data_buffer, data_len) -> int:
+        if cursor.position not in cursor.file.records:
+            return BtrieveClient.STATUS_INVALID_POSITIONING
+        record = bytes(memoryview(data_buffer).cast('B')[:data_len.value])
+        self._log(cursor.file, cursor.position, cursor.file.records[cursor.position])
+        cursor.file.replace_record(cursor.position, record)
+        return BtrieveClient.STATUS_SUCCESS
+
+    def _delete(self, cursor: _FakeCursor) -> int:
+        if cursor.position not in cursor.file.records:
+            return BtrieveClient.STATUS_INVALID_POSITIONING
+        self._log(cursor.file, cursor.position, cursor.file.records[cursor.position])
+        cursor.file.remove_record(cursor.position)
+        cursor.position = None
+        return BtrieveClient.STATUS_SUCCESS
+
+    def _return_record(self, record: bytes, data_buffer, data_len) -> int:
+        if len(record) > min(data_len.value, ctypes.sizeof(data_buffer)):
+            return BtrieveClient.STATUS_DATA_BUFFER_TOO_SHORT
+        self._write(data_buffer, record)
+        data_len.value = len(record)
+        return BtrieveClient.STATUS_SUCCESS
+
+    @staticmethod
+    def _write(buffer, data: bytes) -> None:
+        size = min(len(data), ctypes.sizeof(buffer))
+        memoryview(buffer).cast('B')[:size] = data[:size]
@@ -0,0 +1,408 @@
+"""
+Pure-Python read-only Btrieve file reader
+
+Parses .BTR files directly (no Pervasive DLL), so NEX catalog data can be
+read on Linux from a copy of the YEARACT directory. Files are memory-mapped
+and records are returned as zero-copy views into the mapping.
+
+EXPERIMENTAL: the page layout below has not been checked against a real
+NEX .BTR file yet. The reader and FileBackend are not exported from the
+btrieve package until tests/fixtures/SAMPLE.BTR passes
+(tests/unit/test_file_reader.py).
+
+Supported layout (Btrieve 6.x shadow-paged format):
+- pages 0 and 1 are the two copies of the File Control Record (signature
+  'FC', usage count at 0x04); the copy with the higher usage count is
+  current. It holds page size, record lengths and record count
+- pages 2 and 3 are the first Page Allocation Table pair (signature 'PP',
+  usage count at 0x04, current copy chosen the same way). From 0x08 each
+  4-byte entry maps one logical page: page type in the high byte ('D' for
+  data), physical page number in the low 3 bytes. The next PAT pair
+  follows the pages one PAT can map
+- data pages are found only through the current PAT, so shadow copies and
+  freed pages are never read. A data page starts with a 6-byte header
+  (logical page number, usage count) that must match its PAT entry;
+  fixed-length record slots follow, unused slots start with 0xFFFFFFFF
+- only fixed-length, uncompressed data files are read; any other file flag
+  (variable-length records, blank truncation, compression, key-only, system
+  data) and pre-6.x files without a PAT are rejected with ValueError.
+  Variable pages are not parsed
+
+A scan whose used slots do not add up to exactly the FCR record count
+raises ValueError before any record is returned.
+
+Keyed traversal needs KeySpec definitions (from the .bdf), index pages are
+not parsed - a sorted key index is built in memory on first use instead.
+"""
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .file_stat import BtrieveFileStat, FileFingerprint
+from .keys import KeySpec
+
+# FCR file flags (Btrieve Create / Stat file flags)
+FILE_FLAG_VARIABLE_LENGTH = 0x0001
+FILE_FLAG_BLANK_TRUNCATION = 0x0002
+FILE_FLAG_PREALLOCATION = 0x0004
+FILE_FLAG_DATA_COMPRESSION = 0x0008
+FILE_FLAG_KEY_ONLY = 0x0010
+FILE_FLAG_FREE_SPACE_10 = 0x0040
+FILE_FLAG_FREE_SPACE_20 = 0x0080
+FILE_FLAG_SYSTEM_DATA = 0x0200
+FILE_FLAG_PAGE_COMPRESSION = 0x0800
+
+# Flags that do not change the data page layout
+SUPPORTED_FILE_FLAGS = FILE_FLAG_PREALLOCATION | FILE_FLAG_FREE_SPACE_10 | FILE_FLAG_FREE_SPACE_20
+
+_FLAG_NAMES = {
+    FILE_FLAG_VARIABLE_LENGTH: 'variable-length records',
+    FILE_FLAG_BLANK_TRUNCATION: 'blank truncation',
+    FILE_FLAG_DATA_COMPRESSION: 'data compression',
+    FILE_FLAG_KEY_ONLY: 'key-only file',
+    FILE_FLAG_SYSTEM_DATA: 'system data',
+    FILE_FLAG_PAGE_COMPRESSION: 'page compression',
+}
+
+_FCR_SIGNATURE = b'FC'
+_PAT_SIGNATURE = b'PP'
+_FIRST_PAT_PAGE = 2
+_PAT_HEADER_SIZE = 8
+_PAT_ENTRY_SIZE = 4
+_PAT_DATA_PAGE = ord('D')
+_PAGE_HEADER_SIZE = 6
+_UNUSED_SLOT = b'\xff\xff\xff\xff'
+
+
+@dataclass(frozen=True)
+class FileControlRecord:
+    """File Control Record (page 0) of a Btrieve file"""
+
+    version: int  # 5 or 6 (6 = 'FC' signature, shadow paging)
+    page_size: int
+    num_keys: int
+    record_length: int  # Logical (fixed) record length
+    physical_record_length: int  # Slot size in data pages
+    num_records: int
+    file_flags: int
+    usage_count: int
+
+    @property
+    def variable_length(self) -> bool:
+        return bool(self.file_flags & FILE_FLAG_VARIABLE_LENGTH)
+
+    @classmethod
+    def from_page(cls, page: memoryview) -> 'FileControlRecord':
+        """Decode FCR page"""
+        version = 6 if bytes(page[0:2]) == _FCR_SIGNATURE else 5
+        usage_count = struct.unpack_from('<I', page, 0x04)[0] if version == 6 else 0
+        page_size = struct.unpack_from('<H', page, 0x08)[0]
+        file_flags = struct.unpack_from('<H', page, 0x0A)[0]
+        num_keys = struct.unpack_from('<H', page, 0x14)[0]
+        record_length = struct.unpack_from('<H', page, 0x16)[0]
+        physical_record_length = struct.unpack_from('<H', page, 0x18)[0]
+        records_high, records_low = struct.unpack_from('<HH', page, 0x1C)
+
+        return cls(
+            version=version,
+            page_size=page_size,
+            num_keys=num_keys,
+            record_length=record_length,
+            physical_record_length=physical_record_length,
+            num_records=(records_high << 16) | records_low,
+            file_flags=file_flags,
+            usage_count=usage_count,
+        )
+
+
+class BtrieveFile:
+    """Memory-mapped read-only Btrieve file"""
+
+    def __init__(self, path: Union[str, Path], keys: Optional[Dict[int, KeySpec]] = None):
+        """
+        Args:
+            path: .BTR file path
+            keys: Key definitions (key number -> KeySpec) for keyed traversal
+
+        Raises:
+            ValueError: File is not a supported Btrieve file
+        """
+        self.path = Path(path)
+        self.keys = dict(keys or {})
+        self._file = open(self.path, 'rb')
+        st = os.fstat(self._file.fileno())
+        self.mtime_ns, self.size = st.st_mtime_ns, st.st_size  # When mapped
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty Btrieve file: {self.path}")
+        self._view = memoryview(self._mmap)
+        try:
+            self.fcr = self._read_fcr()
+        except ValueError:
+            self.close()
+            raise
+        self._data_pages: Optional[List[int]] = None
+        self._positions: Optional[List[int]] = None
+        self._indexes: Dict[int, List[Tuple]] = {}
+
+    def close(self) -> None:
+        """Unmap file (views returned earlier must be released first)"""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            self._mmap.close()
+            self._file.close()
+
+    def is_stale(self) -> bool:
+        """File on disk was modified or replaced since it was mapped"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return True
+        return st.st_mtime_ns != self.mtime_ns or st.st_size != self.size
+
+    def __enter__(self) -> 'BtrieveFile':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _read_fcr(self) -> FileControlRecord:
+        fcr = FileControlRecord.from_page(self._view)
+        if fcr.version == 6 and fcr.page_size and len(self._view) >= 2 * fcr.page_size:
+            # Shadow paging keeps two FCR copies - the one with higher usage count is current
+            with self._view[fcr.page_size:2 * fcr.page_size] as second:
+                if bytes(second[0:2]) == _FCR_SIGNATURE:
+                    other = FileControlRecord.from_page(second)
+                    if other.usage_count > fcr.usage_count:
+                        fcr = other
+
+        if fcr.version != 6:
+            raise ValueError(f"Unsupported Btrieve file format: {self.path} (no 'FC' signature, "
+                             f"pre-6.x files are not supported)")
+        if fcr.page_size < 512 or fcr.page_size % 512 or len(self._view) % fcr.page_size:
+            raise ValueError(f"Unsupported Btrieve file format: {self.path} (page size {fcr.page_size})")
+        if not 0 < fcr.record_length <= fcr.physical_record_length <= fcr.page_size - _PAGE_HEADER_SIZE:
+            raise ValueError(f"Unsupported Btrieve file format: {self.path} (record length {fcr.record_length})")
+
+        unsupported = fcr.file_flags & ~SUPPORTED_FILE_FLAGS
+        if unsupported:
+            names = [name for flag, name in _FLAG_NAMES.items() if unsupported & flag]
+            if unsupported & ~sum(_FLAG_NAMES):
+                names.append(f"unknown 0x{unsupported & ~sum(_FLAG_NAMES):04X}")
+            raise ValueError(f"Unsupported Btrieve file flags 0x{fcr.file_flags:04X} in {self.path}: "
+                             f"{', '.join(names)}")
+        return fcr
+
+    @property
+    def record_length(self) -> int:
+        return self.fcr.record_length
+
+    @property
+    def num_records(self) -> int:
+        return self.fcr.num_records
+
+    def stat(self) -> BtrieveFileStat:
+        """File specification in the form returned by the engine's Stat"""
+        fcr = self.fcr
+        return BtrieveFileStat(
+            record_length=fcr.record_length,
+            page_size=fcr.page_size,
+            num_keys=fcr.num_keys,
+            version=fcr.version << 4,
+            num_records=fcr.num_records,
+            file_flags=fcr.file_flags,
+            unused_pages=0,
+        )
+
+    def fingerprint(self) -> FileFingerprint:
+        """Stat combined with filesystem mtime/size"""
+        return FileFingerprint.create(str(self.path), self.stat())
+
+    def _current_pat(self, page: int) -> int:
+        """File offset of the current copy of the PAT pair starting at physical page"""
+        page_size = self.fcr.page_size
+        copies = []
+        for number in (page, page + 1):
+            offset = number * page_size
+            if offset + page_size > len(self._view) or bytes(self._view[offset:offset + 2]) != _PAT_SIGNATURE:
+                raise ValueError(f"{self.path}: no page allocation table at page {number}, "
+                                 f"page layout not recognized")
+            copies.append((struct.unpack_from('<I', self._view, offset + 0x04)[0], offset))
+        return max(copies)[1]
+
+    def data_pages(self) -> List[int]:
+        """File offsets of the current data pages (resolved through the PAT) in physical order"""
+        if self._data_pages is None:
+            page_size = self.fcr.page_size
+            num_pages = len(self._view) // page_size
+            entries_per_pat = (page_size - _PAT_HEADER_SIZE) // _PAT_ENTRY_SIZE
+            pat_pages = {0, 1}
+            data_pages: Dict[int, int] = {}  # physical page -> logical page
+
+            pat_page = _FIRST_PAT_PAGE
+            logical = 0
+            while pat_page < num_pages:
+                pat_offset = self._current_pat(pat_page) + _PAT_HEADER_SIZE
+                pat_pages.update((pat_page, pat_page + 1))
+                for entry in struct.unpack_from(f'<{entries_per_pat}I', self._view, pat_offset):
+                    if entry >> 24 == _PAT_DATA_PAGE:
+                        physical = entry & 0xFFFFFF
+                        if physical >= num_pages or physical in data_pages:
+                            raise ValueError(f"{self.path}: logical page {logical} maps to page {physical}, "
+                                             f"page layout not recognized")
+                        data_pages[physical] = logical
+                    logical += 1
+                pat_page += entries_per_pat + 2
+
+            for physical, logical in data_pages.items():
+                if physical in pat_pages or struct.unpack_from('<I', self._view, physical * page_size)[0] != logical:
+                    raise ValueError(f"{self.path}: page {physical} does not hold logical page {logical}, "
+                                     f"page layout not recognized")
+            self._data_pages = [physical * page_size for physical in sorted(data_pages)]
+        return self._data_pages
+
+    def record_positions(self) -> List[int]:
+        """
+        Physical positions of all used record slots
+
+        Raises:
+            ValueError: Used slots differ from the FCR record count
+                        (page layout not recognized)
+        """
+        if self._positions is None:
+            view = self._view
+            slot = self.fcr.physical_record_length
+            slots_per_page = (self.fcr.page_size - _PAGE_HEADER_SIZE) // slot
+            positions = [
+                position
+                for page_offset in self.data_pages()
+                for position in range(page_offset + _PAGE_HEADER_SIZE,
+                                      page_offset + _PAGE_HEADER_SIZE + slots_per_page * slot, slot)
+                if view[position:position + 4] != _UNUSED_SLOT
+            ]
+            if len(positions) != self.fcr.num_records:
+                raise ValueError(f"{self.path}: found {len(positions)} of {self.fcr.num_records} records, "
+                                 f"page layout not recognized")
+            self._positions = positions
+        return self._positions
+
+    def iter_physical(self) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Yield (physical position, record view) in physical order
+
+        The whole file is checked before the first record is returned.
+
+        Raises:
+            ValueError: Data pages do not hold exactly the FCR record count
+                        (page layout not recognized)
+        """
+        view = self._view
+        length = self.fcr.record_length
+        for position in self.record_positions():
+            yield position, view[position:position + length]
+
+    def record_at(self, position: int) -> memoryview:
+        """Record view at physical position"""
+        return self._view[position:position + self.fcr.record_length]
+
+    def index(self, key_num: int) -> List[Tuple]:
+        """Sorted (key value, position) list for key_num (built on first use)"""
+        index = self._indexes.get(key_num)
+        if index is None:
+            spec = self.keys.get(key_num)
+            if spec is None:
+                raise KeyError(f"No KeySpec for key {key_num} of {self.path}")
+            index = sorted(
+                (spec.compare_value(spec.extract(record)), position)
+                for position, record in self.iter_physical()
+            )
+            self._indexes[key_num] = index
+        return index
+
+    def iter_keyed(self, key_num: int, start_key: Optional[bytes] = None) -> Iterator[Tuple[int, memoryview]]:
+        """Yield (physical position, record view) in key order, optionally from start_key (>=)"""
+        index = self.index(key_num)
+        i = 0
+        if start_key is not None:
+            i = bisect_left(index, (self.keys[key_num].compare_value(start_key),))
+        for _, position in index[i:]:
+            yield position, self.record_at(position)
+
+
+class BtrieveFileReader:
+    """Read-only Btrieve engine over .BTR files with the BtrieveClient iterator interface"""
+
+    def __init__(self):
+        self._files: Dict[str, BtrieveFile] = {}
+
+    @staticmethod
+    def _normalize(filename: Union[str, Path]) -> str:
+        return os.path.normcase(os.path.normpath(str(filename)))
+
+    def open(self, filename: Union[str, Path], keys: Optional[Dict[int, KeySpec]] = None) -> BtrieveFile:
+        """
+        Open (or reuse) memory-mapped file, keys are added to its key definitions
+
+        A file changed on disk since it was mapped is mapped again.
+        """
+        name = self._normalize(filename)
+        btrieve_file = self._files.get(name)
+        if btrieve_file is not None and btrieve_file.is_stale():
+            keys = {**btrieve_file.keys, **(keys or {})}
+            try:
+                btrieve_file.close()
+            except BufferError:
+                pass  # Views of the old mapping are still in use, it is unmapped with them
+            del self._files[name]
+            btrieve_file = None
+        if btrieve_file is None:
+            btrieve_file = BtrieveFile(filename, keys)
+            self._files[name] = btrieve_file
+        elif keys:
+            btrieve_file.keys.update(keys)
+        return btrieve_file
+
+    def close_all(self) -> None:
+        """Unmap all open files"""
+        for btrieve_file in self._files.values():
+            btrieve_file.close()
+        self._files.clear()
+
+    def iter_records(self, file: Union[str, Path, BtrieveFile], key_num: Optional[int] = None,
+                     start_key: Optional[bytes] = None, physical: bool = True,
+                     decoder: Optional[Callable[[memoryview], Any]] = None,
+                     copy: bool = True, record_length: Optional[int] = None,
+                     positions: bool = False) -> Iterator[Any]:
+        """
+        Iterate records of a file (same semantics as BtrieveClient.iter_records)
+
+        Args:
+            file: File path or BtrieveFile (keyed order needs its KeySpecs)
+            key_num: Key for logical order
+            start_key: Key buffer to start from (>=)
+            physical: Physical order when no key is requested
+            decoder: Called with zero-copy record view
+            copy: Without decoder yield bytes copies; False yields memoryviews
+            record_length: Unused - record length comes from the FCR
+            positions: Yield (physical position, record)
+        """
+        btrieve_file = file if isinstance(file, BtrieveFile) else self.open(file)
+
+        if start_key is not None or key_num is not None or not physical:
+            records = btrieve_file.iter_keyed(key_num or 0, start_key)
+        else:
+            records = btrieve_file.iter_physical()
+
+        for position, record in records:
+            if decoder is not None:
+                item = decoder(record)
+            else:
+                item = record.tobytes() if copy else record
+            yield (position, item) if positions else item
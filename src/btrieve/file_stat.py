@@ -0,0 +1,117 @@
+"""
+Btrieve Stat (operation 15) results and file fingerprints for cache invalidation
+"""
+import os
+import struct
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+# Stat data buffer: file specification followed by key segment specifications
+_FILE_SPEC = struct.Struct('<HHBBIHBBH')
+_KEY_SPEC = struct.Struct('<HHHIBBHBB')
+
+KEY_FLAG_SEGMENTED = 0x0010
+
+STAT_BUFFER_SIZE = _FILE_SPEC.size + 119 * _KEY_SPEC.size + 265  # Max segments + ACS
+
+
+@dataclass(frozen=True)
+class KeySegment:
+    """Key segment specification returned by Stat"""
+
+    position: int  # 1-based offset in record
+    length: int
+    flags: int
+    unique_values: int
+    key_type: int  # Extended key type (KEY_TYPE_*)
+    key_num: int
+
+
+@dataclass(frozen=True)
+class BtrieveFileStat:
+    """File specification returned by Stat"""
+
+    record_length: int
+    page_size: int
+    num_keys: int
+    version: int
+    num_records: int
+    file_flags: int
+    unused_pages: int
+    segments: Tuple[KeySegment, ...] = ()
+
+    def find_key(self, offset: int) -> Optional[KeySegment]:
+        """Single-segment key starting at 0-based record offset (None if the file has none)"""
+        for segment in self.segments:
+            if (segment.position - 1 == offset
+                    and sum(1 for other in self.segments if other.key_num == segment.key_num) == 1):
+                return segment
+        return None
+
+    @classmethod
+    def from_buffer(cls, data: bytes) -> 'BtrieveFileStat':
+        """Decode Stat data buffer"""
+        (record_length, page_size, num_keys, version, num_records,
+         file_flags, _, _, unused_pages) = _FILE_SPEC.unpack_from(data, 0)
+
+        segments = []
+        offset = _FILE_SPEC.size
+        key_num = 0
+        while key_num < num_keys and offset + _KEY_SPEC.size <= len(data):
+            position, length, flags, unique_values, key_type, _, _, _, _ = _KEY_SPEC.unpack_from(data, offset)
+            segments.append(KeySegment(position, length, flags, unique_values, key_type, key_num))
+            offset += _KEY_SPEC.size
+            if not flags & KEY_FLAG_SEGMENTED:
+                key_num += 1
+
+        return cls(record_length, page_size, num_keys, version, num_records,
+                   file_flags, unused_pages, tuple(segments))
+
+    def to_bytes(self) -> bytes:
+        """Encode as Stat data buffer"""
+        data = bytearray(_FILE_SPEC.pack(
+            self.record_length, self.page_size, self.num_keys, self.version,
+            self.num_records, self.file_flags, 0, 0, self.unused_pages,
+        ))
+        for segment in self.segments:
+            data += _KEY_SPEC.pack(
+                segment.position, segment.length, segment.flags, segment.unique_values,
+                segment.key_type, 0, 0, segment.key_num, 0,
+            )
+        return bytes(data)
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """Engine view (Stat) and filesystem view (mtime/size) of a file at one point in time"""
+
+    path: str
+    mtime_ns: int
+    size: int
+    num_records: int
+    record_length: int
+    page_size: int
+    file_flags: int
+    unused_pages: int
+
+    @classmethod
+    def create(cls, path: str, stat: BtrieveFileStat) -> 'FileFingerprint':
+        """Combine Stat result with current filesystem metadata of path"""
+        st = os.stat(path)
+        return cls(
+            path=str(path),
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            num_records=stat.num_records,
+            record_length=stat.record_length,
+            page_size=stat.page_size,
+            file_flags=stat.file_flags,
+            unused_pages=stat.unused_pages,
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FileFingerprint':
+        return cls(**data)
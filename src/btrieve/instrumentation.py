@@ -0,0 +1,241 @@
+"""
+Btrieve call instrumentation
+
+InstrumentedBackend wraps any backend and records per operation and per
+file: call count, total/min/max latency, a log2 latency histogram (for
+percentiles) and the status code distribution. Files are identified by
+their position block, mapped to the filename when the file is opened.
+"""
+import atexit
+import ctypes
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .btrieve_client import BtrieveClient
+from .engine import BtrieveBackend, get_configured_backend, get_engine, set_default_backend
+from .registry import get_file_registry
+from .session import _warn_shared_client_id
+
+logger = logging.getLogger(__name__)
+
+_OPERATION_NAMES = {
+    value: name[2:] for name, value in vars(BtrieveClient).items()
+    if name.startswith('B_') and isinstance(value, int)
+    and value not in (BtrieveClient.B_GET_KEY, BtrieveClient.B_CONCURRENT)
+}
+
+
+def operation_name(operation: int) -> str:
+    """Readable name of operation code (including key-only and concurrent biases)"""
+    if operation >= BtrieveClient.B_CONCURRENT:
+        return operation_name(operation % BtrieveClient.B_CONCURRENT) + '_CONCURRENT'
+    if operation in _OPERATION_NAMES:
+        return _OPERATION_NAMES[operation]
+    if operation - BtrieveClient.B_GET_KEY in _OPERATION_NAMES:
+        return _OPERATION_NAMES[operation - BtrieveClient.B_GET_KEY].replace('GET_', 'GET_KEY_', 1)
+    return f"OP_{operation}"
+
+
+class CallStats:
+    """Counters and latency histogram of one group of calls"""
+
+    __slots__ = ('count', 'total_ns', 'min_ns', 'max_ns', 'buckets', 'statuses')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * 64  # bucket b: latency in [2^(b-1), 2^b) ns
+        self.statuses: Counter = Counter()
+
+    def record(self, elapsed_ns: int, status: int) -> None:
+        if not self.count or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.buckets[min(elapsed_ns.bit_length(), 63)] += 1
+        self.statuses[status] += 1
+
+    def merge(self, other: 'CallStats') -> None:
+        if other.count and (not self.count or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.statuses.update(other.statuses)
+
+    def percentile(self, p: float) -> float:
+        """Latency percentile in ms (upper bound of the histogram bucket)"""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(1 << bucket, self.max_ns) / 1e6
+        return self.max_ns / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ns / 1e6, 3),
+            'avg_ms': round(self.total_ns / self.count / 1e6, 4) if self.count else 0.0,
+            'min_ms': round(self.min_ns / 1e6, 4),
+            'max_ms': round(self.max_ns / 1e6, 4),
+            'p50_ms': round(self.percentile(50), 4),
+            'p90_ms': round(self.percentile(90), 4),
+            'p99_ms': round(self.percentile(99), 4),
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+        }
+
+
+class InstrumentedBackend:
+    """Backend wrapper measuring every call of the inner backend"""
+
+    def __init__(self, inner: Optional[BtrieveBackend] = None):
+        """
+        Args:
+            inner: Backend to measure (None = DLL engine, loaded on first call)
+        """
+        self._inner = inner
+        self._stats: Dict[Tuple[str, int], CallStats] = {}
+        self._files: Dict[int, str] = {}  # address of position block -> filename
+        self._lock = threading.Lock()
+        self.started = time.time()
+        if inner is None or getattr(inner, 'btrcallid', None) is not None:
+            self.btrcallid = self._btrcallid
+
+    @property
+    def inner(self) -> BtrieveBackend:
+        if self._inner is None:
+            self._inner = get_engine()
+        return self._inner
+
+    @property
+    def dll(self):
+        return getattr(self.inner, 'dll', None)
+
+    def btrcall(self, operation: int, pos_block, data_buffer, data_len,
+                key_buffer, key_len: int, key_num: int) -> int:
+        """BTRCALL entry point"""
+        start = time.perf_counter_ns()
+        status = self.inner.btrcall(operation, pos_block, data_buffer, data_len,
+                                    key_buffer, key_len, key_num)
+        self._record(operation, pos_block, key_buffer, status, time.perf_counter_ns() - start)
+        return status
+
+    def _btrcallid(self, operation: int, pos_block, data_buffer, data_len,
+                   key_buffer, key_len: int, key_num: int, client_id: bytes) -> int:
+        """BTRCALLID entry point"""
+        btrcallid = getattr(self.inner, 'btrcallid', None)
+        start = time.perf_counter_ns()
+        if btrcallid is None:
+            _warn_shared_client_id(self.inner)
+            status = self.inner.btrcall(operation, pos_block, data_buffer, data_len,
+                                        key_buffer, key_len, key_num)
+        else:
+            status = btrcallid(operation, pos_block, data_buffer, data_len,
+                               key_buffer, key_len, key_num, client_id)
+        self._record(operation, pos_block, key_buffer, status, time.perf_counter_ns() - start)
+        return status
+
+    def _record(self, operation: int, pos_block, key_buffer, status: int, elapsed_ns: int) -> None:
+        address = ctypes.addressof(pos_block) if isinstance(pos_block, ctypes.Array) else 0
+        with self._lock:
+            if operation == BtrieveClient.B_OPEN and status == BtrieveClient.STATUS_SUCCESS:
+                self._files[address] = key_buffer.value.decode('ascii', errors='ignore')
+            filename = self._files.get(address, '')
+            if operation == BtrieveClient.B_CLOSE:
+                self._files.pop(address, None)
+
+            stats = self._stats.get((filename, operation))
+            if stats is None:
+                stats = self._stats[(filename, operation)] = CallStats()
+            stats.record(elapsed_ns, status)
+
+    def reset(self) -> None:
+        """Drop collected statistics (open file mapping is kept)"""
+        with self._lock:
+            self._stats.clear()
+            self.started = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Statistics as dict:
+        {'elapsed_s', 'total', 'operations': {name: stats}, 'files': {filename: {'total', 'operations'}}}
+        """
+        total = CallStats()
+        operations: Dict[int, CallStats] = {}
+        files: Dict[str, Dict[str, Any]] = {}
+        file_totals: Dict[str, CallStats] = {}
+
+        with self._lock:
+            for (filename, operation), stats in sorted(self._stats.items()):
+                filename = filename or '<unknown>'
+                total.merge(stats)
+                operations.setdefault(operation, CallStats()).merge(stats)
+                file_totals.setdefault(filename, CallStats()).merge(stats)
+                files.setdefault(filename, {'operations': {}})['operations'][operation_name(operation)] = stats.to_dict()
+
+        for filename, stats in file_totals.items():
+            files[filename]['total'] = stats.to_dict()
+
+        return {
+            'elapsed_s': round(time.time() - self.started, 3),
+            'total': total.to_dict(),
+            'operations': {operation_name(op): stats.to_dict() for op, stats in sorted(operations.items())},
+            'files': files,
+        }
+
+    def dump(self, path: Union[str, Path]) -> None:
+        """Write snapshot as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+# Instrumented default backend (enable_instrumentation)
+_instrumented: Optional[InstrumentedBackend] = None
+
+
+def enable_instrumentation(backend: Optional[BtrieveBackend] = None,
+                           dump_path: Optional[Union[str, Path]] = None) -> InstrumentedBackend:
+    """
+    Instrument the default backend of all new BtrieveClient instances
+
+    Clients keep the backend they were created with - call this before
+    opening files. The process file registry switches to the instrumented
+    backend for files it opens afterwards; handles it already has open are
+    not counted until reopened (logged as a warning).
+
+    Args:
+        backend: Backend to wrap (None = current default backend / DLL engine)
+        dump_path: JSON file written with the snapshot at process exit
+
+    Returns:
+        Instrumented backend (call snapshot() on it any time)
+    """
+    global _instrumented
+    if _instrumented is None:
+        _instrumented = InstrumentedBackend(backend if backend is not None else get_configured_backend())
+        set_default_backend(_instrumented)
+        if not get_file_registry().follow_default_backend():
+            logger.warning("Btrieve instrumentation enabled after files were opened - "
+                           "calls on handles already open are not counted")
+    if dump_path is not None:
+        atexit.register(_instrumented.dump, dump_path)
+    return _instrumented
+
+
+def get_instrumentation() -> Optional[InstrumentedBackend]:
+    """Instrumented default backend or None when instrumentation is disabled"""
+    return _instrumented
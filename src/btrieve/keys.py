@@ -0,0 +1,62 @@
+"""
+Btrieve key definitions and key buffer construction
+"""
+import struct
+from dataclasses import dataclass
+from typing import Union
+
+# Btrieve extended key types
+KEY_TYPE_STRING = 0
+KEY_TYPE_INTEGER = 1
+KEY_TYPE_FLOAT = 2
+KEY_TYPE_LSTRING = 10
+KEY_TYPE_ZSTRING = 11
+KEY_TYPE_UNSIGNED_BINARY = 14
+KEY_TYPE_AUTOINCREMENT = 15
+
+
+@dataclass(frozen=True)
+class KeySpec:
+    """Single-segment Btrieve key (position and type within record)"""
+
+    offset: int  # 0-based offset in record
+    length: int  # Key length in bytes
+    key_type: int = KEY_TYPE_STRING
+    encoding: str = 'cp852'
+
+    def build(self, value: Union[int, float, str, bytes]) -> bytes:
+        """Build key buffer for value"""
+        if self.key_type == KEY_TYPE_FLOAT:
+            return struct.pack('<d' if self.length == 8 else '<f', value)
+        if self.key_type in (KEY_TYPE_INTEGER, KEY_TYPE_AUTOINCREMENT):
+            return int(value).to_bytes(self.length, 'little', signed=True)
+        if self.key_type == KEY_TYPE_UNSIGNED_BINARY:
+            return int(value).to_bytes(self.length, 'little', signed=False)
+
+        raw = value.encode(self.encoding) if isinstance(value, str) else bytes(value)
+
+        if self.key_type == KEY_TYPE_LSTRING:
+            # [length][data...] - Pascal string
+            raw = raw[:self.length - 1]
+            return bytes([len(raw)]) + raw.ljust(self.length - 1, b'\x00')
+        if self.key_type == KEY_TYPE_ZSTRING:
+            return raw[:self.length - 1].ljust(self.length, b'\x00')
+        return raw[:self.length].ljust(self.length, b'\x00')
+
+    def extract(self, record: bytes) -> bytes:
+        """Extract raw key bytes from record"""
+        return bytes(record[self.offset:self.offset + self.length])
+
+    def compare_value(self, raw_key: bytes) -> Union[int, float, bytes]:
+        """Convert raw key bytes to value ordered the same way as the engine"""
+        if self.key_type == KEY_TYPE_FLOAT:
+            return struct.unpack_from('<d' if self.length == 8 else '<f', raw_key)[0]
+        if self.key_type in (KEY_TYPE_INTEGER, KEY_TYPE_AUTOINCREMENT):
+            return int.from_bytes(raw_key[:self.length], 'little', signed=True)
+        if self.key_type == KEY_TYPE_UNSIGNED_BINARY:
+            return int.from_bytes(raw_key[:self.length], 'little', signed=False)
+        if self.key_type == KEY_TYPE_LSTRING:
+            return bytes(raw_key[1:1 + raw_key[0]]) if raw_key else b''
+        if self.key_type == KEY_TYPE_ZSTRING:
+            return bytes(raw_key).split(b'\x00', 1)[0]
+        return bytes(raw_key[:self.length])
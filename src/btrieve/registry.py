@@ -0,0 +1,260 @@
+"""
+Registry of persistently open Btrieve files
+
+Opening a Btrieve file is the most expensive part of a lookup, so position
+blocks of the NEX tables (GSCAT, BARCODE, MGLST, PAB) are opened once and
+shared by reference count until released or until explicit shutdown.
+
+For concurrent use, checkout() lends a handle from a bounded pool per file;
+each pooled handle has its own client ID (Btrieve session) and buffers.
+
+shutdown_btrieve() is registered with atexit when the first file is opened,
+importing the module has no process-wide side effects.
+"""
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .btrieve_client import BtrieveClient
+from .cursor import BtrieveCursor
+from .engine import shutdown_engine
+from .file_stat import FileFingerprint
+from .session import session_client
+
+DEFAULT_POOL_SIZE = 4
+
+
+class _RegisteredFile:
+    """Open cursor with its reference count"""
+
+    def __init__(self, cursor: BtrieveCursor):
+        self.cursor = cursor
+        self.refcount = 0
+
+
+class _HandlePool:
+    """Bounded pool of open handles of one file"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.idle: List[BtrieveCursor] = []
+        self.handles: List[BtrieveCursor] = []
+        self._opening = 0
+        self._condition = threading.Condition()
+
+    def get(self, open_handle: Callable[[], BtrieveCursor], timeout: Optional[float]) -> BtrieveCursor:
+        """Take idle handle, open a new one below max_size, otherwise wait"""
+        with self._condition:
+            while not self.idle:
+                if len(self.handles) + self._opening < self.max_size:
+                    self._opening += 1
+                    break
+                if not self._condition.wait(timeout):
+                    raise RuntimeError(f"No free Btrieve handle within {timeout} s")
+            else:
+                return self.idle.pop()
+
+        try:
+            cursor = open_handle()
+        except BaseException:
+            with self._condition:
+                self._opening -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._opening -= 1
+            self.handles.append(cursor)
+        return cursor
+
+    def put(self, cursor: BtrieveCursor) -> None:
+        """Return handle to the pool"""
+        with self._condition:
+            self.idle.append(cursor)
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            handles, self.handles, self.idle = self.handles, [], []
+        for cursor in handles:
+            cursor.close()
+
+
+class OpenFileRegistry:
+    """Keeps Btrieve files open and shares their cursors"""
+
+    def __init__(self, client: Optional[BtrieveClient] = None, pool_size: int = DEFAULT_POOL_SIZE):
+        """
+        Args:
+            client: Client for acquire() handles; pooled handles use sessions
+                    over its backend (None = default backend)
+            pool_size: Max open handles per file for checkout()
+        """
+        self._client = client
+        self._own_client = client is None
+        self.pool_size = pool_size
+        self._files: Dict[str, _RegisteredFile] = {}
+        self._pools: Dict[str, _HandlePool] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> BtrieveClient:
+        """Client used to open/close files (created on first use)"""
+        if self._client is None:
+            self._client = BtrieveClient()
+        return self._client
+
+    def follow_default_backend(self) -> bool:
+        """
+        Drop the lazily created client, files opened from now on use the current default backend
+
+        Returns:
+            False when some handles are still open through the previous backend
+            (they keep it until closed) or the client was passed in explicitly
+        """
+        if not self._own_client:
+            return False
+        with self._lock:
+            self._client = None
+            return not self._files and not any(pool.handles for pool in self._pools.values())
+
+    @staticmethod
+    def _normalize(filename: str) -> str:
+        return os.path.normcase(os.path.normpath(str(filename)))
+
+    def acquire(self, filename: str, record_length: Optional[int] = None) -> BtrieveCursor:
+        """
+        Get open cursor for filename (opens the file on first use)
+
+        Args:
+            filename: Btrieve file path
+            record_length: Data buffer size used when the file is opened
+
+        Raises:
+            RuntimeError: File cannot be opened
+        """
+        name = self._normalize(filename)
+        with self._lock:
+            entry = self._files.get(name)
+            if entry is None:
+                _register_shutdown()
+                entry = _RegisteredFile(self.client.open_cursor(str(filename), record_length))
+                self._files[name] = entry
+            entry.refcount += 1
+            return entry.cursor
+
+    def release(self, filename: str) -> None:
+        """Drop one reference, file is closed when the last one is released"""
+        name = self._normalize(filename)
+        with self._lock:
+            entry = self._files.get(name)
+            if entry is None:
+                return
+            entry.refcount -= 1
+            if entry.refcount <= 0:
+                del self._files[name]
+                entry.cursor.close()
+
+    def refcount(self, filename: str) -> int:
+        """Number of active references to filename"""
+        name = self._normalize(filename)
+        with self._lock:
+            entry = self._files.get(name)
+            return entry.refcount if entry else 0
+
+    @contextmanager
+    def checkout(self, filename: str, record_length: Optional[int] = None,
+                 timeout: Optional[float] = None) -> Iterator[BtrieveCursor]:
+        """
+        Borrow an open handle for exclusive use by the calling thread
+
+        Handles stay open after return; at most pool_size are opened per
+        file and further callers wait for a free one.
+
+        Args:
+            filename: Btrieve file path
+            record_length: Data buffer size of new handles
+            timeout: Max wait for a free handle in seconds (None = no limit)
+
+        Raises:
+            RuntimeError: File cannot be opened or no handle freed within timeout
+        """
+        name = self._normalize(filename)
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = _HandlePool(self.pool_size)
+                self._pools[name] = pool
+
+        def open_handle() -> BtrieveCursor:
+            _register_shutdown()
+            backend = self._client.backend if self._client is not None else None
+            return session_client(backend).open_cursor(str(filename), record_length)
+
+        cursor = pool.get(open_handle, timeout)
+        try:
+            yield cursor
+        finally:
+            pool.put(cursor)
+
+    def has_changed(self, since: FileFingerprint, record_length: Optional[int] = None) -> bool:
+        """
+        BtrieveClient.has_changed on a pooled handle of since.path
+
+        Stat runs on a handle that stays open, so a check costs no Open/Close.
+        A file that cannot be opened counts as changed.
+        """
+        try:
+            with self.checkout(since.path, record_length or since.record_length) as cursor:
+                return cursor.client.has_changed(since, file=cursor)
+        except RuntimeError:
+            return True
+
+    def close_all(self) -> None:
+        """Close all registered files and pooled handles regardless of reference counts"""
+        with self._lock:
+            files = list(self._files.values())
+            self._files.clear()
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for entry in files:
+            entry.cursor.close()
+        for pool in pools:
+            pool.close()
+
+
+# Singleton instance
+_registry_instance: Optional[OpenFileRegistry] = None
+_registry_lock = threading.Lock()
+_shutdown_registered = False
+
+
+def get_file_registry() -> OpenFileRegistry:
+    """Get process-wide registry singleton"""
+    global _registry_instance
+    if _registry_instance is None:
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = OpenFileRegistry()
+    return _registry_instance
+
+
+def shutdown_btrieve() -> None:
+    """Close all registered files and release the DLL engine"""
+    global _registry_instance
+    with _registry_lock:
+        registry, _registry_instance = _registry_instance, None
+    if registry is not None:
+        registry.close_all()
+    shutdown_engine()
+
+
+def _register_shutdown() -> None:
+    """Register shutdown_btrieve at exit once a file is actually opened"""
+    global _shutdown_registered
+    if not _shutdown_registered:
+        with _registry_lock:
+            if not _shutdown_registered:
+                atexit.register(shutdown_btrieve)
+                _shutdown_registered = True
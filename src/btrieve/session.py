@@ -0,0 +1,102 @@
+"""
+Btrieve sessions - client IDs for concurrent access
+
+Position blocks, locks and transactions belong to the client ID that made
+the call. SessionBackend binds a backend to one client ID (BTRCALLID), so
+every pooled handle and every worker thread gets its own Btrieve session.
+The DLL call itself runs without the GIL (ctypes releases it), so lookups
+on different handles overlap.
+"""
+import itertools
+import logging
+import threading
+from typing import Optional
+
+from .btrieve_client import BtrieveClient
+from .engine import BtrieveBackend, get_default_backend
+
+CLIENT_ID_SIZE = 16
+APPLICATION_ID = b'IE'  # invoice-editor
+
+logger = logging.getLogger(__name__)
+
+_client_numbers = itertools.count(1)
+_client_numbers_lock = threading.Lock()
+_warned_backends = set()
+
+
+def make_client_id(number: int, application: bytes = APPLICATION_ID) -> bytes:
+    """Client ID buffer: 12 reserved bytes, 2-byte application ID, 2-byte client number"""
+    return bytes(12) + application[:2].ljust(2, b'\x00') + (number & 0xFFFF).to_bytes(2, 'little')
+
+
+def next_client_id() -> bytes:
+    """New process-unique client ID"""
+    with _client_numbers_lock:
+        number = next(_client_numbers)
+    return make_client_id(number)
+
+
+class SessionBackend:
+    """
+    Backend wrapper issuing every call under one client ID
+
+    A backend without btrcallid cannot keep sessions apart: calls go through
+    plain btrcall under one shared client ID (logged once per backend type).
+    """
+
+    def __init__(self, backend: Optional[BtrieveBackend] = None, client_id: Optional[bytes] = None):
+        """
+        Args:
+            backend: Backend to wrap (None = default backend)
+            client_id: 16-byte client ID (None = next free ID)
+        """
+        self.backend = backend if backend is not None else get_default_backend()
+        self.dll = getattr(self.backend, 'dll', None)
+        self.client_id = client_id or next_client_id()
+        self._client_id_buffer = bytes(self.client_id)
+        self._btrcallid = getattr(self.backend, 'btrcallid', None)
+        if self._btrcallid is None:
+            _warn_shared_client_id(self.backend)
+
+    @property
+    def supports_client_id(self) -> bool:
+        """Calls are really issued under client_id (backend has BTRCALLID)"""
+        return self._btrcallid is not None
+
+    def btrcall(self, operation: int, pos_block, data_buffer, data_len,
+                key_buffer, key_len: int, key_num: int) -> int:
+        """BTRCALL entry point - BTRCALLID when the backend supports client IDs"""
+        if self._btrcallid is None:
+            return self.backend.btrcall(operation, pos_block, data_buffer, data_len,
+                                        key_buffer, key_len, key_num)
+        return self._btrcallid(operation, pos_block, data_buffer, data_len,
+                               key_buffer, key_len, key_num, self._client_id_buffer)
+
+
+def _warn_shared_client_id(backend: BtrieveBackend) -> None:
+    name = type(backend).__name__
+    if name not in _warned_backends:
+        _warned_backends.add(name)
+        logger.warning("%s has no BTRCALLID - Btrieve sessions share one client ID "
+                       "(per-thread locks and transactions are not isolated)", name)
+
+
+def session_client(backend: Optional[BtrieveBackend] = None,
+                   config: Optional[dict] = None) -> BtrieveClient:
+    """Client with its own Btrieve session (client ID)"""
+    if isinstance(backend, SessionBackend):
+        backend = backend.backend
+    return BtrieveClient(config, backend=SessionBackend(backend))
+
+
+_thread_local = threading.local()
+
+
+def thread_client() -> BtrieveClient:
+    """Client of the calling thread (own client ID, e.g. for transactions in workers)"""
+    client = getattr(_thread_local, 'client', None)
+    if client is None:
+        client = session_client()
+        _thread_local.client = client
+    return client
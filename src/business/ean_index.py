@@ -0,0 +1,154 @@
+# src/business/ean_index.py
+"""
+EAN Index
+EAN -> PLU a PLU -> fyzicka pozicia GSCAT zaznamu v pamati
+
+Index sa postavi jednym prechodom GSCAT.BTR (primarny BarCode) a BARCODE.BTR
+(druhotne EAN) cez Step Next Extended - engine vracia len GsCode a BarCode
+kazdeho zaznamu spolu s fyzickou poziciou. Vyhladanie EAN je potom slovnikove
+a produkt sa nacita jednym Get Direct (NexLookupService.get_product_by_position).
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from btrieve.btrieve_client import BtrieveClient
+from btrieve.extended import ExtractField
+from btrieve.file_stat import FileFingerprint
+from btrieve.registry import OpenFileRegistry
+from models.gscat import GSCATRecord
+from models.text import decode_field
+
+SOURCE_GSCAT = 'GSCAT'
+SOURCE_BARCODE = 'BARCODE'
+
+# Projekcia extended operacii: GsCode + BarCode
+GSCAT_FIELDS = [ExtractField(0, 4), ExtractField(GSCATRecord.BAR_CODE_OFFSET, GSCATRecord.BAR_CODE_SIZE)]
+BARCODE_FIELDS = [ExtractField(0, 4), ExtractField(4, 15)]
+
+PathLike = Union[str, Path]
+
+
+def iter_gscat_eans(client: BtrieveClient, path: PathLike,
+                    encoding: str = 'cp852') -> Iterator[Tuple[int, int, str]]:
+    """(pozicia, PLU, primarny EAN) vsetkych GSCAT zaznamov"""
+    for batch in client.iter_extended(path, GSCAT_FIELDS, record_length=GSCATRecord.RECORD_SIZE):
+        for position, data in batch:
+            # BarCode je Pascal string - dlzka v prvom bajte
+            length = min(data[4], GSCATRecord.BAR_CODE_SIZE - 1)
+            yield position, int.from_bytes(data[0:4], 'little', signed=True), \
+                str(data[5:5 + length], encoding, 'ignore').strip()
+
+
+def iter_barcode_eans(client: BtrieveClient, path: PathLike,
+                      encoding: str = 'cp852') -> Iterator[Tuple[int, str]]:
+    """(PLU, druhotny EAN) vsetkych BARCODE zaznamov"""
+    for batch in client.iter_extended(path, BARCODE_FIELDS):
+        for _, data in batch:
+            yield int.from_bytes(data[0:4], 'little', signed=True), decode_field(data[4:19], encoding).strip()
+
+
+class EanIndex:
+    """EAN -> (PLU, pozicia, zdroj) postaveny jednym prechodom katalogu"""
+
+    def __init__(self, primary: Dict[str, int], secondary: Dict[str, int], positions: Dict[int, int],
+                 fingerprints: Tuple[FileFingerprint, ...] = ()):
+        """
+        Args:
+            primary: EAN -> PLU z GSCAT.BarCode
+            secondary: EAN -> PLU z BARCODE.BTR
+            positions: PLU -> fyzicka pozicia GSCAT zaznamu
+            fingerprints: Fingerprinty zdrojovych suborov v case stavby
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.positions = positions
+        self.fingerprints = fingerprints
+
+    @classmethod
+    def build(cls, client: BtrieveClient, gscat_path: PathLike,
+              barcode_path: Optional[PathLike] = None, encoding: str = 'cp852',
+              fingerprints: Optional[Tuple[FileFingerprint, ...]] = None) -> 'EanIndex':
+        """
+        Postavi index z GSCAT.BTR a BARCODE.BTR
+
+        Fingerprinty sa beru pred citanim - zmena pocas stavby sa prejavi
+        ako zastaraly index.
+
+        Args:
+            client: Btrieve klient
+            gscat_path: Cesta ku GSCAT.BTR
+            barcode_path: Cesta k BARCODE.BTR (None alebo neexistujuci = bez druhotnych EAN)
+            encoding: Kodovanie EAN retazcov
+            fingerprints: Fingerprinty zdrojovych suborov, ak ich volajuci uz ma
+                          (load_or_build) - None = Stat sa spravi tu
+
+        Raises:
+            RuntimeError: Chyba Btrieve pri citani
+        """
+        paths = [gscat_path]
+        if barcode_path is not None and Path(barcode_path).exists():
+            paths.append(barcode_path)
+        if fingerprints is None:
+            fingerprints = tuple(client.fingerprint(path) for path in paths)
+
+        primary: Dict[str, int] = {}
+        positions: Dict[int, int] = {}
+        for position, plu, ean in iter_gscat_eans(client, gscat_path, encoding):
+            positions.setdefault(plu, position)
+            if ean:
+                primary.setdefault(ean, plu)
+
+        secondary: Dict[str, int] = {}
+        if len(paths) > 1:
+            for plu, ean in iter_barcode_eans(client, paths[1], encoding):
+                if ean and ean not in primary:
+                    secondary.setdefault(ean, plu)
+
+        return cls(primary, secondary, positions, fingerprints)
+
+    def lookup(self, ean: str) -> Optional[Tuple[int, int, str]]:
+        """
+        Vyhlada EAN ako NexLookupService.lookup_by_ean (najprv GSCAT, potom BARCODE)
+
+        Returns:
+            (PLU, pozicia GSCAT zaznamu, zdroj) alebo None - aj ked druhotny
+            EAN odkazuje na PLU, ktore v GSCAT nie je
+        """
+        ean = ean.strip()
+        plu = self.primary.get(ean)
+        source = SOURCE_GSCAT
+        if plu is None:
+            plu = self.secondary.get(ean)
+            source = SOURCE_BARCODE
+            if plu is None:
+                return None
+        position = self.positions.get(plu)
+        if position is None:
+            return None
+        return plu, position, source
+
+    def __contains__(self, ean: str) -> bool:
+        return self.lookup(ean) is not None
+
+    def __len__(self) -> int:
+        """Pocet EAN v indexe"""
+        return len(self.primary) + len(self.secondary)
+
+    def is_stale(self, client: BtrieveClient, registry: Optional[OpenFileRegistry] = None) -> bool:
+        """
+        Zmenil sa niektory zdrojovy subor od stavby indexu
+
+        S registry sa Stat robi cez otvorene handle z registra (bez Open/Close
+        pri kazdej kontrole), inak client otvori a zavrie kazdy subor.
+        """
+        has_changed = registry.has_changed if registry is not None else client.has_changed
+        return any(has_changed(fingerprint) for fingerprint in self.fingerprints)
+
+    def sources(self) -> List[str]:
+        """Cesty zdrojovych suborov"""
+        return [fingerprint.path for fingerprint in self.fingerprints]
+
+    def __repr__(self) -> str:
+        return (f"EanIndex({len(self.primary)} GSCAT EAN, {len(self.secondary)} BARCODE EAN, "
+                f"{len(self.positions)} products)")
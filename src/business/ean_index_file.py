@@ -0,0 +1,287 @@
+# src/business/ean_index_file.py
+"""
+EAN Index File
+Perzistentny EAN index na disku, citany cez mmap
+
+Subor obsahuje zoradene pole EAN -> (PLU, pozicia GSCAT, zdroj) a zoradene
+pole PLU -> pozicia, vyhladava sa binarne priamo v namapovanych strankach.
+Kratko bezace procesy (import faktury) tak nemusia citat cely katalog
+a viac procesov zdiela ten isty page cache.
+
+Nazov suboru obsahuje hash fingerprintov GSCAT.BTR / BARCODE.BTR - po zmene
+katalogu sa postavi novy subor, stary sa zmaze (ak ho nedrzi iny proces).
+
+Format (little endian):
+    hlavicka:  magic (8), verzia (2), dlzka kluca (2), dlzka metadat (4),
+               pocet EAN (4), pocet PLU (4)
+    metadata:  JSON (fingerprinty, kodovanie), zarovnane na 8 bajtov
+    EAN:       kluc (16, NUL doplneny), PLU (4), pozicia (4), zdroj (1), vypln (3)
+    PLU:       PLU (4), pozicia (4)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from btrieve.btrieve_client import BtrieveClient
+from btrieve.file_stat import FileFingerprint
+from btrieve.registry import OpenFileRegistry
+from business.ean_index import EanIndex, SOURCE_BARCODE, SOURCE_GSCAT
+
+MAGIC = b'NEXEANIX'
+FORMAT_VERSION = 1
+KEY_SIZE = 16
+
+_HEADER = struct.Struct('<8sHHIII')
+_EAN_ENTRY = struct.Struct(f'<{KEY_SIZE}siIB3x')
+_PLU_ENTRY = struct.Struct('<iI')
+_SOURCES = (SOURCE_GSCAT, SOURCE_BARCODE)
+
+PathLike = Union[str, Path]
+
+
+def default_cache_dir() -> Path:
+    """
+    Lokalny cache adresar aplikacie
+
+    INVOICE_EDITOR_CACHE_DIR, inak %LOCALAPPDATA%\\invoice-editor\\cache
+    (Windows) alebo ~/.cache/invoice-editor.
+    """
+    override = os.environ.get('INVOICE_EDITOR_CACHE_DIR')
+    if override:
+        return Path(override)
+    if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+        return Path(os.environ['LOCALAPPDATA']) / 'invoice-editor' / 'cache'
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'invoice-editor'
+
+
+def _digest(text: str, length: int) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:length]
+
+
+def _catalog_prefix(gscat_path: PathLike) -> str:
+    """Spolocny zaciatok nazvu indexu jedneho katalogu"""
+    return f"ean-{_digest(os.path.normcase(os.path.abspath(gscat_path)), 12)}-"
+
+
+def index_file_path(cache_dir: PathLike, fingerprints: Tuple[FileFingerprint, ...]) -> Path:
+    """Cesta indexu pre katalog v stave danom fingerprintmi (prvy = GSCAT.BTR)"""
+    state = json.dumps([fingerprint.to_dict() for fingerprint in fingerprints], sort_keys=True)
+    return Path(cache_dir) / f"{_catalog_prefix(fingerprints[0].path)}{_digest(state, 16)}.idx"
+
+
+def _encode_key(ean: str, encoding: str) -> Optional[bytes]:
+    key = ean.strip().encode(encoding, 'ignore')
+    return key.ljust(KEY_SIZE, b'\x00') if len(key) <= KEY_SIZE else None
+
+
+def write_index_file(index: EanIndex, path: PathLike, encoding: str = 'cp852') -> Path:
+    """
+    Zapise EanIndex do suboru (cez docasny subor a os.replace)
+
+    Returns:
+        Cesta zapisaneho suboru
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    entries: Dict[bytes, Tuple[int, int, int]] = {}
+    for source, mapping in ((0, index.primary), (1, index.secondary)):
+        for ean, plu in mapping.items():
+            key = _encode_key(ean, encoding)
+            position = index.positions.get(plu)
+            if key is not None and position is not None:
+                entries.setdefault(key, (plu, position, source))
+
+    meta = json.dumps({
+        'fingerprints': [fingerprint.to_dict() for fingerprint in index.fingerprints],
+        'encoding': encoding,
+    }).encode('utf-8')
+    meta += b' ' * (-(_HEADER.size + len(meta)) % 8)
+
+    data = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, KEY_SIZE, len(meta), len(entries), len(index.positions)))
+    data += meta
+    for key in sorted(entries):
+        data += _EAN_ENTRY.pack(key, *entries[key])
+    for plu in sorted(index.positions):
+        data += _PLU_ENTRY.pack(plu, index.positions[plu])
+
+    handle, temp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+class EanIndexFile:
+    """EAN index namapovany zo suboru - rovnake rozhranie ako EanIndex"""
+
+    def __init__(self, path: PathLike):
+        """
+        Args:
+            path: Subor zapisany write_index_file
+
+        Raises:
+            OSError: Subor sa neda otvorit
+            ValueError: Neplatny alebo nepodporovany format
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self._map.close()
+            raise
+
+    def _parse(self) -> None:
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"Invalid EAN index file: {self.path}")
+        magic, version, key_size, meta_length, ean_count, plu_count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or key_size != KEY_SIZE:
+            raise ValueError(f"Unsupported EAN index file: {self.path} (version {version})")
+
+        self._ean_offset = _HEADER.size + meta_length
+        self._plu_offset = self._ean_offset + ean_count * _EAN_ENTRY.size
+        if len(self._map) != self._plu_offset + plu_count * _PLU_ENTRY.size:
+            raise ValueError(f"Truncated EAN index file: {self.path}")
+
+        meta = json.loads(self._map[_HEADER.size:self._ean_offset])
+        self.fingerprints: Tuple[FileFingerprint, ...] = tuple(
+            FileFingerprint.from_dict(fingerprint) for fingerprint in meta['fingerprints'])
+        self.encoding: str = meta['encoding']
+        self.ean_count = ean_count
+        self.plu_count = plu_count
+
+    def lookup(self, ean: str) -> Optional[Tuple[int, int, str]]:
+        """
+        Vyhlada EAN (binarne vyhladavanie v mmap)
+
+        Returns:
+            (PLU, pozicia GSCAT zaznamu, zdroj) alebo None
+        """
+        key = _encode_key(ean, self.encoding)
+        if key is None or not key.strip(b'\x00'):
+            return None
+        data, base, size = self._map, self._ean_offset, _EAN_ENTRY.size
+        low, high = 0, self.ean_count
+        while low < high:
+            middle = (low + high) // 2
+            offset = base + middle * size
+            if data[offset:offset + KEY_SIZE] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.ean_count:
+            return None
+        found, plu, position, source = _EAN_ENTRY.unpack_from(data, base + low * size)
+        if found != key:
+            return None
+        return plu, position, _SOURCES[source]
+
+    def position(self, plu: int) -> Optional[int]:
+        """Fyzicka pozicia GSCAT zaznamu podla PLU"""
+        data, base, size = self._map, self._plu_offset, _PLU_ENTRY.size
+        low, high = 0, self.plu_count
+        while low < high:
+            middle = (low + high) // 2
+            found, position = _PLU_ENTRY.unpack_from(data, base + middle * size)
+            if found == plu:
+                return position
+            if found < plu:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __contains__(self, ean: str) -> bool:
+        return self.lookup(ean) is not None
+
+    def __len__(self) -> int:
+        """Pocet EAN v indexe"""
+        return self.ean_count
+
+    def is_stale(self, client: BtrieveClient, registry: Optional[OpenFileRegistry] = None) -> bool:
+        """
+        Zmenil sa niektory zdrojovy subor od stavby indexu
+
+        S registry sa Stat robi cez otvorene handle z registra (bez Open/Close
+        pri kazdej kontrole), inak client otvori a zavrie kazdy subor.
+        """
+        has_changed = registry.has_changed if registry is not None else client.has_changed
+        return any(has_changed(fingerprint) for fingerprint in self.fingerprints)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'EanIndexFile':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"EanIndexFile({self.path.name}, {self.ean_count} EAN, {self.plu_count} products)"
+
+
+def _remove_old_files(cache_dir: Path, gscat_path: PathLike, keep: Path) -> None:
+    """Zmaze stare indexy katalogu (subory namapovane inym procesom zostanu)"""
+    for old in cache_dir.glob(f"{_catalog_prefix(gscat_path)}*.idx"):
+        if old != keep:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def load_or_build(client: BtrieveClient, gscat_path: PathLike, barcode_path: Optional[PathLike] = None,
+                  cache_dir: Optional[PathLike] = None, rebuild: bool = False) -> EanIndexFile:
+    """
+    Otvori index aktualneho stavu katalogu, chybajuci alebo poskodeny postavi
+
+    Pri existujucom indexe stoji otvorenie len Stat zdrojovych suborov.
+
+    Args:
+        client: Btrieve klient
+        gscat_path: Cesta ku GSCAT.BTR
+        barcode_path: Cesta k BARCODE.BTR (None / neexistujuci = bez druhotnych EAN)
+        cache_dir: Adresar indexov (None = default_cache_dir())
+        rebuild: Postavit index znovu aj ked existuje
+
+    Raises:
+        RuntimeError: Chyba Btrieve pri citani katalogu
+        OSError: Index sa neda zapisat
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    paths: List[PathLike] = [gscat_path]
+    if barcode_path is not None and Path(barcode_path).exists():
+        paths.append(barcode_path)
+    fingerprints = tuple(client.fingerprint(path) for path in paths)
+
+    path = index_file_path(cache_dir, fingerprints)
+    if not rebuild and path.exists():
+        try:
+            index_file = EanIndexFile(path)
+            if index_file.fingerprints == fingerprints:
+                return index_file
+            index_file.close()
+        except (OSError, ValueError):
+            pass  # Poskodeny subor sa prepise
+
+    index = EanIndex.build(client, gscat_path, barcode_path, fingerprints=fingerprints)
+    path = write_index_file(index, path)
+    _remove_old_files(cache_dir, gscat_path, path)
+    return EanIndexFile(path)
@@ -7,6 +7,8 @@ import logging
 from typing import List, Dict, Optional
 from decimal import Decimal
 
+from models.money import calculate_item_price
+
 
 class InvoiceService:
     """Service for invoice operations"""
@@ -332,10 +334,7 @@ class InvoiceService:
         Returns:
             Tuple (price_after_rabat, total_price)
         """
-        price_after_rabat = unit_price * (Decimal('1') - rabat_percent / Decimal('100'))
-        price_after_rabat = price_after_rabat.quantize(Decimal('0.01'))
-
-        total_price = price_after_rabat * quantity
-        total_price = total_price.quantize(Decimal('0.01'))
+        # Integer cents, rounded half-even like quantize(Decimal('0.01'))
+        price_after_rabat, total_price = calculate_item_price(unit_price, rabat_percent, quantity)
 
-        return (price_after_rabat, total_price)
+        return (price_after_rabat.to_decimal(), total_price.to_decimal())
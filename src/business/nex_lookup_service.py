@@ -5,33 +5,111 @@ Vyhladavanie produktov v NEX Genesis GSCAT.BTR podla EAN
 """
 
 from pathlib import Path
-from typing import Optional, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, Dict, Iterable, Callable, Any, Union, List
+import logging
 import sys
+import threading
+import time
 
 # Add src to path for standalone usage
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from btrieve.btrieve_client import BtrieveClient
+from btrieve.keys import KeySpec, KEY_TYPE_INTEGER, KEY_TYPE_LSTRING, KEY_TYPE_STRING
+from btrieve.registry import OpenFileRegistry, get_file_registry
+from business.ean_index import EanIndex, SOURCE_BARCODE, SOURCE_GSCAT, iter_barcode_eans, iter_gscat_eans
+from business.ean_index_file import EanIndexFile, load_or_build
 from models.gscat import GSCATRecord
 from models.barcode import BarcodeRecord
+from models.category_tree import CategoryTree
+from models.mglst import MGLSTRecord
+from models.views import BarcodeView, GSCATView
+
+logger = logging.getLogger(__name__)
+
+# Btrieve kluce (offset, dlzka, typ) - predpokladane poradie indexov gscat.bdf.
+# Kluc BarCode sa pri vyhladavani overuje cez Stat (NexLookupService._barcode_key).
+GSCAT_KEYS = {
+    GSCATRecord.KEY_GSCODE: KeySpec(0, 4, KEY_TYPE_INTEGER),
+    GSCATRecord.KEY_NAME: KeySpec(4, 55, KEY_TYPE_STRING),
+    GSCATRecord.KEY_MGLST: KeySpec(194, 4, KEY_TYPE_INTEGER),
+    GSCATRecord.KEY_SUPPLIER: KeySpec(266, 4, KEY_TYPE_INTEGER),
+    GSCATRecord.KEY_BARCODE: KeySpec(GSCATRecord.BAR_CODE_OFFSET, GSCATRecord.BAR_CODE_SIZE, KEY_TYPE_LSTRING),
+}
+BARCODE_KEYS = {
+    BarcodeRecord.KEY_GSCODE: KeySpec(0, 4, KEY_TYPE_INTEGER),
+    BarcodeRecord.KEY_BARCODE: KeySpec(4, 15, KEY_TYPE_STRING),
+}
 
 
 class NexLookupService:
     """Service pre vyhladavanie produktov v NEX Genesis"""
 
-    def __init__(self, nex_path: str = r"C:\NEX\YEARACT"):
+    # Ako casto sa v indexovom mode overuje zmena GSCAT / BARCODE (sekundy)
+    INDEX_CHECK_INTERVAL = 5.0
+
+    # lookup_many bez indexu: jeden prechod katalogu, ak pocet EAN dosiahne
+    # tento podiel zaznamov GSCAT (inak Get Equal pre kazdy EAN)
+    SCAN_MIN_RATIO = 0.02
+
+    def __init__(self, nex_path: str = r"C:\NEX\YEARACT", client: Optional[BtrieveClient] = None,
+                 registry: Optional[OpenFileRegistry] = None, use_index: bool = False,
+                 index_dir: Optional[str] = None):
         """
         Args:
             nex_path: Cesta k NEX Genesis YEARACT adresaru
+            client: Btrieve klient (None = zdielany engine nad Pervasive DLL)
+            registry: Register otvorenych suborov (None = procesovy register,
+                      alebo vlastny register nad zadanym klientom)
+            use_index: Indexovy mod - EAN sa hladaju v EanIndex postavenom
+                       jednym prechodom katalogu (pri prvom vyhladani)
+            index_dir: Adresar perzistentneho indexu (mmap subor zdielany
+                       procesmi, ean_index_file.default_cache_dir()),
+                       None = index len v pamati
         """
         self.nex_path = Path(nex_path)
         self.gscat_path = self.nex_path / "STORES" / "GSCAT.BTR"
         self.barcode_path = self.nex_path / "STORES" / "BARCODE.BTR"
+        self.mglst_path = self.nex_path / "STORES" / "MGLST.BTR"
 
         # Validate paths
         if not self.gscat_path.exists():
             raise FileNotFoundError(f"GSCAT.BTR not found: {self.gscat_path}")
 
+        # Vlastny register nad zadanym klientom sa zatvara v close()
+        self._owns_registry = registry is None and client is not None
+        if registry is None:
+            registry = OpenFileRegistry(client) if client is not None else get_file_registry()
+        self.registry = registry
+
+        # Strom kategorii a fingerprint MGLST.BTR, z ktoreho bol nacitany
+        self._category_tree: Optional[CategoryTree] = None
+        self._category_fingerprint = None
+
+        # Index BarCode v GSCAT.BTR zisteny zo Stat (None = bez indexu, hlada sa prechodom)
+        self._gscat_barcode_key: Optional[Tuple[int, KeySpec]] = None
+        self._gscat_barcode_key_resolved = False
+
+        # Indexovy mod - index sa stavia raz, pri zmene katalogu znovu
+        self.use_index = use_index
+        self.index_dir = index_dir
+        self._index: Optional[Union[EanIndex, EanIndexFile]] = None
+        self._index_checked = 0.0
+        self._index_lock = threading.Lock()
+
+    @property
+    def client(self) -> BtrieveClient:
+        """Btrieve klient registra"""
+        return self.registry.client
+
+    def close(self) -> None:
+        """Zatvori subor indexu a subory vlastneho registra (procesovy register drzi subory otvorene)"""
+        with self._index_lock:
+            self._close_index()
+        if self._owns_registry:
+            self.registry.close_all()
+
     def lookup_by_ean(self, ean: str) -> Optional[Dict]:
         """
         Vyhlada produkt podla EAN
@@ -44,7 +122,7 @@ class NexLookupService:
             ean: EAN kod
 
         Returns:
-            Dict s produktovymi udajmi alebo None
+            Dict s produktovymi udajmi alebo None (aj pre prazdny EAN)
             {
                 'plu': int,
                 'name': str,
@@ -55,20 +133,23 @@ class NexLookupService:
                 'in_nex': bool,
                 'source': 'GSCAT' | 'BARCODE'
             }
+
+        Raises:
+            RuntimeError: Chyba Btrieve (zamknuty subor, chybajuci DLL, zly
+                          kluc) - nie je to "EAN nenajdeny"
         """
+        if not ean or not ean.strip():
+            return None
+        if self.use_index:
+            return self._lookup_in_index(ean)
+        return self._lookup_keyed(ean)
+
+    def _lookup_keyed(self, ean: str) -> Optional[Dict]:
+        """lookup_by_ean cez Btrieve kluce (GSCAT.BarCode, potom BARCODE.BTR)"""
         # 1. Hladaj v GSCAT.BarCode
         gscat_record = self._find_in_gscat(ean)
         if gscat_record:
-            return {
-                'plu': gscat_record.gs_code,
-                'name': gscat_record.gs_name,
-                'category': gscat_record.mglst_code,
-                'price_buy': float(gscat_record.price_buy),
-                'price_sell': float(gscat_record.price_sell),
-                'unit': gscat_record.unit,
-                'in_nex': True,
-                'source': 'GSCAT'
-            }
+            return self._product(gscat_record, 'GSCAT')
 
         # 2. Hladaj v BARCODE.BTR
         barcode_record = self._find_in_barcode(ean)
@@ -76,107 +157,415 @@ class NexLookupService:
             # Nacitaj produkt podla PLU
             gscat_record = self._find_in_gscat_by_plu(barcode_record.gs_code)
             if gscat_record:
-                return {
-                    'plu': gscat_record.gs_code,
-                    'name': gscat_record.gs_name,
-                    'category': gscat_record.mglst_code,
-                    'price_buy': float(gscat_record.price_buy),
-                    'price_sell': float(gscat_record.price_sell),
-                    'unit': gscat_record.unit,
-                    'in_nex': True,
-                    'source': 'BARCODE'
-                }
+                return self._product(gscat_record, 'BARCODE')
 
         return None
 
-    def _find_in_gscat(self, ean: str) -> Optional[GSCATRecord]:
-        """Najde produkt v GSCAT.BTR podla BarCode"""
-        client = BtrieveClient()
+    def lookup_many(self, eans: Iterable[str], workers: int = 1) -> Dict[str, Any]:
+        """
+        Vyhlada vsetky EAN faktury (alebo davky faktur) naraz
 
-        try:
-            status, pos_block = client.open_file(str(self.gscat_path))
-            if status != BtrieveClient.STATUS_SUCCESS:
-                return None
+        Rezim:
+        - 'index': use_index - slovnik / mmap index + Get Direct
+        - 'scan': bez indexu pri velkom pocte EAN - jeden prechod BARCODE.BTR
+          a GSCAT.BTR (Step Next Extended, len GsCode + BarCode) + Get Direct
+        - 'keyed': bez indexu pri malom pocte EAN - Get Equal ako lookup_by_ean
 
-            try:
-                status, data = client.get_first(pos_block, key_num=0)
+        Args:
+            eans: EAN kody (duplicity a prazdne hodnoty su povolene)
+            workers: Pocet vlakien pre nacitanie produktov (1 = bez vlakien)
 
-                while status == BtrieveClient.STATUS_SUCCESS:
-                    try:
-                        if len(data) >= 72:
-                            # Read BarCode: [00 00][length][data...]
-                            barcode_length = data[59] if len(data) > 59 else 0
-                            barcode_data = data[60:60+barcode_length] if len(data) >= 60+barcode_length else b''
-                            barcode_str = barcode_data.decode('cp852', errors='ignore')
+        Returns:
+            {
+                'results': {ean: dict ako lookup_by_ean alebo None},
+                'stats': {'total', 'unique', 'blank', 'found', 'missing',
+                          'gscat', 'barcode', 'mode', 'seconds'}
+            }
+            Kluce results su EAN bez okrajovych medzier.
 
-                            if barcode_str.strip() == ean.strip():
-                                return GSCATRecord.from_bytes(data)
-                    except:
-                        pass
+        Raises:
+            RuntimeError: Chyba Btrieve pri vyhladavani (zlyhany index alebo
+                          prechod sa zaloguje a nahradi Get Equal)
+        """
+        start = time.perf_counter()
+        eans = list(eans)
+        unique = list(dict.fromkeys(ean.strip() for ean in eans if ean and ean.strip()))
+
+        if self.use_index:
+            mode = 'index'
+            try:
+                index = self.get_index()
+                entries = {ean: index.lookup(ean) for ean in unique}
+            except RuntimeError as e:
+                logger.warning("EAN index unavailable, falling back to keyed lookups: %s", e)
+                mode, entries = 'keyed', None
+        elif unique and len(unique) >= self.SCAN_MIN_RATIO * self._gscat_record_count():
+            mode = 'scan'
+            try:
+                entries = self._scan_entries(unique)
+            except RuntimeError as e:
+                logger.warning("Catalog scan failed, falling back to keyed lookups: %s", e)
+                mode, entries = 'keyed', None
+        else:
+            mode, entries = 'keyed', None
+
+        if entries is None:
+            results = dict(zip(unique, self._map(self.lookup_by_ean, unique, workers)))
+        else:
+            results = dict(zip(unique, self._map(lambda ean: self._product_for_entry(ean, entries[ean]),
+                                                 unique, workers)))
+
+        found = [product for product in results.values() if product]
+        stats = {
+            'total': len(eans),
+            'unique': len(unique),
+            'blank': sum(1 for ean in eans if not ean or not ean.strip()),
+            'found': len(found),
+            'missing': len(unique) - len(found),
+            'gscat': sum(1 for product in found if product['source'] == SOURCE_GSCAT),
+            'barcode': sum(1 for product in found if product['source'] == SOURCE_BARCODE),
+            'mode': mode,
+            'seconds': time.perf_counter() - start,
+        }
+        return {'results': results, 'stats': stats}
+
+    @staticmethod
+    def _map(function: Callable[[str], Any], items: List[str], workers: int) -> List[Any]:
+        """function pre vsetky polozky, pri workers > 1 cez vlakna (handle z poolu registra)"""
+        if workers <= 1 or len(items) < 2:
+            return [function(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, items))
+
+    def _gscat_record_count(self) -> int:
+        """Pocet zaznamov GSCAT.BTR (Stat cez otvoreny handle z registra), 0 pri chybe"""
+        try:
+            with self.registry.checkout(str(self.gscat_path), GSCATRecord.RECORD_SIZE) as cursor:
+                return self.client.stat(cursor).num_records
+        except RuntimeError as e:
+            logger.warning("GSCAT Stat failed, using keyed lookups: %s", e)
+            return 0
 
-                    status, data = client.get_next(pos_block)
+    def _scan_entries(self, eans: List[str]) -> Dict[str, Optional[Tuple[int, int, str]]]:
+        """
+        EAN -> (PLU, pozicia GSCAT, zdroj) jednym prechodom BARCODE a GSCAT
 
-                return None
-            finally:
-                client.close_file(pos_block)
-        except:
+        BARCODE.BTR sa cita prvy, aby sa pri prechode GSCAT zapamatali
+        pozicie aj pre PLU druhotnych EAN. Primarny EAN z GSCAT ma prednost.
+        """
+        wanted = set(eans)
+        secondary: Dict[str, int] = {}
+        if self.barcode_path.exists():
+            for plu, ean in iter_barcode_eans(self.client, self.barcode_path):
+                if ean in wanted:
+                    secondary.setdefault(ean, plu)
+
+        needed = set(secondary.values())
+        primary: Dict[str, Tuple[int, int]] = {}
+        positions: Dict[int, int] = {}
+        for position, plu, ean in iter_gscat_eans(self.client, self.gscat_path):
+            if ean in wanted:
+                primary.setdefault(ean, (plu, position))
+            if plu in needed:
+                positions.setdefault(plu, position)
+
+        entries: Dict[str, Optional[Tuple[int, int, str]]] = {}
+        for ean in eans:
+            if ean in primary:
+                entries[ean] = primary[ean] + (SOURCE_GSCAT,)
+            elif secondary.get(ean) in positions:
+                plu = secondary[ean]
+                entries[ean] = (plu, positions[plu], SOURCE_BARCODE)
+            else:
+                entries[ean] = None
+        return entries
+
+    def _product_for_entry(self, ean: str, entry: Optional[Tuple[int, int, str]]) -> Optional[Dict]:
+        """Produkt pre (PLU, pozicia, zdroj) - pri zmenenej pozicii cez lookup_by_ean"""
+        if entry is None:
             return None
+        plu, position, source = entry
+        product = self.get_product_by_position(position, source)
+        if product is None or product['plu'] != plu:
+            return self.lookup_by_ean(ean)
+        return product
+
+    def get_index(self, rebuild: bool = False) -> Union[EanIndex, EanIndexFile]:
+        """
+        EAN index katalogu (postavi ho, ak neexistuje alebo sa katalog zmenil)
+
+        Zmena GSCAT.BTR / BARCODE.BTR sa overuje najviac raz za
+        INDEX_CHECK_INTERVAL sekund. S index_dir sa otvori subor indexu
+        aktualneho stavu katalogu a stavia sa len ked chyba.
 
-    def _find_in_gscat_by_plu(self, plu: int) -> Optional[GSCATRecord]:
-        """Najde produkt v GSCAT.BTR podla PLU"""
-        client = BtrieveClient()
+        Args:
+            rebuild: Postavit index znovu bez ohladu na zmenu
 
+        Raises:
+            RuntimeError: Chyba Btrieve pri citani katalogu
+        """
+        with self._index_lock:
+            now = time.monotonic()
+            if not rebuild and self._index is not None:
+                if now - self._index_checked < self.INDEX_CHECK_INTERVAL:
+                    return self._index
+                self._index_checked = now
+                if not self._index.is_stale(self.client, self.registry):
+                    return self._index
+
+            # Stary subor indexu sa zatvori pred nacitanim noveho - namapovany
+            # subor sa vo Windows neda zmazat ani prepisat
+            self._close_index()
+            self._index = self._load_index(rebuild)
+            self._index_checked = time.monotonic()
+            return self._index
+
+    def _close_index(self) -> None:
+        """Uvolni aktualny index (mmap pri EanIndexFile)"""
+        index, self._index = self._index, None
+        if isinstance(index, EanIndexFile):
+            index.close()
+
+    def _load_index(self, rebuild: bool) -> Union[EanIndex, EanIndexFile]:
+        """Perzistentny index z index_dir, inak (aj ked sa neda zapisat) v pamati"""
+        if self.index_dir is not None:
+            try:
+                return load_or_build(self.client, self.gscat_path, self.barcode_path,
+                                     self.index_dir, rebuild=rebuild)
+            except OSError as e:
+                logger.warning("EAN index file not usable in %s, keeping index in memory: %s", self.index_dir, e)
+        return EanIndex.build(self.client, self.gscat_path, self.barcode_path)
+
+    def _lookup_in_index(self, ean: str) -> Optional[Dict]:
+        """lookup_by_ean cez EanIndex - slovnik + jeden Get Direct, bez indexu cez kluce"""
         try:
-            status, pos_block = client.open_file(str(self.gscat_path))
-            if status != BtrieveClient.STATUS_SUCCESS:
+            entry = self.get_index().lookup(ean)
+        except RuntimeError as e:
+            logger.warning("EAN index unavailable, falling back to keyed lookup: %s", e)
+            return self._lookup_keyed(ean)
+        if entry is None:
+            return None
+        plu, position, source = entry
+        product = self.get_product_by_position(position, source)
+        if product is None or product['plu'] != plu:
+            # Pozicia z indexu uz neplati (katalog zmeneny od poslednej kontroly)
+            try:
+                entry = self.get_index(rebuild=True).lookup(ean)
+            except RuntimeError as e:
+                logger.warning("EAN index rebuild failed, falling back to keyed lookup: %s", e)
+                return self._lookup_keyed(ean)
+            if entry is None:
                 return None
+            plu, position, source = entry
+            product = self.get_product_by_position(position, source)
+        return product
 
-            try:
-                status, data = client.get_first(pos_block, key_num=0)
+    def get_product_by_position(self, position: int, source: str = 'GSCAT') -> Optional[Dict]:
+        """
+        Nacita produkt z GSCAT.BTR podla fyzickej pozicie (Get Direct)
 
-                while status == BtrieveClient.STATUS_SUCCESS:
-                    try:
-                        record = GSCATRecord.from_bytes(data)
-                        if record.gs_code == plu:
-                            return record
-                    except:
-                        pass
+        Pozicia pochadza z indexu (napr. iter_records(positions=True)),
+        opakovane nacitanie je jedna operacia bez prehladavania indexu.
 
-                    status, data = client.get_next(pos_block)
+        Returns:
+            Dict ako lookup_by_ean alebo None (neplatna pozicia)
 
+        Raises:
+            RuntimeError: Ina chyba Btrieve
+        """
+        gscat_record = self._read_gscat_at(position)
+        return self._product(gscat_record, source) if gscat_record is not None else None
+
+    def _read_gscat_at(self, position: int) -> Optional[GSCATView]:
+        """GSCAT zaznam na fyzickej pozicii (Get Direct), None = neplatna pozicia"""
+        with self.registry.checkout(str(self.gscat_path), GSCATRecord.RECORD_SIZE) as cursor:
+            status = cursor.get_direct(position, GSCATRecord.KEY_GSCODE)
+            if status in (BtrieveClient.STATUS_INVALID_RECORD_ADDRESS, BtrieveClient.STATUS_INVALID_POSITIONING):
                 return None
-            finally:
-                client.close_file(pos_block)
-        except:
-            return None
+            self._check_status(status, 'Get Direct', self.gscat_path)
+            return GSCATView.detached(cursor.record)
+
+    @staticmethod
+    def _product(gscat_record: GSCATView, source: str) -> Dict:
+        """Produktove udaje vo formate lookup_by_ean (dekoduje len potrebne polia)"""
+        return {
+            'plu': gscat_record.gs_code,
+            'name': gscat_record.gs_name,
+            'category': gscat_record.mglst_code,
+            'price_buy': float(gscat_record.price_buy),
+            'price_sell': float(gscat_record.price_sell),
+            'unit': gscat_record.unit,
+            'in_nex': True,
+            'source': source
+        }
+
+    def load_category_tree(self, reload: bool = False) -> CategoryTree:
+        """
+        Strom tovarovych skupin z MGLST.BTR (cesty, urovne, podskupiny)
+
+        Strom sa nacita raz a znovu len ak sa MGLST.BTR zmenil (fingerprint).
+
+        Args:
+            reload: Nacitat znovu bez ohladu na zmenu suboru
+
+        Raises:
+            FileNotFoundError: MGLST.BTR neexistuje
+            RuntimeError: Chyba Btrieve pri citani
+        """
+        if not self.mglst_path.exists():
+            raise FileNotFoundError(f"MGLST.BTR not found: {self.mglst_path}")
+
+        # Stat aj citanie cez handle z registra - kontrola zmeny bez Open/Close
+        with self.registry.checkout(str(self.mglst_path), MGLSTRecord.LAYOUT.record_size) as cursor:
+            if (reload or self._category_tree is None
+                    or self.client.has_changed(self._category_fingerprint, file=cursor)):
+                fingerprint = self.client.fingerprint(cursor)
+                records = self.client.iter_records(cursor, decoder=MGLSTRecord.from_bytes)
+                self._category_tree = CategoryTree(records)
+                self._category_fingerprint = fingerprint
+        return self._category_tree
+
+    def ean_exists(self, ean: str) -> bool:
+        """
+        Overi existenciu EAN bez citania zaznamov (Get Key Equal)
+
+        Hlada v indexe GSCAT.BarCode, potom v BARCODE.BTR. PLU sa takto
+        nezisti - kluc BarCode ho neobsahuje, na to sluzi lookup_by_ean().
+
+        Raises:
+            RuntimeError: Chyba Btrieve ine nez nenajdeny kluc (status 4)
+        """
+        ean = ean.strip()
+        if not ean:
+            return False
+        barcode_key = self._barcode_key()
+        if barcode_key is None:
+            if self._scan_gscat_for_ean(ean) is not None:
+                return True
+        else:
+            key_num, spec = barcode_key
+            if self._key_exists(self.gscat_path, key_num, spec.build(ean), GSCATRecord.RECORD_SIZE):
+                return True
 
-    def _find_in_barcode(self, ean: str) -> Optional[BarcodeRecord]:
-        """Najde zaznam v BARCODE.BTR"""
         if not self.barcode_path.exists():
+            return False
+        key = BARCODE_KEYS[BarcodeRecord.KEY_BARCODE].build(ean)
+        return self._key_exists(self.barcode_path, BarcodeRecord.KEY_BARCODE, key)
+
+    def validate_eans(self, eans: Iterable[str]) -> Dict[str, bool]:
+        """
+        Predbezna kontrola EAN kodov faktury (len key-only operacie)
+
+        EAN sa orezavaju a prazdne sa vynechaju ako v lookup_many.
+
+        Returns:
+            Dict {orezany ean: existuje v NEX}
+
+        Raises:
+            RuntimeError: Chyba Btrieve - kontrolu nie je mozne vyhodnotit
+        """
+        result = {}
+        for ean in eans:
+            ean = ean.strip() if ean else ''
+            if ean and ean not in result:
+                result[ean] = self.ean_exists(ean)
+        return result
+
+    def _find_in_gscat(self, ean: str) -> Optional[GSCATView]:
+        """Najde produkt v GSCAT.BTR podla BarCode (index BarCode, bez neho prechodom)"""
+        barcode_key = self._barcode_key()
+        if barcode_key is None:
+            position = self._scan_gscat_for_ean(ean.strip())
+            return self._read_gscat_at(position) if position is not None else None
+
+        key_num, spec = barcode_key
+        return self._find_by_key(self.gscat_path, key_num, spec.build(ean.strip()),
+                                 GSCATView.detached, GSCATRecord.RECORD_SIZE)
+
+    def _barcode_key(self) -> Optional[Tuple[int, KeySpec]]:
+        """
+        Index BarCode v GSCAT.BTR - (cislo kluca, KeySpec) podla Stat
+
+        Cislo indexu v gscat.bdf nie je overene, kluc sa preto hlada podla
+        segmentu zacinajuceho na BarCode (dlzkovy bajt alebo data) a typ
+        a dlzka sa beru zo suboru. Vysledok sa pamata.
+
+        Returns:
+            (cislo kluca, KeySpec) alebo None - subor nema jednosegmentovy
+            index na BarCode, EAN sa hladaju prechodom suboru
+
+        Raises:
+            RuntimeError: Stat zlyhal
+        """
+        if not self._gscat_barcode_key_resolved:
+            with self.registry.checkout(str(self.gscat_path), GSCATRecord.RECORD_SIZE) as cursor:
+                stat = self.client.stat(cursor)
+            for offset in (GSCATRecord.BAR_CODE_OFFSET, GSCATRecord.BAR_CODE_OFFSET + 1):
+                segment = stat.find_key(offset)
+                if segment is not None:
+                    self._gscat_barcode_key = (segment.key_num,
+                                               KeySpec(offset, segment.length, segment.key_type))
+                    break
+            self._gscat_barcode_key_resolved = True
+        return self._gscat_barcode_key
+
+    def _scan_gscat_for_ean(self, ean: str) -> Optional[int]:
+        """Pozicia prveho GSCAT zaznamu s primarnym EAN (Step Next Extended, len GsCode + BarCode)"""
+        if not ean:
             return None
+        for position, _, bar_code in iter_gscat_eans(self.client, self.gscat_path):
+            if bar_code == ean:
+                return position
+        return None
 
-        client = BtrieveClient()
+    def _find_in_gscat_by_plu(self, plu: int) -> Optional[GSCATView]:
+        """Najde produkt v GSCAT.BTR podla PLU (index GsCode)"""
+        key = GSCAT_KEYS[GSCATRecord.KEY_GSCODE].build(plu)
+        return self._find_by_key(self.gscat_path, GSCATRecord.KEY_GSCODE, key,
+                                 GSCATView.detached, GSCATRecord.RECORD_SIZE)
 
-        try:
-            status, pos_block = client.open_file(str(self.barcode_path))
-            if status != BtrieveClient.STATUS_SUCCESS:
-                return None
+    def _find_in_barcode(self, ean: str) -> Optional[BarcodeView]:
+        """Najde zaznam v BARCODE.BTR (index BarCode)"""
+        if not self.barcode_path.exists():
+            return None
 
-            try:
-                status, data = client.get_first(pos_block, key_num=0)
+        key = BARCODE_KEYS[BarcodeRecord.KEY_BARCODE].build(ean.strip())
+        return self._find_by_key(self.barcode_path, BarcodeRecord.KEY_BARCODE, key, BarcodeView.detached)
+
+    def _find_by_key(self, path: Path, key_num: int, key: bytes,
+                     decoder: Callable[[memoryview], Any],
+                     record_length: Optional[int] = None) -> Optional[Any]:
+        """
+        Najde zaznam jednou operaciou Get Equal nad indexom key_num
 
-                while status == BtrieveClient.STATUS_SUCCESS:
-                    try:
-                        record = BarcodeRecord.from_bytes(data)
-                        if record.bar_code.strip() == ean.strip():
-                            return record
-                    except:
-                        pass
+        Pouziva handle z poolu registra, takze vyhladavania mozu bezat
+        paralelne z viacerych vlakien.
 
-                    status, data = client.get_next(pos_block)
+        Returns:
+            Dekodovany zaznam alebo None (status 4 - kluc nenajdeny)
 
+        Raises:
+            RuntimeError: Subor sa neda otvorit alebo ina chyba Btrieve
+        """
+        with self.registry.checkout(str(path), record_length) as cursor:
+            status = cursor.get_equal(key, key_num=key_num)
+            if status == BtrieveClient.STATUS_KEY_NOT_FOUND:
                 return None
-            finally:
-                client.close_file(pos_block)
-        except:
-            return None
+            self._check_status(status, 'Get Equal', path)
+            return decoder(cursor.record)
+
+    def _key_exists(self, path: Path, key_num: int, key: bytes,
+                    record_length: Optional[int] = None) -> bool:
+        """
+        Existencia kluca v indexe key_num (Get Key Equal, bez datovych stranok)
+
+        Raises:
+            RuntimeError: Subor sa neda otvorit alebo ina chyba Btrieve nez status 4
+        """
+        with self.registry.checkout(str(path), record_length) as cursor:
+            return cursor.key_exists(key, key_num)
+
+    def _check_status(self, status: int, operation: str, path: Path) -> None:
+        """RuntimeError pre neuspesny status (rovnako ako BtrieveClient)"""
+        if status != BtrieveClient.STATUS_SUCCESS:
+            raise RuntimeError(f"{operation} failed for {path.name}: {self.client.get_status_message(status)}")
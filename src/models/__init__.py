@@ -8,12 +8,38 @@ from .barcode import BarcodeRecord
 from .gscat import GSCATRecord
 from .pab import PABRecord
 from .mglst import MGLSTRecord
+from .category_tree import CategoryTree
+from .layout import Field, RecordLayout
+from .money import Money
+from .bulk import barcode_array, decode_dates, decode_text, decode_times, gscat_array, to_columns
+from .compact import CompactBarcode, CompactGSCAT, CompactMGLST, CompactPAB, CompactRecord
+from .views import BarcodeView, GSCATView, MGLSTView, PABView, RecordView
 
 __all__ = [
     'BarcodeRecord',
     'GSCATRecord',
     'PABRecord',
     'MGLSTRecord',
+    'CategoryTree',
+    'Field',
+    'RecordLayout',
+    'Money',
+    'RecordView',
+    'GSCATView',
+    'BarcodeView',
+    'MGLSTView',
+    'PABView',
+    'CompactRecord',
+    'CompactGSCAT',
+    'CompactBarcode',
+    'CompactMGLST',
+    'CompactPAB',
+    'gscat_array',
+    'barcode_array',
+    'to_columns',
+    'decode_text',
+    'decode_dates',
+    'decode_times',
 ]
 
 __version__ = '1.0.0'
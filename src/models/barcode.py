@@ -11,7 +11,18 @@ Record Size: ~50 bytes
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
-import struct
+
+from .layout import Field, RecordLayout, INTEGER, STRING, DATE, TIME
+from . import delphi
+
+# Layout záznamu (approximate) - to_bytes zapisuje 50 bajtov, čítanie vyžaduje 35
+BARCODE_LAYOUT = RecordLayout('BARCODE', 50, [
+    Field('gs_code', 0, INTEGER),
+    Field('bar_code', 4, STRING, 15),
+    Field('mod_user', 19, STRING, 8),
+    Field('mod_date', 27, DATE),  # days since 1899-12-30
+    Field('mod_time', 31, TIME),  # milliseconds since midnight
+], min_size=35)
 
 
 @dataclass
@@ -37,52 +48,28 @@ class BarcodeRecord:
     INDEX_BARCODE = 'BarCode'  # Index podľa čiarového kódu
     INDEX_GSBC = 'GsBc'  # Composite index (unique)
 
+    # Btrieve key numbers (poradie indexov v barcode.bdf)
+    KEY_GSCODE = 0
+    KEY_BARCODE = 1
+    KEY_GSBC = 2
+
+    LAYOUT = BARCODE_LAYOUT
+
     @classmethod
     def from_bytes(cls, data: bytes, encoding: str = 'cp852') -> 'BarcodeRecord':
         """
         Deserialize Btrieve record from bytes
 
-        Field Layout (approximate):
-        - GsCode: 4 bytes (0-3) - longint
-        - BarCode: 15 bytes (4-18) - string
-        - ModUser: 8 bytes (19-26) - string
-        - ModDate: 4 bytes (27-30) - longint (days since 1899-12-30)
-        - ModTime: 4 bytes (31-34) - longint (milliseconds since midnight)
+        Field Layout: viď BARCODE_LAYOUT
 
         Args:
-            data: Raw bytes from Btrieve
+            data: Raw bytes from Btrieve (bytes or memoryview)
             encoding: String encoding (cp852 for Czech/Slovak)
 
         Returns:
             BarcodeRecord instance
         """
-        if len(data) < 35:
-            raise ValueError(f"Invalid record size: {len(data)} bytes (expected >= 35)")
-
-        # GsCode (longint, 4 bytes)
-        gs_code = struct.unpack('<i', data[0:4])[0]
-
-        # BarCode (string, 15 bytes)
-        bar_code = data[4:19].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # ModUser (string, 8 bytes)
-        mod_user = data[19:27].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # ModDate (longint, 4 bytes) - days since 1899-12-30
-        mod_date_int = struct.unpack('<i', data[27:31])[0]
-        mod_date = cls._decode_delphi_date(mod_date_int) if mod_date_int > 0 else None
-
-        # ModTime (longint, 4 bytes) - milliseconds since midnight
-        mod_time_int = struct.unpack('<i', data[31:35])[0]
-        mod_time = cls._decode_delphi_time(mod_time_int) if mod_time_int >= 0 else None
-
-        return cls(
-            gs_code=gs_code,
-            bar_code=bar_code,
-            mod_user=mod_user,
-            mod_date=mod_date,
-            mod_time=mod_time
-        )
+        return cls(**BARCODE_LAYOUT.decode(data, encoding))
 
     def to_bytes(self, encoding: str = 'cp852') -> bytes:
         """
@@ -92,32 +79,9 @@ class BarcodeRecord:
             encoding: String encoding (cp852 for Czech/Slovak)
 
         Returns:
-            Raw bytes for Btrieve
+            Raw bytes for Btrieve (50 bytes)
         """
-        result = bytearray(50)  # Fixed size record
-
-        # GsCode
-        struct.pack_into('<i', result, 0, self.gs_code)
-
-        # BarCode (pad to 15 bytes)
-        bar_code_bytes = self.bar_code.encode(encoding)[:15]
-        result[4:4 + len(bar_code_bytes)] = bar_code_bytes
-
-        # ModUser (pad to 8 bytes)
-        mod_user_bytes = self.mod_user.encode(encoding)[:8]
-        result[19:19 + len(mod_user_bytes)] = mod_user_bytes
-
-        # ModDate
-        if self.mod_date:
-            mod_date_int = self._encode_delphi_date(self.mod_date)
-            struct.pack_into('<i', result, 27, mod_date_int)
-
-        # ModTime
-        if self.mod_time:
-            mod_time_int = self._encode_delphi_time(self.mod_time)
-            struct.pack_into('<i', result, 31, mod_time_int)
-
-        return bytes(result)
+        return BARCODE_LAYOUT.encode(self, encoding)
 
     @staticmethod
     def _decode_delphi_date(days: int) -> datetime:
@@ -126,16 +90,12 @@ class BarcodeRecord:
 
         Delphi date: days since 1899-12-30
         """
-        from datetime import timedelta
-        base_date = datetime(1899, 12, 30)
-        return base_date + timedelta(days=days)
+        return delphi.decode_date(days)
 
     @staticmethod
     def _encode_delphi_date(dt: datetime) -> int:
         """Convert Python datetime to Delphi date (days since 1899-12-30)"""
-        base_date = datetime(1899, 12, 30)
-        delta = dt - base_date
-        return delta.days
+        return delphi.encode_date(dt)
 
     @staticmethod
     def _decode_delphi_time(milliseconds: int) -> datetime:
@@ -144,16 +104,12 @@ class BarcodeRecord:
 
         Delphi time: milliseconds since midnight
         """
-        from datetime import timedelta
-        base_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        return base_time + timedelta(milliseconds=milliseconds)
+        return delphi.decode_time(milliseconds)
 
     @staticmethod
     def _encode_delphi_time(dt: datetime) -> int:
         """Convert Python datetime to Delphi time (milliseconds since midnight)"""
-        midnight = dt.replace(hour=0, minute=0, second=0, microsecond=0)
-        delta = dt - midnight
-        return int(delta.total_seconds() * 1000)
+        return delphi.encode_time(dt)
 
     def validate(self) -> list[str]:
         """
@@ -0,0 +1,179 @@
+"""
+Bulk Record Decoding
+Hromadné dekódovanie Btrieve záznamov do NumPy štruktúrovaných polí
+
+Súvislý buffer N záznamov pevnej dĺžky sa namapuje cez np.frombuffer
+bez kopírovania - čísla a ceny sú priamo numerické stĺpce, reťazce
+zostávajú surové bajty (dtype 'S') a cp852 sa dekóduje až na požiadanie
+(decode_text). Dátumy ostávajú ako Delphi dni / milisekundy (int32),
+decode_dates / decode_times ich prevedú naraz na datetime64 / timedelta64.
+
+Príklad - produkty skupiny 12 s nákupnou cenou nad 10:
+    products = gscat_array(client.iter_records(gscat_path, record_length=705))
+    selected = products[(products['mglst_code'] == 12) & (products['price_buy'] > 10)]
+    names = decode_text(selected['gs_name'])
+
+NumPy je voliteľná závislosť (pip install numpy).
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+from .barcode import BARCODE_LAYOUT
+from .gscat import GSCAT_LAYOUT
+from . import delphi
+from .text import decode_field
+
+# (názov, numpy formát, offset) - generované z layoutov tabuliek
+GSCAT_FIELDS: List[Tuple[str, str, int]] = GSCAT_LAYOUT.numpy_fields()
+GSCAT_RECORD_SIZE = GSCAT_LAYOUT.record_size
+
+# BARCODE záznam má 35+ bajtov
+BARCODE_FIELDS: List[Tuple[str, str, int]] = BARCODE_LAYOUT.numpy_fields()
+BARCODE_MIN_SIZE = BARCODE_LAYOUT.min_size
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise ImportError(
+            "numpy not installed. "
+            "Install with: pip install numpy"
+        )
+
+
+def make_dtype(fields: List[Tuple[str, str, int]], record_size: int):
+    """Štruktúrovaný dtype so zadanými offsetmi a dĺžkou záznamu"""
+    _require_numpy()
+    return np.dtype({
+        'names': [name for name, _, _ in fields],
+        'formats': [fmt for _, fmt, _ in fields],
+        'offsets': [offset for _, _, offset in fields],
+        'itemsize': record_size,
+    })
+
+
+def gscat_dtype():
+    """dtype GSCAT záznamu (705 bajtov)"""
+    return GSCAT_LAYOUT.dtype()
+
+
+def barcode_dtype(record_size: int = BARCODE_MIN_SIZE):
+    """dtype BARCODE záznamu (dĺžka podľa súboru, minimálne 35 bajtov)"""
+    if record_size < BARCODE_MIN_SIZE:
+        raise ValueError(f"Invalid record size: {record_size} bytes (expected >= {BARCODE_MIN_SIZE})")
+    return make_dtype(BARCODE_FIELDS, record_size)
+
+
+def decode_buffer(buffer, dtype):
+    """
+    Namapuje súvislý buffer záznamov na štruktúrované pole (bez kópie)
+
+    Args:
+        buffer: bytes / bytearray / memoryview s N záznamami za sebou
+        dtype: Štruktúrovaný dtype (gscat_dtype(), barcode_dtype())
+
+    Returns:
+        numpy.ndarray s N prvkami (read-only pre bytes)
+    """
+    _require_numpy()
+    if len(buffer) % dtype.itemsize:
+        raise ValueError(f"Buffer size {len(buffer)} is not a multiple of record size {dtype.itemsize}")
+    return np.frombuffer(buffer, dtype=dtype)
+
+
+def pack_records(records: Iterable, record_size: int) -> bytearray:
+    """
+    Spojí záznamy do súvislého buffra
+
+    Každý záznam sa hneď skopíruje, takže vstupom môžu byť aj memoryview
+    nad znovupoužívaným buffrom (iter_records(copy=False)).
+    """
+    buffer = bytearray()
+    for record in records:
+        if len(record) < record_size:
+            raise ValueError(f"Invalid record size: {len(record)} bytes (expected >= {record_size})")
+        buffer += record[:record_size]
+    return buffer
+
+
+def gscat_array(records):
+    """
+    GSCAT záznamy ako štruktúrované pole
+
+    Args:
+        records: Súvislý buffer alebo iterovateľné záznamy (bytes / memoryview)
+    """
+    dtype = gscat_dtype()
+    if not isinstance(records, (bytes, bytearray, memoryview)):
+        records = pack_records(records, dtype.itemsize)
+    return decode_buffer(records, dtype)
+
+
+def barcode_array(records, record_size: int = BARCODE_MIN_SIZE):
+    """
+    BARCODE záznamy ako štruktúrované pole
+
+    Args:
+        records: Súvislý buffer alebo iterovateľné záznamy (bytes / memoryview)
+        record_size: Dĺžka záznamu v buffri (iterované záznamy sa orežú)
+    """
+    dtype = barcode_dtype(record_size)
+    if not isinstance(records, (bytes, bytearray, memoryview)):
+        records = pack_records(records, dtype.itemsize)
+    return decode_buffer(records, dtype)
+
+
+def to_columns(array) -> Dict[str, 'np.ndarray']:
+    """Stĺpce štruktúrovaného poľa ako dict {pole: view}"""
+    return {name: array[name] for name in array.dtype.names}
+
+
+def decode_text(column, encoding: str = 'cp852') -> List[str]:
+    """
+    Dekóduje bajtový stĺpec (dtype 'S') na reťazce
+
+    Zhodné s from_bytes - NUL a riadiace znaky sa odstránia, koncové
+    medzery orežú.
+    """
+    return [decode_field(value, encoding) for value in column.tolist()]
+
+
+def decode_dates(column):
+    """
+    Delphi dni (int stĺpec) na datetime64[D], nevyplnené (<= 0) sú NaT
+
+    Príklad: decode_dates(products['mod_date']) >= np.datetime64('2025-01-01')
+    """
+    _require_numpy()
+    days = np.asarray(column)
+    result = np.datetime64(delphi.DELPHI_EPOCH, 'D') + days.astype('timedelta64[D]')
+    result[days <= 0] = np.datetime64('NaT')
+    return result
+
+
+def decode_times(column):
+    """Delphi čas (milisekundy od polnoci) na timedelta64[ms], záporné sú NaT"""
+    _require_numpy()
+    milliseconds = np.asarray(column)
+    result = milliseconds.astype('timedelta64[ms]')
+    result[milliseconds < 0] = np.timedelta64('NaT')
+    return result
+
+
+def to_datetimes(column) -> List:
+    """
+    Delphi dni (int stĺpec) na zoznam datetime / None ako from_bytes
+
+    Každý rôzny deň sa prevedie len raz (np.unique), rovnaké dni
+    zdieľajú jeden datetime objekt.
+    """
+    _require_numpy()
+    unique, inverse = np.unique(np.asarray(column), return_inverse=True)
+    values = [delphi.decode_date(days) if days > 0 else None for days in unique.tolist()]
+    return [values[index] for index in inverse.tolist()]
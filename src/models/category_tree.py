@@ -0,0 +1,189 @@
+"""
+Category Tree
+Hierarchia tovarových skupín MGLST postavená raz zo všetkých záznamov
+
+Mapy rodič / deti, úroveň a plná cesta ("Elektronika > Počítače > Notebooky")
+sa vypočítajú pri vytvorení stromu, dotazy sú potom slovníkové. Zdroj pre
+dropdown kategórií (choices) aj pre categories_cache (cache_rows).
+
+Príklad:
+    tree = CategoryTree(client.iter_records(mglst_path, decoder=MGLSTRecord.from_bytes))
+    tree.full_path(12)          # 'Potraviny > Mliečne výrobky'
+    tree.descendants(1)         # {12, 13, 120, ...}
+    tree.search('mlie')         # skupiny, ktorých názov začína 'mlie'
+"""
+
+import logging
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .mglst import MGLSTRecord
+
+logger = logging.getLogger(__name__)
+
+ROOT_CODE = 0
+
+
+class CategoryTree:
+    """Strom tovarových skupín s predpočítanými cestami"""
+
+    def __init__(self, categories: Iterable[MGLSTRecord], separator: str = " > "):
+        """
+        Args:
+            categories: Všetky záznamy MGLST (MGLSTRecord alebo MGLSTView)
+            separator: Oddeľovač v plnej ceste
+        """
+        self.separator = separator
+        self._categories: Dict[int, MGLSTRecord] = {}
+        skipped = 0
+        for category in categories:
+            if category.mglst_code == ROOT_CODE:
+                # Kód 0 je koreň stromu, nie skupina (prázdny / poškodený záznam)
+                skipped += 1
+                continue
+            # Duplicitný kód - platí prvý záznam (ako pôvodné hľadanie cez next())
+            self._categories.setdefault(category.mglst_code, category)
+        if skipped:
+            logger.warning(f"Skipped {skipped} MGLST record(s) with code {ROOT_CODE}")
+
+        self._paths: Dict[int, Tuple[int, ...]] = {}
+        for code in self._categories:
+            self._resolve_path(code)
+
+        # Rodič podľa vypočítanej cesty (skupina z prerušeného cyklu je koreň)
+        self._parents: Dict[int, int] = {
+            code: path[-2] if len(path) > 1 else ROOT_CODE for code, path in self._paths.items()
+        }
+        self._children: Dict[int, List[int]] = {}
+        for code, parent in self._parents.items():
+            self._children.setdefault(parent, []).append(code)
+        self._full_paths: Dict[int, str] = {
+            code: separator.join(self._categories[c].mglst_name for c in path)
+            for code, path in self._paths.items()
+        }
+
+        # Prefix vyhľadávanie - zoradené (názov casefold, kód)
+        self._names: List[Tuple[str, int]] = sorted(
+            (category.mglst_name.casefold(), code) for code, category in self._categories.items()
+        )
+
+    def _parent_code(self, category: MGLSTRecord) -> int:
+        """Kód rodiča, neexistujúci rodič alebo odkaz na seba = koreň"""
+        parent = category.parent_code
+        if parent == category.mglst_code or parent not in self._categories:
+            return ROOT_CODE
+        return parent
+
+    def _resolve_path(self, code: int) -> Tuple[int, ...]:
+        """Cesta od koreňa (kódy), cykly v dátach sa prerušia"""
+        chain = []
+        seen = set()
+        current = code
+        while current not in self._paths and current != ROOT_CODE and current not in seen:
+            seen.add(current)
+            chain.append(current)
+            current = self._parent_code(self._categories[current])
+
+        path = self._paths.get(current, ())
+        for current in reversed(chain):
+            path = path + (current,)
+            self._paths[current] = path
+        return self._paths[code]
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def __contains__(self, code: int) -> bool:
+        return code in self._categories
+
+    def __iter__(self) -> Iterator[MGLSTRecord]:
+        return iter(self._categories.values())
+
+    def get(self, code: int) -> Optional[MGLSTRecord]:
+        """Skupina podľa kódu alebo None"""
+        return self._categories.get(code)
+
+    def parent(self, code: int) -> Optional[MGLSTRecord]:
+        """Nadradená skupina (None pre koreň / neznámy kód)"""
+        return self._categories.get(self._parents.get(code, ROOT_CODE))
+
+    def children(self, code: int = ROOT_CODE) -> List[MGLSTRecord]:
+        """Priame podskupiny (code=0 - koreňové skupiny)"""
+        return [self._categories[child] for child in self._children.get(code, ())]
+
+    def roots(self) -> List[MGLSTRecord]:
+        """Koreňové skupiny"""
+        return self.children(ROOT_CODE)
+
+    def path(self, code: int) -> List[MGLSTRecord]:
+        """Skupiny od koreňa po zadanú (prázdny zoznam pre neznámy kód)"""
+        return [self._categories[c] for c in self._paths.get(code, ())]
+
+    def full_path(self, code: int) -> str:
+        """Plná cesta názvov ("" pre neznámy kód)"""
+        return self._full_paths.get(code, "")
+
+    def level(self, code: int) -> int:
+        """Úroveň v strome (1 = koreň, 0 = neznámy kód)"""
+        return len(self._paths.get(code, ()))
+
+    def descendants(self, code: int, include_self: bool = False) -> Set[int]:
+        """Kódy všetkých podskupín (do ľubovoľnej hĺbky)"""
+        result = {code} if include_self and code in self._categories else set()
+        stack = list(self._children.get(code, ()))
+        while stack:
+            child = stack.pop()
+            if child not in result:
+                result.add(child)
+                stack.extend(self._children.get(child, ()))
+        result.discard(ROOT_CODE)
+        return result
+
+    def is_descendant(self, code: int, ancestor: int) -> bool:
+        """Patrí skupina code pod ancestor (priamo alebo nepriamo)"""
+        path = self._paths.get(code, ())
+        return ancestor in path and path[-1] != ancestor
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> List[MGLSTRecord]:
+        """
+        Skupiny, ktorých názov začína prefixom (bez ohľadu na veľkosť písmen)
+
+        Returns:
+            Skupiny zoradené podľa názvu
+        """
+        prefix = prefix.casefold()
+        result = []
+        index = bisect_left(self._names, (prefix,))
+        while index < len(self._names) and (limit is None or len(result) < limit):
+            name, code = self._names[index]
+            if not name.startswith(prefix):
+                break
+            result.append(self._categories[code])
+            index += 1
+        return result
+
+    def choices(self, active_only: bool = True) -> List[Tuple[int, str]]:
+        """(kód, plná cesta) zoradené podľa cesty - položky dropdownu kategórií"""
+        return sorted(
+            ((code, self._full_paths[code]) for code, category in self._categories.items()
+             if category.active or not active_only),
+            key=lambda item: item[1].casefold(),
+        )
+
+    def cache_rows(self) -> List[Tuple[int, str, Optional[int], int, str, bool]]:
+        """
+        Riadky pre categories_cache
+
+        Returns:
+            (mglst_code, mglst_name, parent_code, level, full_path, is_active),
+            rodičia pred deťmi (parent_code None pre koreň - FK na mglst_code)
+        """
+        rows = []
+        for code in sorted(self._paths, key=lambda c: (len(self._paths[c]), c)):
+            category = self._categories[code]
+            rows.append((code, category.mglst_name, self._parents[code] or None, len(self._paths[code]),
+                         self._full_paths[code], bool(category.active)))
+        return rows
+
+    def __repr__(self) -> str:
+        return f"CategoryTree({len(self)} categories, {len(self.roots())} roots)"
@@ -0,0 +1,185 @@
+"""
+Compact Records
+Pamäťovo úsporné varianty NEX Genesis záznamov pre celý katalóg v pamäti
+
+Triedy so __slots__ generované z layoutu tabuľky (bez __dict__ na inštanciu):
+- ceny (MONEY) a DECIMAL polia ako int v najmenších jednotkách
+  (price_buy_cents, DPH v desatinách: vat_rate_tenths)
+- dátumy / časy ako Delphi int (mod_date_days 0 a mod_time_ms -1 = nevyplnené)
+- krátke reťazce (jednotka, užívateľ) zdieľané cez sys.intern, dátumy
+  zdieľané ako jeden int objekt na deň (lru_cache ako delphi.decode_date)
+
+to_record() / from_record() prevádzajú na plný dataclass.
+"""
+
+import sys
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+from .barcode import BarcodeRecord
+from .gscat import GSCATRecord
+from .layout import RecordLayout, Field, STRING, DECIMAL, MONEY, DATE, TIME
+from .mglst import MGLSTRecord
+from .money import Money
+from .text import decode_field
+from .pab import PABRecord
+from . import delphi
+
+# Prípona slotu podľa počtu desatinných miest DECIMAL poľa
+_PLACES_SUFFIX = {1: '_tenths', 2: '_cents', 3: '_millis'}
+
+# Reťazce do tejto dĺžky sa internujú (jednotky, užívatelia, kódy)
+_INTERN_MAX_LENGTH = 10
+
+
+@lru_cache(maxsize=delphi.DATE_CACHE_SIZE)
+def _shared_date(days: int) -> int:
+    """Zdieľaný int objekt dátumu - katalóg má málo rôznych dní zmeny / vytvorenia"""
+    return days
+
+
+def slot_name(field: Field) -> str:
+    """Názov slotu compact triedy pre pole layoutu"""
+    if field.type == DECIMAL and field.places in _PLACES_SUFFIX:
+        return field.name + _PLACES_SUFFIX[field.places]
+    if field.type == MONEY:
+        return field.name + '_cents'
+    if field.type == DATE:
+        return field.name + '_days'
+    if field.type == TIME:
+        return field.name + '_ms'
+    return field.name
+
+
+def _scaled(value: float, places: int) -> int:
+    # Zhodné s Decimal(str(round(value, places))) z from_bytes
+    return round(round(value, places) * 10 ** places)
+
+
+class CompactRecord:
+    """Základ compact tried (vytvára compact_class)"""
+
+    __slots__ = ()
+
+    LAYOUT: RecordLayout = None
+    RECORD_CLASS: Any = None
+    _COLUMNS: Tuple[Tuple[str, Field], ...] = ()
+
+    def __init__(self, *values):
+        """Hodnoty slotov v poradí slots()"""
+        if len(values) != len(self._COLUMNS):
+            raise TypeError(f"{type(self).__name__} expects {len(self._COLUMNS)} values, got {len(values)}")
+        for (slot, _), value in zip(self._COLUMNS, values):
+            setattr(self, slot, value)
+
+    @classmethod
+    def slots(cls) -> Tuple[str, ...]:
+        return tuple(slot for slot, _ in cls._COLUMNS)
+
+    @classmethod
+    def from_bytes(cls, data, encoding: str = 'cp852') -> 'CompactRecord':
+        """Dekóduje surový záznam (bez Decimal a datetime objektov)"""
+        raw = cls.LAYOUT.unpack(data)
+        values = []
+        for _, field in cls._COLUMNS:
+            value = raw[field.name]
+            if value is None:  # Pole chýba v kratšom zázname
+                value = "" if field.type == STRING else -1 if field.type == TIME else 0
+            elif field.type == STRING:
+                value = decode_field(value, encoding)
+                if len(value) <= _INTERN_MAX_LENGTH:
+                    value = sys.intern(value)
+            elif field.type == DECIMAL and field.places in _PLACES_SUFFIX:
+                value = _scaled(value, field.places)
+            elif field.type == MONEY:
+                value = Money.from_float(value).cents
+            elif field.type == DATE:
+                value = _shared_date(value) if value > 0 else 0
+            elif field.type == TIME and value < 0:
+                value = -1
+            values.append(value)
+        return cls(*values)
+
+    @classmethod
+    def from_record(cls, record) -> 'CompactRecord':
+        """Compact kópia dataclassu"""
+        values = []
+        for _, field in cls._COLUMNS:
+            value = getattr(record, field.name)
+            if field.type == DECIMAL:
+                if field.places in _PLACES_SUFFIX:
+                    value = int((Decimal(value) * 10 ** field.places).to_integral_value())
+                else:
+                    value = float(value)
+            elif field.type == MONEY:
+                value = Money.of(value).cents
+            elif field.type == DATE:
+                value = _shared_date(delphi.encode_date(value)) if value else 0
+            elif field.type == TIME:
+                value = delphi.encode_time(value) if value else -1
+            elif field.type == STRING and len(value) <= _INTERN_MAX_LENGTH:
+                value = sys.intern(value)
+            values.append(value)
+        return cls(*values)
+
+    def to_record(self):
+        """Plný dataclass (Money ceny, datetime dátumy)"""
+        kwargs = {}
+        for slot, field in self._COLUMNS:
+            value = getattr(self, slot)
+            if field.type == DECIMAL:
+                if field.places in _PLACES_SUFFIX:
+                    value = Decimal(value).scaleb(-field.places)
+                else:
+                    value = Decimal(str(value))
+            elif field.type == MONEY:
+                value = Money(value)
+            elif field.type == DATE:
+                value = delphi.decode_date(value) if value > 0 else None
+            elif field.type == TIME:
+                value = delphi.decode_time(value) if value >= 0 else None
+            kwargs[field.name] = value
+        return self.RECORD_CLASS(**kwargs)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot, _ in self._COLUMNS)
+
+    def __repr__(self) -> str:
+        values = ', '.join(f"{slot}={getattr(self, slot)!r}" for slot, _ in self._COLUMNS[:3])
+        return f"{type(self).__name__}({values}, ...)"
+
+
+def compact_class(name: str, record_class: Any, doc: str = '') -> type:
+    """
+    Vytvorí compact triedu so slotmi pre polia layoutu record_class.LAYOUT
+
+    Args:
+        name: Názov triedy
+        record_class: Dataclass s atribútom LAYOUT
+        doc: Docstring triedy
+    """
+    layout = record_class.LAYOUT
+    columns = tuple((slot_name(field), field) for field in layout.fields)
+    return type(name, (CompactRecord,), {
+        '__slots__': tuple(slot for slot, _ in columns),
+        '__doc__': doc,
+        '__module__': __name__,
+        'LAYOUT': layout,
+        'RECORD_CLASS': record_class,
+        '_COLUMNS': columns,
+    })
+
+
+CompactGSCAT = compact_class('CompactGSCAT', GSCATRecord, "GSCAT produkt - ceny v centoch")
+CompactBarcode = compact_class('CompactBarcode', BarcodeRecord, "BARCODE záznam")
+CompactMGLST = compact_class('CompactMGLST', MGLSTRecord, "MGLST tovarová skupina")
+CompactPAB = compact_class('CompactPAB', PABRecord, "PAB obchodný partner")
+
+
+def compact_all(records, compact_type: type, encoding: str = 'cp852') -> List[CompactRecord]:
+    """Compact záznamy z iterovateľných surových záznamov (bytes / memoryview)"""
+    from_bytes = compact_type.from_bytes
+    return [from_bytes(data, encoding) for data in records]
@@ -0,0 +1,52 @@
+"""
+Delphi Date/Time
+Konverzie Delphi TDateTime častí uložených v NEX Genesis záznamoch
+
+- dátum: longint, počet dní od 1899-12-30
+- čas: longint, milisekundy od polnoci
+
+Katalóg má len niekoľko tisíc rôznych dní, preto sa datetime pre číslo
+dňa vytvára raz (LRU cache) a ďalšie záznamy dostanú ten istý nemenný
+objekt. Hromadné prevody stĺpcov sú v bulk.py (decode_dates, decode_times).
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+
+DELPHI_EPOCH = datetime(1899, 12, 30)
+
+# Počet cachovaných dní / časov (~27 rokov dní zmeny a vytvorenia)
+DATE_CACHE_SIZE = 10000
+TIME_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def decode_date(days: int) -> datetime:
+    """Convert Delphi date (days since 1899-12-30) to Python datetime"""
+    return DELPHI_EPOCH + timedelta(days=days)
+
+
+def encode_date(dt: datetime) -> int:
+    """Convert Python datetime to Delphi date (days since 1899-12-30)"""
+    return (dt - DELPHI_EPOCH).days
+
+
+@lru_cache(maxsize=2)
+def _midnight(ordinal: int) -> datetime:
+    return datetime.combine(date.fromordinal(ordinal), time())
+
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def _time_of_day(milliseconds: int) -> timedelta:
+    return timedelta(milliseconds=milliseconds)
+
+
+def decode_time(milliseconds: int) -> datetime:
+    """Convert Delphi time (milliseconds since midnight) to today's datetime"""
+    return _midnight(date.today().toordinal()) + _time_of_day(milliseconds)
+
+
+def encode_time(dt: datetime) -> int:
+    """Convert Python datetime to Delphi time (milliseconds since midnight)"""
+    midnight = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    return int((dt - midnight).total_seconds() * 1000)
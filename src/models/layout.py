@@ -0,0 +1,271 @@
+"""
+Record Layouts
+Deklaratívny popis polí NEX Genesis záznamu (názov, offset, Btrieve typ, dĺžka)
+
+Z jednej deklarácie sa pri importe vygeneruje:
+- predkompilovaný struct.Struct pre decode() / encode() celého záznamu
+- lazy polia pre RecordView podtriedy (views.py, atribút LAYOUT)
+- NumPy dtype pre hromadné dekódovanie (bulk.py)
+
+Nová tabuľka (napr. TSH/TSI, skladové karty) = jeden RecordLayout.
+"""
+
+import struct
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import delphi
+from .money import Money
+from .text import decode_field
+
+# Btrieve typy polí
+INTEGER = 'integer'  # longint (4 bajty)
+STRING = 'string'  # reťazec pevnej dĺžky, doplnený NUL / medzerami (text.decode_field)
+FLOAT = 'float'  # double -> float
+DECIMAL = 'decimal'  # double -> Decimal (zaokrúhlený na places miest)
+MONEY = 'money'  # double -> Money (celé centy)
+BOOLEAN = 'boolean'  # 1 bajt
+DATE = 'date'  # longint, Delphi dni (0 = bez dátumu)
+TIME = 'time'  # longint, milisekundy od polnoci (záporné = bez času)
+
+# typ -> (struct formát, dĺžka, numpy formát)
+_FORMATS = {
+    INTEGER: ('i', 4, '<i4'),
+    FLOAT: ('d', 8, '<f8'),
+    DECIMAL: ('d', 8, '<f8'),
+    MONEY: ('d', 8, '<f8'),
+    BOOLEAN: ('?', 1, '?'),
+    DATE: ('i', 4, '<i4'),
+    TIME: ('i', 4, '<i4'),
+}
+
+
+def _decode_date(value: int, encoding: str):
+    return delphi.decode_date(value) if value > 0 else None
+
+
+def _decode_time(value: int, encoding: str):
+    return delphi.decode_time(value) if value >= 0 else None
+
+
+def _decimal_decoder(places: Optional[int]) -> Callable[[float, str], Decimal]:
+    if places is None:
+        return lambda value, encoding: Decimal(str(value))
+    return lambda value, encoding: Decimal(str(round(value, places)))
+
+
+def _decode_money(value: float, encoding: str) -> Money:
+    return Money.from_float(value)
+
+
+def _encode_string(value: str, encoding: str) -> bytes:
+    return value.encode(encoding)
+
+
+def _encode_date(value, encoding: str) -> int:
+    return delphi.encode_date(value) if value else 0
+
+
+def _encode_time(value, encoding: str) -> int:
+    return delphi.encode_time(value) if value else 0
+
+
+def _encode_float(value, encoding: str) -> float:
+    return float(value)
+
+
+@dataclass(frozen=True)
+class Field:
+    """Pole záznamu"""
+
+    name: str  # Názov atribútu dataclassu
+    offset: int  # Začiatok v zázname
+    type: str  # Btrieve typ (INTEGER, STRING, ...)
+    length: int = 0  # Dĺžka v bajtoch (0 = podľa typu, STRING ju vyžaduje)
+    places: Optional[int] = None  # DECIMAL - počet desatinných miest
+    min_length: Optional[int] = None  # Pole len v zázname s touto dĺžkou
+
+    def __post_init__(self):
+        if self.type == STRING:
+            if self.length <= 0:
+                raise ValueError(f"String field {self.name} requires length")
+        elif self.type in _FORMATS:
+            object.__setattr__(self, 'length', _FORMATS[self.type][1])
+        else:
+            raise ValueError(f"Unknown field type: {self.type}")
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+    @property
+    def required_length(self) -> int:
+        """Minimálna dĺžka záznamu, v ktorej je pole prítomné"""
+        return self.end if self.min_length is None else self.min_length
+
+    @property
+    def struct_format(self) -> str:
+        return f"{self.length}s" if self.type == STRING else _FORMATS[self.type][0]
+
+    @property
+    def numpy_format(self) -> str:
+        return f"S{self.length}" if self.type == STRING else _FORMATS[self.type][2]
+
+    @property
+    def default(self) -> Any:
+        """Hodnota poľa, ktoré v kratšom zázname chýba"""
+        return "" if self.type == STRING else None
+
+    def decoder(self) -> Optional[Callable[[Any, str], Any]]:
+        """Konverzia hodnoty zo struct (None = bez konverzie)"""
+        if self.type == STRING:
+            return decode_field
+        if self.type == DECIMAL:
+            return _decimal_decoder(self.places)
+        if self.type == MONEY:
+            return _decode_money
+        if self.type == DATE:
+            return _decode_date
+        if self.type == TIME:
+            return _decode_time
+        return None
+
+    def encoder(self) -> Optional[Callable[[Any, str], Any]]:
+        """Konverzia hodnoty atribútu pre struct (None = bez konverzie)"""
+        if self.type == STRING:
+            return _encode_string
+        if self.type in (FLOAT, DECIMAL, MONEY):
+            return _encode_float
+        if self.type == DATE:
+            return _encode_date
+        if self.type == TIME:
+            return _encode_time
+        return None
+
+    def raw_decoder(self) -> Callable[[memoryview, str], Any]:
+        """Dekodér výrezu záznamu (lazy polia)"""
+        unpack = struct.Struct('<' + self.struct_format).unpack_from
+        convert = self.decoder()
+        if convert is None:
+            return lambda raw, encoding: unpack(raw)[0]
+        return lambda raw, encoding: convert(unpack(raw)[0], encoding)
+
+
+def _build_struct(fields: Sequence[Field]) -> struct.Struct:
+    """Struct pre polia zoradené podľa offsetu, medzery ako pad bajty"""
+    parts = ['<']
+    position = 0
+    for field in fields:
+        if field.offset > position:
+            parts.append(f"{field.offset - position}x")
+        parts.append(field.struct_format)
+        position = field.end
+    return struct.Struct(''.join(parts))
+
+
+class RecordLayout:
+    """Layout záznamu tabuľky - zdroj kodeku, lazy view a NumPy dtype"""
+
+    def __init__(self, table: str, record_size: int, fields: Sequence[Field],
+                 min_size: Optional[int] = None):
+        """
+        Args:
+            table: Názov tabuľky (GSCAT, BARCODE, ...)
+            record_size: Dĺžka záznamu vytváraného encode()
+            fields: Polia v poradí atribútov dataclassu
+            min_size: Minimálna dĺžka dekódovaného záznamu (None = record_size),
+                      polia za ňou musia mať min_length
+        """
+        self.table = table
+        self.record_size = record_size
+        self.min_size = record_size if min_size is None else min_size
+        self.fields: Tuple[Field, ...] = tuple(fields)
+
+        ordered = sorted(self.fields, key=lambda f: f.offset)
+        for previous, field in zip(ordered, ordered[1:]):
+            if field.offset < previous.end:
+                raise ValueError(f"{table}: field {field.name} overlaps {previous.name}")
+        if ordered and ordered[-1].end > record_size:
+            raise ValueError(f"{table}: field {ordered[-1].name} exceeds record size {record_size}")
+
+        # Polia vždy prítomné idú cez jeden Struct, ostatné jednotlivo podľa dĺžky záznamu
+        self.fixed: Tuple[Field, ...] = tuple(f for f in ordered if f.required_length <= self.min_size)
+        self.optional: Tuple[Field, ...] = tuple(f for f in ordered if f.required_length > self.min_size)
+        self.struct = _build_struct(self.fixed)
+        self._decoders = [(f.name, f.decoder()) for f in self.fixed]
+        self._encoders = [(f.name, f.encoder()) for f in self.fixed]
+        self._optional = [(f, struct.Struct('<' + f.struct_format), f.decoder(), f.encoder())
+                          for f in self.optional]
+        self._dtype = None
+
+    def _check_size(self, data) -> None:
+        if len(data) < self.min_size:
+            expected = self.min_size if self.min_size == self.record_size else f">= {self.min_size}"
+            raise ValueError(f"Invalid record size: {len(data)} bytes (expected {expected})")
+
+    def unpack(self, data) -> Dict[str, Any]:
+        """
+        Surové hodnoty polí zo struct bez konverzie (reťazce ako bytes,
+        dátumy ako Delphi int, chýbajúce voliteľné polia None)
+        """
+        self._check_size(data)
+        result = dict(zip([f.name for f in self.fixed], self.struct.unpack_from(data)))
+        for field, codec, _, _ in self._optional:
+            result[field.name] = (codec.unpack_from(data, field.offset)[0]
+                                  if len(data) >= field.required_length else None)
+        return result
+
+    def decode(self, data, encoding: str = 'cp852') -> Dict[str, Any]:
+        """
+        Dekóduje záznam na dict {pole: hodnota}
+
+        Args:
+            data: Surový záznam (bytes alebo memoryview)
+            encoding: Kódovanie reťazcov (cp852)
+        """
+        self._check_size(data)
+
+        result = {}
+        for (name, convert), value in zip(self._decoders, self.struct.unpack_from(data)):
+            result[name] = value if convert is None else convert(value, encoding)
+
+        for field, codec, convert, _ in self._optional:
+            if len(data) < field.required_length:
+                result[field.name] = field.default
+                continue
+            value = codec.unpack_from(data, field.offset)[0]
+            result[field.name] = value if convert is None else convert(value, encoding)
+        return result
+
+    def encode(self, record: Any, encoding: str = 'cp852') -> bytes:
+        """
+        Zakóduje atribúty record do záznamu dĺžky record_size
+
+        Reťazce sa orežú / doplnia NUL, nevyplnené dátumy sú 0.
+        """
+        result = bytearray(self.record_size)
+        values = []
+        for name, convert in self._encoders:
+            value = getattr(record, name)
+            values.append(value if convert is None else convert(value, encoding))
+        self.struct.pack_into(result, 0, *values)
+
+        for field, codec, _, convert in self._optional:
+            value = getattr(record, field.name)
+            codec.pack_into(result, field.offset, value if convert is None else convert(value, encoding))
+        return bytes(result)
+
+    def numpy_fields(self) -> List[Tuple[str, str, int]]:
+        """Polia ako (názov, numpy formát, offset) pre bulk.make_dtype"""
+        return [(f.name, f.numpy_format, f.offset) for f in self.fields]
+
+    def dtype(self):
+        """NumPy štruktúrovaný dtype záznamu (vyžaduje numpy)"""
+        if self._dtype is None:
+            from .bulk import make_dtype
+            self._dtype = make_dtype(self.numpy_fields(), self.record_size)
+        return self._dtype
+
+    def __repr__(self) -> str:
+        return f"RecordLayout({self.table}, {self.record_size} bytes, {len(self.fields)} fields)"
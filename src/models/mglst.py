@@ -11,7 +11,30 @@ Record Size: ~200 bytes
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
-import struct
+
+from .layout import Field, RecordLayout, INTEGER, STRING, FLOAT, BOOLEAN, DATE, TIME
+from . import delphi
+
+# Layout záznamu (approximate, ~200 bytes) - polia od Note len v dlhšom zázname
+MGLST_LAYOUT = RecordLayout('MGLST', 472, [
+    Field('mglst_code', 0, INTEGER),
+    Field('mglst_name', 4, STRING, 80),
+    Field('short_name', 84, STRING, 30),
+    Field('parent_code', 114, INTEGER),
+    Field('level', 118, INTEGER),
+    Field('sort_order', 122, INTEGER),
+    Field('color_code', 126, STRING, 10),
+    Field('default_vat_rate', 136, FLOAT),
+    Field('default_unit', 144, STRING, 10),
+    Field('active', 154, BOOLEAN),
+    Field('show_in_catalog', 155, BOOLEAN),
+    Field('note', 156, STRING, 100),
+    Field('description', 256, STRING, 200),
+    # Audit polia len pri plnej dĺžke záznamu
+    Field('mod_user', 456, STRING, 8, min_length=472),
+    Field('mod_date', 464, DATE, min_length=472),
+    Field('mod_time', 468, TIME, min_length=472),
+], min_size=200)
 
 
 @dataclass
@@ -61,115 +84,34 @@ class MGLSTRecord:
     INDEX_PARENT = 'ParentCode'  # Index podľa nadriadenej skupiny
     INDEX_SORT = 'SortOrder'  # Index pre zoradenie
 
+    LAYOUT = MGLST_LAYOUT
+
     @classmethod
     def from_bytes(cls, data: bytes, encoding: str = 'cp852') -> 'MGLSTRecord':
         """
         Deserialize MGLST record from bytes
 
-        Field Layout (approximate, ~200 bytes):
-        - MglstCode: 4 bytes (0-3) - longint
-        - MglstName: 80 bytes (4-83) - string
-        - ShortName: 30 bytes (84-113) - string
-        - ParentCode: 4 bytes (114-117) - longint
-        - Level: 4 bytes (118-121) - longint
-        - SortOrder: 4 bytes (122-125) - longint
-        - ColorCode: 10 bytes (126-135) - string
-        - DefaultVatRate: 8 bytes (136-143) - double
-        - DefaultUnit: 10 bytes (144-153) - string
-        - Active: 1 byte (154) - boolean
-        - ShowInCatalog: 1 byte (155) - boolean
-        - Note: 100 bytes (156-255) - string
-        - Description: 200 bytes (256-455) - string (may be shorter)
-        - ModUser: 8 bytes - string
-        - ModDate: 4 bytes - longint
-        - ModTime: 4 bytes - longint
+        Field Layout: viď MGLST_LAYOUT (Note, Description a audit polia
+        sa čítajú len ak ich záznam obsahuje)
 
         Args:
-            data: Raw bytes from Btrieve
+            data: Raw bytes from Btrieve (bytes or memoryview)
             encoding: String encoding (cp852 for Czech/Slovak)
 
         Returns:
             MGLSTRecord instance
         """
-        if len(data) < 200:
-            raise ValueError(f"Invalid record size: {len(data)} bytes (expected >= 200)")
-
-        # Primary key
-        mglst_code = struct.unpack('<i', data[0:4])[0]
-
-        # Basic info
-        mglst_name = data[4:84].decode(encoding, errors='ignore').rstrip('\x00 ')
-        short_name = data[84:114].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Hierarchy
-        parent_code = struct.unpack('<i', data[114:118])[0]
-        level = struct.unpack('<i', data[118:122])[0]
-
-        # Display
-        sort_order = struct.unpack('<i', data[122:126])[0]
-        color_code = data[126:136].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Business rules
-        default_vat_rate = struct.unpack('<d', data[136:144])[0]
-        default_unit = data[144:154].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Status
-        active = bool(data[154])
-        show_in_catalog = bool(data[155])
-
-        # Notes (flexible based on actual record size)
-        note = ""
-        description = ""
-        mod_user = ""
-        mod_date = None
-        mod_time = None
-
-        if len(data) >= 256:
-            note = data[156:256].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        if len(data) >= 456:
-            description = data[256:456].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Try to extract audit fields if present
-        if len(data) >= 472:
-            mod_user = data[456:464].decode(encoding, errors='ignore').rstrip('\x00 ')
-            mod_date_int = struct.unpack('<i', data[464:468])[0]
-            mod_date = cls._decode_delphi_date(mod_date_int) if mod_date_int > 0 else None
-            mod_time_int = struct.unpack('<i', data[468:472])[0]
-            mod_time = cls._decode_delphi_time(mod_time_int) if mod_time_int >= 0 else None
-
-        return cls(
-            mglst_code=mglst_code,
-            mglst_name=mglst_name,
-            short_name=short_name,
-            parent_code=parent_code,
-            level=level,
-            sort_order=sort_order,
-            color_code=color_code,
-            default_vat_rate=default_vat_rate,
-            default_unit=default_unit,
-            active=active,
-            show_in_catalog=show_in_catalog,
-            note=note,
-            description=description,
-            mod_user=mod_user,
-            mod_date=mod_date,
-            mod_time=mod_time
-        )
+        return cls(**MGLST_LAYOUT.decode(data, encoding))
 
     @staticmethod
     def _decode_delphi_date(days: int) -> datetime:
         """Convert Delphi date to Python datetime"""
-        from datetime import timedelta
-        base_date = datetime(1899, 12, 30)
-        return base_date + timedelta(days=days)
+        return delphi.decode_date(days)
 
     @staticmethod
     def _decode_delphi_time(milliseconds: int) -> datetime:
         """Convert Delphi time to Python datetime"""
-        from datetime import timedelta
-        base = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        return base + timedelta(milliseconds=milliseconds)
+        return delphi.decode_time(milliseconds)
 
     def validate(self) -> list[str]:
         """Validate record"""
@@ -200,23 +142,30 @@ class MGLSTRecord:
         """
         Get full path from root to this category
 
+        For many categories build CategoryTree once instead (precomputed paths).
+
         Args:
             all_categories: List of all categories
 
         Returns:
             List of categories from root to this one
         """
+        by_code = {}
+        for category in all_categories:
+            by_code.setdefault(category.mglst_code, category)  # duplicitný kód - platí prvý
         path = [self]
+        visited = {self.mglst_code}
         current = self
 
         while not current.is_root():
-            parent = next((c for c in all_categories if c.mglst_code == current.parent_code), None)
-            if parent:
-                path.insert(0, parent)
-                current = parent
-            else:
-                break  # Parent not found, stop
-
+            parent = by_code.get(current.parent_code)
+            if parent is None or parent.mglst_code in visited:
+                break  # Parent not found or cycle, stop
+            path.append(parent)
+            visited.add(parent.mglst_code)
+            current = parent
+
+        path.reverse()
         return path
 
     def get_full_path_name(self, all_categories: list['MGLSTRecord'], separator: str = " > ") -> str:
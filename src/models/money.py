@@ -0,0 +1,212 @@
+"""
+Money
+Peňažné sumy v celých centoch
+
+Zaokrúhľovanie je half-even na centy, teda rovnaké ako doterajšie
+Decimal.quantize(Decimal('0.01')) s predvoleným kontextom. Násobenie
+(rabat, množstvo) sa počíta presne cez celočíselné zlomky, bez Decimal
+medzivýsledkov a bez prevodov cez str.
+"""
+
+from decimal import Decimal
+from functools import total_ordering
+from math import isfinite
+from typing import Any, Iterable, Tuple
+
+CENTS = 100
+
+
+def _ratio(value: Any) -> Tuple[int, int]:
+    """Hodnota ako presný zlomok (čitateľ, menovateľ > 0)"""
+    if isinstance(value, Money):
+        return value.cents, CENTS
+    if isinstance(value, int):
+        return value, 1
+    if not isinstance(value, Decimal):
+        # float / str ako doteraz cez Decimal(str(...))
+        value = Decimal(str(value))
+    return value.as_integer_ratio()
+
+
+def _as_decimal(value: Any) -> Decimal:
+    """float ako Decimal(str(...)) - rovnako ako of() / from_float()"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    return value
+
+
+def _round_half_even(numerator: int, denominator: int) -> int:
+    """numerator / denominator zaokrúhlené half-even na celé číslo"""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+@total_ordering
+class Money:
+    """Nemenná peňažná suma v centoch"""
+
+    __slots__ = ('_cents',)
+
+    def __init__(self, cents: int = 0):
+        """
+        Args:
+            cents: Suma v centoch (int)
+        """
+        if not isinstance(cents, int):
+            raise TypeError(f"Money cents must be int, got {type(cents).__name__}")
+        _set_cents(self, cents)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money is immutable")
+
+    def __reduce__(self):
+        return Money, (self._cents,)
+
+    @property
+    def cents(self) -> int:
+        return self._cents
+
+    @classmethod
+    def of(cls, value: Any) -> 'Money':
+        """Suma z Money / Decimal / int / float / str (v eurách), half-even na centy"""
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, int):
+            return cls(value * CENTS)
+        numerator, denominator = _ratio(value)
+        return cls(_round_half_even(numerator * CENTS, denominator))
+
+    @classmethod
+    def from_float(cls, value: float) -> 'Money':
+        """
+        Suma z Btrieve double - zhodné s Decimal(str(round(value, 2)))
+
+        Nekonečno / NaN / mimo rozsahu (poškodený záznam) je 0.
+        """
+        scaled = round(value, 2) * CENTS
+        if not isfinite(scaled):
+            return ZERO
+        return _money(round(scaled))
+
+    def to_decimal(self) -> Decimal:
+        """Decimal s dvomi desatinnými miestami (ako quantize(Decimal('0.01')))"""
+        return Decimal(self._cents).scaleb(-2)
+
+    def multiply(self, factor: Any) -> 'Money':
+        """Súčin s množstvom / koeficientom, half-even na centy"""
+        if isinstance(factor, int):
+            return _money(self._cents * factor)
+        numerator, denominator = _ratio(factor)
+        return _money(_round_half_even(self._cents * numerator, denominator))
+
+    def discount(self, percent: Any) -> 'Money':
+        """Suma po zľave percent % (rabat), half-even na centy"""
+        numerator, denominator = _ratio(percent)
+        return _money(_round_half_even(self._cents * (100 * denominator - numerator), 100 * denominator))
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return _money(self._cents + other._cents)
+        if other == 0:
+            return self
+        return NotImplemented
+
+    __radd__ = __add__  # sum() začína od 0
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return _money(self._cents - other._cents)
+        return NotImplemented
+
+    def __mul__(self, factor):
+        if isinstance(factor, (int, Decimal, float)) and not isinstance(factor, bool):
+            return self.multiply(factor)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Money':
+        return _money(-self._cents)
+
+    def __abs__(self) -> 'Money':
+        return _money(abs(self._cents))
+
+    def __bool__(self) -> bool:
+        return self._cents != 0
+
+    def __float__(self) -> float:
+        return self._cents / CENTS
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Money):
+            return self._cents == other._cents
+        if isinstance(other, int):
+            return self._cents == other * CENTS
+        if isinstance(other, (Decimal, float)):
+            return self.to_decimal() == _as_decimal(other)
+        return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        if isinstance(other, Money):
+            return self._cents < other._cents
+        if isinstance(other, int):
+            return self._cents < other * CENTS
+        if isinstance(other, (Decimal, float)):
+            return self.to_decimal() < _as_decimal(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # Zhodný s hash rovnakej hodnoty ako Decimal / int (float nie -
+        # Money(10) == 0.1, ale ako kľúč v dict sa nezhodujú)
+        return hash(self.to_decimal())
+
+    def __str__(self) -> str:
+        sign = '-' if self._cents < 0 else ''
+        units, cents = divmod(abs(self._cents), CENTS)
+        return f"{sign}{units}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+
+_new = object.__new__
+_set_cents = Money._cents.__set__
+
+
+def _money(cents: int) -> Money:
+    """Money bez kontroly typu (interné výsledky sú vždy int)"""
+    value = _new(Money)
+    _set_cents(value, cents)
+    return value
+
+
+ZERO = Money(0)
+
+
+def total(amounts: Iterable[Money]) -> Money:
+    """Súčet súm - sčítava priamo centy (rýchlejšie ako sum() cez __add__)"""
+    return _money(sum(amount.cents for amount in amounts))
+
+
+def calculate_item_price(unit_price: Any, rabat_percent: Any, quantity: Any) -> Tuple[Money, Money]:
+    """
+    Cena po rabate a celková cena položky
+
+    unit_price sa nezaokrúhľuje vopred (môže mať viac desatinných miest),
+    obe sumy sú half-even na centy presne ako
+    (unit_price * (1 - rabat_percent / 100)).quantize(Decimal('0.01')).
+
+    Returns:
+        Tuple (price_after_rabat, total_price)
+    """
+    price_numerator, price_denominator = _ratio(unit_price)
+    rabat_numerator, rabat_denominator = _ratio(rabat_percent)
+    # unit_price * (100 - rabat) / 100 v centoch - *100 a /100 sa krátia
+    price_after_rabat = _money(_round_half_even(
+        price_numerator * (100 * rabat_denominator - rabat_numerator),
+        price_denominator * rabat_denominator,
+    ))
+    return price_after_rabat, price_after_rabat.multiply(quantity)
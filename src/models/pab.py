@@ -11,7 +11,42 @@ Record Size: 1269 bytes
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
-import struct
+
+from .layout import Field, RecordLayout, INTEGER, STRING, FLOAT, BOOLEAN
+
+# Layout záznamu (approximate, based on 1269 bytes record)
+PAB_LAYOUT = RecordLayout('PAB', 1269, [
+    Field('pab_code', 0, INTEGER),
+    Field('name1', 4, STRING, 100),
+    Field('name2', 104, STRING, 100),
+    Field('short_name', 204, STRING, 40),
+    Field('street', 244, STRING, 80),
+    Field('city', 324, STRING, 50),
+    Field('zip_code', 374, STRING, 10),
+    Field('country', 384, STRING, 50),
+    Field('phone', 434, STRING, 30),
+    Field('fax', 464, STRING, 30),
+    Field('email', 494, STRING, 60),
+    Field('web', 554, STRING, 60),
+    Field('contact_person', 614, STRING, 50),
+    Field('ico', 664, STRING, 20),
+    Field('dic', 684, STRING, 20),
+    Field('ic_dph', 704, STRING, 30),
+    Field('bank_account', 734, STRING, 30),
+    Field('bank_code', 764, STRING, 10),
+    Field('bank_name', 774, STRING, 60),
+    Field('iban', 834, STRING, 40),
+    Field('swift', 874, STRING, 20),
+    Field('partner_type', 894, INTEGER),
+    Field('payment_terms', 898, INTEGER),
+    Field('credit_limit', 902, FLOAT),
+    Field('discount_percent', 910, FLOAT),
+    Field('active', 918, BOOLEAN),
+    Field('vat_payer', 919, BOOLEAN),
+    Field('note', 920, STRING, 200),
+    Field('note2', 1120, STRING, 100),
+    Field('internal_note', 1220, STRING, 49),  # zvyšok záznamu
+])
 
 
 @dataclass
@@ -83,138 +118,24 @@ class PABRecord:
     INDEX_ICO = 'ICO'  # Index podľa IČO
     INDEX_TYPE = 'PartnerType'  # Index podľa typu partnera
 
+    RECORD_SIZE = 1269
+    LAYOUT = PAB_LAYOUT
+
     @classmethod
     def from_bytes(cls, data: bytes, encoding: str = 'cp852') -> 'PABRecord':
         """
         Deserialize PAB record from bytes
 
-        Field Layout (approximate, based on 1269 bytes record):
-        - PabCode: 4 bytes (0-3) - longint
-        - Name1: 100 bytes (4-103) - string
-        - Name2: 100 bytes (104-203) - string
-        - ShortName: 40 bytes (204-243) - string
-        - Street: 80 bytes (244-323) - string
-        - City: 50 bytes (324-373) - string
-        - ZipCode: 10 bytes (374-383) - string
-        - Country: 50 bytes (384-433) - string
-        - Phone: 30 bytes (434-463) - string
-        - Fax: 30 bytes (464-493) - string
-        - Email: 60 bytes (494-553) - string
-        - Web: 60 bytes (554-613) - string
-        - ContactPerson: 50 bytes (614-663) - string
-        - ICO: 20 bytes (664-683) - string
-        - DIC: 20 bytes (684-703) - string
-        - ICDPH: 30 bytes (704-733) - string
-        - BankAccount: 30 bytes (734-763) - string
-        - BankCode: 10 bytes (764-773) - string
-        - BankName: 60 bytes (774-833) - string
-        - IBAN: 40 bytes (834-873) - string
-        - SWIFT: 20 bytes (874-893) - string
-        - PartnerType: 4 bytes (894-897) - longint
-        - PaymentTerms: 4 bytes (898-901) - longint
-        - CreditLimit: 8 bytes (902-909) - double
-        - DiscountPercent: 8 bytes (910-917) - double
-        - Active: 1 byte (918) - boolean
-        - VatPayer: 1 byte (919) - boolean
-        - Note: 200 bytes (920-1119) - string
-        - Note2: 100 bytes (1120-1219) - string
-        - InternalNote: 100 bytes (1220-1319) - string (may overflow)
+        Field Layout: viď PAB_LAYOUT (audit polia nie sú v layoute známe)
 
         Args:
-            data: Raw bytes from Btrieve
+            data: Raw bytes from Btrieve (bytes or memoryview)
             encoding: String encoding (cp852 for Czech/Slovak)
 
         Returns:
             PABRecord instance
         """
-        if len(data) < 1269:
-            raise ValueError(f"Invalid record size: {len(data)} bytes (expected 1269)")
-
-        # Primary key
-        pab_code = struct.unpack('<i', data[0:4])[0]
-
-        # Basic info
-        name1 = data[4:104].decode(encoding, errors='ignore').rstrip('\x00 ')
-        name2 = data[104:204].decode(encoding, errors='ignore').rstrip('\x00 ')
-        short_name = data[204:244].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Address
-        street = data[244:324].decode(encoding, errors='ignore').rstrip('\x00 ')
-        city = data[324:374].decode(encoding, errors='ignore').rstrip('\x00 ')
-        zip_code = data[374:384].decode(encoding, errors='ignore').rstrip('\x00 ')
-        country = data[384:434].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Contact
-        phone = data[434:464].decode(encoding, errors='ignore').rstrip('\x00 ')
-        fax = data[464:494].decode(encoding, errors='ignore').rstrip('\x00 ')
-        email = data[494:554].decode(encoding, errors='ignore').rstrip('\x00 ')
-        web = data[554:614].decode(encoding, errors='ignore').rstrip('\x00 ')
-        contact_person = data[614:664].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Tax info
-        ico = data[664:684].decode(encoding, errors='ignore').rstrip('\x00 ')
-        dic = data[684:704].decode(encoding, errors='ignore').rstrip('\x00 ')
-        ic_dph = data[704:734].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Bank info
-        bank_account = data[734:764].decode(encoding, errors='ignore').rstrip('\x00 ')
-        bank_code = data[764:774].decode(encoding, errors='ignore').rstrip('\x00 ')
-        bank_name = data[774:834].decode(encoding, errors='ignore').rstrip('\x00 ')
-        iban = data[834:874].decode(encoding, errors='ignore').rstrip('\x00 ')
-        swift = data[874:894].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Business info
-        partner_type = struct.unpack('<i', data[894:898])[0]
-        payment_terms = struct.unpack('<i', data[898:902])[0]
-        credit_limit = struct.unpack('<d', data[902:910])[0]
-        discount_percent = struct.unpack('<d', data[910:918])[0]
-
-        # Status
-        active = bool(data[918])
-        vat_payer = bool(data[919])
-
-        # Notes
-        note = data[920:1120].decode(encoding, errors='ignore').rstrip('\x00 ')
-        note2 = data[1120:1220].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        # Internal note (may be at different offset)
-        internal_note = ""
-        if len(data) >= 1269:
-            # Try to extract from remaining bytes
-            internal_note = data[1220:1269].decode(encoding, errors='ignore').rstrip('\x00 ')
-
-        return cls(
-            pab_code=pab_code,
-            name1=name1,
-            name2=name2,
-            short_name=short_name,
-            street=street,
-            city=city,
-            zip_code=zip_code,
-            country=country,
-            phone=phone,
-            fax=fax,
-            email=email,
-            web=web,
-            contact_person=contact_person,
-            ico=ico,
-            dic=dic,
-            ic_dph=ic_dph,
-            bank_account=bank_account,
-            bank_code=bank_code,
-            bank_name=bank_name,
-            iban=iban,
-            swift=swift,
-            partner_type=partner_type,
-            payment_terms=payment_terms,
-            credit_limit=credit_limit,
-            discount_percent=discount_percent,
-            active=active,
-            vat_payer=vat_payer,
-            note=note,
-            note2=note2,
-            internal_note=internal_note
-        )
+        return cls(**PAB_LAYOUT.decode(data, encoding))
 
     def validate(self) -> list[str]:
         """Validate record"""
@@ -0,0 +1,42 @@
+"""
+Text Decoding
+Spoločné dekódovanie a čistenie reťazcov z NEX Genesis záznamov
+
+Btrieve reťazce sú cp852 polia pevnej dĺžky doplnené NUL / medzerami
+a občas obsahujú riadiace znaky. Riadiace bajty (okrem \\t a \\n) sa
+odstránia jedným bytes.translate ešte pred dekódovaním - v cp852 (a každom
+ASCII kompatibilnom kódovaní) sú bajty 0x00-0x1F práve riadiace znaky.
+"""
+
+import re
+from typing import Optional
+
+# Riadiace znaky, ktoré sa odstraňujú (NUL a ostatné okrem \t a \n)
+CONTROL_CHARS = ''.join(chr(code) for code in range(32) if chr(code) not in '\t\n')
+_CONTROL_BYTES = CONTROL_CHARS.encode('ascii')
+_CONTROL_RE = re.compile(f"[{re.escape(CONTROL_CHARS)}]")
+
+
+def decode_field(raw: bytes, encoding: str = 'cp852') -> str:
+    """
+    Dekóduje Btrieve reťazcové pole na čistý str
+
+    Odstráni NUL a riadiace bajty, oreže koncové medzery (padding).
+
+    Args:
+        raw: Bajty poľa
+        encoding: ASCII kompatibilné kódovanie (cp852)
+    """
+    return raw.translate(None, _CONTROL_BYTES).rstrip(b' ').decode(encoding, 'ignore')
+
+
+def clean_text(value: str) -> Optional[str]:
+    """
+    Odstráni NUL a riadiace znaky (okrem \\t a \\n) a okrajové medzery
+
+    Returns:
+        Vyčistený reťazec alebo None, ak nič nezostane
+    """
+    if not value.isprintable():
+        value = _CONTROL_RE.sub('', value)
+    return value.strip() or None
@@ -0,0 +1,161 @@
+"""
+Lazy Record Views
+Zero-copy pohľady na surové Btrieve záznamy
+
+View drží memoryview záznamu a pole dekóduje až pri prvom prístupe,
+výsledok sa uloží do inštancie (ďalší prístup je bežný atribút).
+Hodnoty sú zhodné s from_bytes príslušného dataclassu, to_record()
+vráti plný dataclass.
+
+Pozor: iter_records(copy=False) a kurzory znovu používajú buffer -
+view, ktorý má prežiť ďalšiu operáciu, treba vytvoriť s copy=True.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .barcode import BarcodeRecord
+from .gscat import GSCATRecord
+from .layout import RecordLayout
+from .mglst import MGLSTRecord
+from .pab import PABRecord
+
+
+class LazyField:
+    """Pole záznamu dekódované pri prvom prístupe"""
+
+    def __init__(self, offset: int, size: int, decode: Callable[[memoryview, str], Any],
+                 default: Any = None, min_length: Optional[int] = None):
+        """
+        Args:
+            offset: Začiatok poľa v zázname
+            size: Veľkosť poľa v bajtoch
+            decode: Dekodér (raw, encoding) -> hodnota
+            default: Hodnota pre kratší záznam
+            min_length: Minimálna dĺžka záznamu pre pole (None = offset + size)
+        """
+        self.offset = offset
+        self.size = size
+        self.decode = decode
+        self.default = default
+        self.min_length = offset + size if min_length is None else min_length
+        self.end = offset + size
+        self.optional = True
+        self.name = ''
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+        # Pole vo vnútri MIN_SIZE je vždy prítomné - bez kontroly dĺžky pri čítaní
+        self.optional = self.min_length > getattr(owner, 'MIN_SIZE', 0)
+
+    def __get__(self, view: Optional['RecordView'], owner=None) -> Any:
+        if view is None:
+            return self
+        data = view._data
+        if self.optional and len(data) < self.min_length:
+            value = self.default
+        else:
+            value = self.decode(data[self.offset:self.end], view._encoding)
+        # Non-data descriptor - hodnota v __dict__ má pri ďalšom prístupe prednosť
+        view.__dict__[self.name] = value
+        return value
+
+
+class RecordView:
+    """
+    Základ lazy pohľadov
+
+    Podtrieda s atribútom LAYOUT dostane LazyField pre každé pole layoutu,
+    ďalšie polia môže definovať ako LazyField priamo.
+    """
+
+    RECORD_CLASS: Any = None
+    LAYOUT: Optional[RecordLayout] = None
+    MIN_SIZE = 0
+
+    _FIELDS: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        layout = cls.__dict__.get('LAYOUT')
+        if layout is not None:
+            cls.MIN_SIZE = layout.min_size
+            for field in layout.fields:
+                lazy = LazyField(field.offset, field.length, field.raw_decoder(),
+                                 field.default, field.min_length)
+                setattr(cls, field.name, lazy)
+                lazy.__set_name__(cls, field.name)
+
+        fields: Dict[str, None] = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, LazyField):
+                    fields[name] = None
+        cls._FIELDS = tuple(fields)
+
+    def __init__(self, data, encoding: str = 'cp852', copy: bool = False):
+        """
+        Args:
+            data: Surový záznam (bytes, bytearray alebo memoryview)
+            encoding: Kódovanie reťazcov (cp852)
+            copy: Skopírovať záznam (view prežije znovupoužitie buffra)
+        """
+        if len(data) < self.MIN_SIZE:
+            raise ValueError(f"Invalid record size: {len(data)} bytes (expected >= {self.MIN_SIZE})")
+        self._data = memoryview(bytes(data) if copy else data)
+        self._encoding = encoding
+
+    @classmethod
+    def detached(cls, data, encoding: str = 'cp852') -> 'RecordView':
+        """View nad kópiou záznamu (dekodér pre kurzory / iter_records)"""
+        return cls(data, encoding, copy=True)
+
+    @classmethod
+    def field_names(cls) -> Tuple[str, ...]:
+        """Názvy polí (v poradí dataclassu)"""
+        return cls._FIELDS
+
+    @property
+    def raw(self) -> memoryview:
+        """Surový záznam"""
+        return self._data
+
+    def to_record(self):
+        """Plný dataclass (dekóduje zvyšné polia)"""
+        return self.RECORD_CLASS(**{name: getattr(self, name) for name in self._FIELDS})
+
+    def __repr__(self) -> str:
+        decoded = ', '.join(f"{name}={self.__dict__[name]!r}" for name in self._FIELDS if name in self.__dict__)
+        return f"{type(self).__name__}({decoded})"
+
+
+class GSCATView(RecordView):
+    """Lazy pohľad na GSCAT záznam"""
+
+    RECORD_CLASS = GSCATRecord
+    LAYOUT = GSCATRecord.LAYOUT
+
+    @property
+    def bar_code(self) -> str:
+        """Primárny EAN (BarCode)"""
+        return GSCATRecord.read_bar_code(self._data, self._encoding)
+
+
+class BarcodeView(RecordView):
+    """Lazy pohľad na BARCODE záznam"""
+
+    RECORD_CLASS = BarcodeRecord
+    LAYOUT = BarcodeRecord.LAYOUT
+
+
+class MGLSTView(RecordView):
+    """Lazy pohľad na MGLST záznam"""
+
+    RECORD_CLASS = MGLSTRecord
+    LAYOUT = MGLSTRecord.LAYOUT
+
+
+class PABView(RecordView):
+    """Lazy pohľad na PAB záznam"""
+
+    RECORD_CLASS = PABRecord
+    LAYOUT = PABRecord.LAYOUT
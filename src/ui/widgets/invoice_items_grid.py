@@ -7,6 +7,8 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView, QHeaderView, QAbst
 from PyQt5.QtCore import Qt, QAbstractTableModel, QVariant, QModelIndex, pyqtSignal
 from decimal import Decimal, InvalidOperation
 
+from models.money import calculate_item_price
+
 
 class InvoiceItemsModel(QAbstractTableModel):
     """Editable table model for invoice items"""
@@ -153,22 +155,18 @@ class InvoiceItemsModel(QAbstractTableModel):
     def _calculate_item_prices(self, item):
         """Calculate price_after_rabat and total_price"""
         try:
-            unit_price = Decimal(str(item.get('unit_price', 0)))
-            rabat_percent = Decimal(str(item.get('rabat_percent', 0)))
-            quantity = Decimal(str(item.get('quantity', 0)))
-
             # Price after rabat = unit_price * (1 - rabat_percent/100)
-            price_after_rabat = unit_price * (Decimal('1') - rabat_percent / Decimal('100'))
-            price_after_rabat = price_after_rabat.quantize(Decimal('0.01'))
+            # Total price = price_after_rabat * quantity (integer cents)
+            price_after_rabat, total_price = calculate_item_price(
+                item.get('unit_price', 0),
+                item.get('rabat_percent', 0),
+                item.get('quantity', 0),
+            )
 
-            # Total price = price_after_rabat * quantity
-            total_price = price_after_rabat * quantity
-            total_price = total_price.quantize(Decimal('0.01'))
+            item['price_after_rabat'] = price_after_rabat.to_decimal()
+            item['total_price'] = total_price.to_decimal()
 
-            item['price_after_rabat'] = price_after_rabat
-            item['total_price'] = total_price
-
-        except (ValueError, InvalidOperation) as e:
+        except (ValueError, InvalidOperation, OverflowError) as e:
             self.logger.error(f"Price calculation error: {e}")
             item['price_after_rabat'] = Decimal('0.00')
             item['total_price'] = Decimal('0.00')
@@ -0,0 +1,12 @@
+"""
+Shared pytest setup
+
+Application modules import each other as top-level packages (btrieve,
+models, business), the same way main.py and scripts/ put src on sys.path.
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'scripts'))
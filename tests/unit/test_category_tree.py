@@ -0,0 +1,102 @@
+"""
+CategoryTree - paths, levels and search over MGLST records, broken data
+(cycles, missing parents, duplicate codes) included
+"""
+from models import CategoryTree, MGLSTRecord
+
+
+def category(code: int, name: str, parent: int = 0, active: bool = True) -> MGLSTRecord:
+    return MGLSTRecord(mglst_code=code, mglst_name=name, parent_code=parent, active=active)
+
+
+CATEGORIES = [
+    category(1, 'Potraviny'),
+    category(12, 'Mliečne výrobky', 1),
+    category(120, 'Syry', 12),
+    category(13, 'Pečivo', 1, active=False),
+    category(2, 'Drogéria'),
+]
+
+
+def test_paths_and_levels():
+    tree = CategoryTree(CATEGORIES)
+    assert len(tree) == 5 and 120 in tree and 99 not in tree
+    assert tree.full_path(120) == 'Potraviny > Mliečne výrobky > Syry'
+    assert [c.mglst_code for c in tree.path(120)] == [1, 12, 120]
+    assert tree.level(1) == 1 and tree.level(120) == 3 and tree.level(99) == 0
+    assert tree.parent(12).mglst_code == 1 and tree.parent(1) is None
+    assert [c.mglst_code for c in tree.roots()] == [1, 2]
+    assert {c.mglst_code for c in tree.children(1)} == {12, 13}
+    assert tree.descendants(1) == {12, 13, 120}
+    assert tree.descendants(1, include_self=True) == {1, 12, 13, 120}
+    assert tree.is_descendant(120, 1) and not tree.is_descendant(1, 1)
+
+
+def test_matches_mglst_get_path():
+    tree = CategoryTree(CATEGORIES)
+    for record in CATEGORIES:
+        assert tree.path(record.mglst_code) == record.get_path(CATEGORIES)
+
+
+def test_search_and_choices():
+    tree = CategoryTree(CATEGORIES, separator='/')
+    assert [c.mglst_code for c in tree.search('p')] == [13, 1]
+    assert [c.mglst_code for c in tree.search('MLIE')] == [12]
+    assert tree.search('x') == []
+    assert tree.choices() == [(2, 'Drogéria'), (1, 'Potraviny'), (12, 'Potraviny/Mliečne výrobky'),
+                              (120, 'Potraviny/Mliečne výrobky/Syry')]
+    assert (13, 'Potraviny/Pečivo') in tree.choices(active_only=False)
+
+
+def test_orphans_become_roots():
+    tree = CategoryTree([category(5, 'Sirota', parent=404), category(6, 'Dieťa', parent=5)])
+    assert tree.full_path(6) == 'Sirota > Dieťa'
+    assert tree.parent(5) is None
+    assert [c.mglst_code for c in tree.roots()] == [5]
+
+
+def test_cycles_are_broken():
+    tree = CategoryTree([
+        category(7, 'A', parent=9),
+        category(8, 'B', parent=7),
+        category(9, 'C', parent=8),
+        category(10, 'Self', parent=10),
+    ])
+    # One member of the cycle becomes a root, the others hang below it
+    paths = {code: [c.mglst_code for c in tree.path(code)] for code in (7, 8, 9)}
+    for code, path in paths.items():
+        assert path[-1] == code and len(path) == len(set(path))
+    assert sorted(len(path) for path in paths.values()) == [1, 2, 3]
+    root = next(code for code, path in paths.items() if len(path) == 1)
+    assert tree.descendants(root) == {7, 8, 9} - {root}
+    assert {c.mglst_code for c in tree.roots()} == {root, 10}
+    assert tree.full_path(10) == 'Self'
+    # MGLSTRecord.get_path stops at the cycle as well
+    a, c = category(7, 'A', 9), category(9, 'C', 7)
+    assert [r.mglst_code for r in a.get_path([a, c])] == [9, 7]
+
+
+def test_duplicate_code_first_record_wins():
+    duplicate = category(12, 'Duplicita', 2)
+    tree = CategoryTree(CATEGORIES + [duplicate])
+    assert tree.get(12).mglst_name == 'Mliečne výrobky'
+    assert tree.full_path(120) == 'Potraviny > Mliečne výrobky > Syry'
+    assert [c.mglst_name for c in CATEGORIES[2].get_path(CATEGORIES + [duplicate])] == \
+        ['Potraviny', 'Mliečne výrobky', 'Syry']
+
+
+def test_code_zero_record_is_skipped(caplog):
+    # Blank MGLST row - code 0 is the root, not a category
+    tree = CategoryTree(CATEGORIES + [category(0, ''), category(0, 'Koreň', parent=1)])
+    assert len(tree) == 5 and 0 not in tree
+    assert tree.full_path(120) == 'Potraviny > Mliečne výrobky > Syry'
+    assert [c.mglst_code for c in tree.roots()] == [1, 2]
+    assert 'Skipped 2 MGLST record(s) with code 0' in caplog.text
+
+
+def test_cache_rows_parents_first():
+    rows = CategoryTree(CATEGORIES).cache_rows()
+    assert [row[0] for row in rows] == [1, 2, 12, 13, 120]
+    assert rows[0] == (1, 'Potraviny', None, 1, 'Potraviny', True)
+    assert rows[2][2] == 1
+    assert rows[3][5] is False
@@ -0,0 +1,162 @@
+"""
+EanIndex (in memory) and EanIndexFile (mmap file) over the synthetic catalog
+"""
+import struct
+
+import pytest
+
+from btrieve import BtrieveClient, OpenFileRegistry
+from business.ean_index import EanIndex, SOURCE_BARCODE, SOURCE_GSCAT
+from business.ean_index_file import (
+    FORMAT_VERSION,
+    EanIndexFile,
+    default_cache_dir,
+    index_file_path,
+    load_or_build,
+    write_index_file,
+)
+from fake_nex_catalog import barcode_ean, build_fake_nex, gscat_ean
+from models.barcode import BarcodeRecord
+
+PRODUCTS = 60
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    engine, nex_path = build_fake_nex(PRODUCTS, nex_path=tmp_path / 'nex')
+    client = BtrieveClient(backend=engine)
+    stores = nex_path / 'STORES'
+    return client, stores / 'GSCAT.BTR', stores / 'BARCODE.BTR'
+
+
+@pytest.fixture
+def index(catalog):
+    client, gscat_path, barcode_path = catalog
+    return EanIndex.build(client, gscat_path, barcode_path)
+
+
+def add_barcode(client: BtrieveClient, barcode_path, plu: int, ean: str) -> None:
+    with client.open_cursor(str(barcode_path)) as cursor:
+        assert cursor.insert(BarcodeRecord(plu, ean).to_bytes()) == BtrieveClient.STATUS_SUCCESS
+
+
+def test_build_and_lookup(index):
+    # Odd PLUs have a primary EAN, every third PLU (1, 4, 7, ...) a BARCODE.BTR EAN
+    assert len(index.primary) == PRODUCTS // 2
+    assert len(index.secondary) == PRODUCTS // 3
+    assert len(index.positions) == PRODUCTS
+    plu, position, source = index.lookup(gscat_ean(7))
+    assert (plu, source) == (7, SOURCE_GSCAT)
+    assert position == index.positions[7]
+    assert index.lookup(barcode_ean(4))[::2] == (4, SOURCE_BARCODE)
+    assert index.lookup(f" {gscat_ean(7)} ")[0] == 7
+    assert gscat_ean(9) in index and '0000000000000' not in index
+
+
+def test_blank_ean_is_not_found(index):
+    # Even PLUs have an empty BarCode - blank must not resolve to them
+    assert index.lookup('') is None
+    assert index.lookup('   ') is None
+
+
+def test_primary_ean_wins(catalog):
+    client, gscat_path, barcode_path = catalog
+    add_barcode(client, barcode_path, 8, gscat_ean(5))
+    index = EanIndex.build(client, gscat_path, barcode_path)
+    assert index.lookup(gscat_ean(5))[::2] == (5, SOURCE_GSCAT)
+
+
+def test_secondary_ean_of_missing_product(catalog):
+    client, gscat_path, barcode_path = catalog
+    add_barcode(client, barcode_path, 9999, '1112223334445')
+    index = EanIndex.build(client, gscat_path, barcode_path)
+    assert index.lookup('1112223334445') is None
+
+
+def test_without_barcode_file(catalog):
+    client, gscat_path, barcode_path = catalog
+    index = EanIndex.build(client, gscat_path, barcode_path.parent / 'MISSING.BTR')
+    assert index.secondary == {} and len(index.fingerprints) == 1
+    assert index.lookup(barcode_ean(4)) is None
+
+
+def test_is_stale_after_change(catalog, index):
+    client, _, barcode_path = catalog
+    registry = OpenFileRegistry(client)
+    assert not index.is_stale(client)
+    assert not index.is_stale(client, registry)
+    add_barcode(client, barcode_path, 2, '5550000000001')
+    assert index.is_stale(client)
+    assert index.is_stale(client, registry)
+    registry.close_all()
+
+
+def test_index_file_matches_memory_index(index, tmp_path):
+    path = write_index_file(index, tmp_path / 'ean.idx')
+    with EanIndexFile(path) as index_file:
+        assert len(index_file) == len(index)
+        assert index_file.fingerprints == index.fingerprints
+        for plu in range(1, PRODUCTS + 1):
+            for ean in (gscat_ean(plu), barcode_ean(plu)):
+                assert index_file.lookup(ean) == index.lookup(ean)
+            assert index_file.position(plu) == index.positions[plu]
+        assert index_file.position(PRODUCTS + 1) is None
+        assert index_file.lookup('') is None
+        assert index_file.lookup('9' * 20) is None  # Longer than the key
+
+
+def test_index_file_rejects_corrupt_files(index, tmp_path):
+    data = write_index_file(index, tmp_path / 'ean.idx').read_bytes()
+    cases = {
+        'magic': b'XXXXXXXX' + data[8:],
+        'version': data[:8] + struct.pack('<H', FORMAT_VERSION + 1) + data[10:],
+        'truncated': data[:-3],
+        'header': data[:10],
+        'meta': data[:24] + b'{' * (len(data) - 24),
+    }
+    for name, content in cases.items():
+        path = tmp_path / f'{name}.idx'
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            EanIndexFile(path)
+    with pytest.raises(OSError):
+        EanIndexFile(tmp_path / 'missing.idx')
+
+
+def test_load_or_build_reuses_and_repairs(catalog, tmp_path):
+    client, gscat_path, barcode_path = catalog
+    cache_dir = tmp_path / 'cache'
+    first = load_or_build(client, gscat_path, barcode_path, cache_dir)
+    path = first.path
+    first.close()
+
+    # Same catalog state - the existing file is opened
+    mtime = path.stat().st_mtime_ns
+    with load_or_build(client, gscat_path, barcode_path, cache_dir) as again:
+        assert again.path == path and path.stat().st_mtime_ns == mtime
+
+    # Damaged file is rebuilt in place
+    path.write_bytes(path.read_bytes()[:40])
+    with load_or_build(client, gscat_path, barcode_path, cache_dir) as repaired:
+        assert repaired.lookup(gscat_ean(3))[0] == 3
+
+    # Changed catalog - new file, the old one is removed
+    add_barcode(client, barcode_path, 2, '5550000000001')
+    with load_or_build(client, gscat_path, barcode_path, cache_dir) as rebuilt:
+        assert rebuilt.path != path and not path.exists()
+        assert rebuilt.lookup('5550000000001')[::2] == (2, SOURCE_BARCODE)
+        assert rebuilt.path == index_file_path(cache_dir, rebuilt.fingerprints)
+
+
+def test_load_or_build_stats_each_file_once(catalog, tmp_path, monkeypatch):
+    client, gscat_path, barcode_path = catalog
+    stats = []
+    original = client.fingerprint
+    monkeypatch.setattr(client, 'fingerprint', lambda path: stats.append(path) or original(path))
+    load_or_build(client, gscat_path, barcode_path, tmp_path / 'cache').close()
+    assert stats == [gscat_path, barcode_path]
+
+
+def test_default_cache_dir_override(monkeypatch, tmp_path):
+    monkeypatch.setenv('INVOICE_EDITOR_CACHE_DIR', str(tmp_path))
+    assert default_cache_dir() == tmp_path
@@ -0,0 +1,253 @@
+"""
+FakeBtrieveEngine and KeySpec
+
+BtrieveClient / BtrieveCursor running over the in-memory engine: keyed and
+physical traversal, extended operations, positions, transactions.
+"""
+import struct
+
+import pytest
+
+from btrieve import (
+    BtrieveClient,
+    ExtractField,
+    FakeBtrieveEngine,
+    FilterTerm,
+    KeySpec,
+    EXT_EQUAL,
+    EXT_GREATER,
+    KEY_TYPE_INTEGER,
+    KEY_TYPE_LSTRING,
+    KEY_TYPE_STRING,
+)
+
+FILENAME = 'DATA.BTR'
+RECORD_LENGTH = 16
+CODE_KEY = KeySpec(0, 4, KEY_TYPE_INTEGER)
+NAME_KEY = KeySpec(4, 8, KEY_TYPE_STRING)
+KEYS = {0: CODE_KEY, 1: NAME_KEY}
+
+
+def make_record(code: int, name: str) -> bytes:
+    return struct.pack('<i', code) + name.encode('ascii').ljust(8, b'\x00') + bytes(4)
+
+
+def code_of(record) -> int:
+    return struct.unpack_from('<i', record)[0]
+
+
+# Physical order differs from both key orders
+ROWS = [(30, 'cherry'), (10, 'banana'), (50, 'apple'), (20, 'elder'), (40, 'date')]
+
+
+@pytest.fixture
+def engine():
+    engine = FakeBtrieveEngine()
+    engine.add_file(FILENAME, KEYS, [make_record(code, name) for code, name in ROWS], RECORD_LENGTH)
+    return engine
+
+
+@pytest.fixture
+def client(engine):
+    return BtrieveClient(backend=engine)
+
+
+@pytest.fixture
+def cursor(client):
+    with client.open_cursor(FILENAME) as cursor:
+        yield cursor
+
+
+# KeySpec
+
+def test_integer_key_build_and_extract():
+    assert CODE_KEY.build(-2) == struct.pack('<i', -2)
+    record = make_record(1234, 'x')
+    assert CODE_KEY.extract(record) == struct.pack('<i', 1234)
+    assert CODE_KEY.compare_value(CODE_KEY.extract(record)) == 1234
+    # Ordering follows the numeric value, not the little-endian bytes
+    assert CODE_KEY.compare_value(CODE_KEY.build(256)) > CODE_KEY.compare_value(CODE_KEY.build(255))
+
+
+def test_string_key_build_pads_and_truncates():
+    assert NAME_KEY.build('abc') == b'abc' + bytes(5)
+    assert NAME_KEY.build('abcdefghij') == b'abcdefgh'
+    assert NAME_KEY.build(b'raw') == b'raw' + bytes(5)
+    assert KeySpec(0, 4).build('čaj') == 'čaj'.encode('cp852') + bytes(1)
+    assert NAME_KEY.extract(make_record(1, 'apple')) == b'apple' + bytes(3)
+
+
+def test_lstring_key_build_and_extract():
+    spec = KeySpec(2, 6, KEY_TYPE_LSTRING)
+    assert spec.build('abc') == b'\x03abc\x00\x00'
+    assert spec.build('abcdefgh') == b'\x05abcde'
+    record = b'..' + spec.build('xy') + b'..'
+    assert spec.extract(record) == b'\x02xy\x00\x00\x00'
+    # Bytes behind the length prefix do not take part in comparison
+    assert spec.compare_value(b'\x02xyZZZ') == b'xy'
+    assert spec.compare_value(b'') == b''
+
+
+# Keyed operations
+
+def test_keyed_traversal_follows_key_order(client, cursor):
+    assert [code_of(r) for r in client.iter_records(cursor, key_num=0)] == [10, 20, 30, 40, 50]
+    assert [code_of(r) for r in client.iter_records(cursor, key_num=1)] == [50, 10, 30, 40, 20]
+    assert [code_of(r) for r in client.iter_records(cursor, start_key=CODE_KEY.build(25))] == [30, 40, 50]
+
+
+def test_get_equal_and_neighbours(cursor):
+    assert cursor.get_equal(CODE_KEY.build(30)) == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 30
+    assert bytes(cursor.key[:4]) == CODE_KEY.build(30)
+    assert cursor.get_next() == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 40
+    assert cursor.get_previous() == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 30
+
+    assert cursor.get_last() == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 50
+    assert cursor.get_next() == BtrieveClient.STATUS_END_OF_FILE
+    assert cursor.get_equal(CODE_KEY.build(35)) == BtrieveClient.STATUS_KEY_NOT_FOUND
+    assert cursor.get_greater_or_equal(CODE_KEY.build(35)) == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 40
+    assert cursor.get_first(key_num=7) == BtrieveClient.STATUS_INVALID_KEY_NUMBER
+
+
+def test_key_only_lookup(client, cursor):
+    assert cursor.key_exists(NAME_KEY.build('date'), 1)
+    assert not cursor.key_exists(NAME_KEY.build('fig'), 1)
+    assert cursor.get_key_equal(NAME_KEY.build('date'), 1) == BtrieveClient.STATUS_SUCCESS
+    # Position is established without the record being returned
+    assert cursor.get_next() == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 20
+
+
+# Physical (Step) operations
+
+def test_step_follows_physical_order(client, cursor):
+    assert [code_of(r) for r in client.iter_records(cursor)] == [code for code, _ in ROWS]
+    assert cursor.step_last() == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 40
+    assert cursor.step_previous() == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 20
+    assert cursor.step_last() == BtrieveClient.STATUS_SUCCESS
+    assert cursor.step_next() == BtrieveClient.STATUS_END_OF_FILE
+
+
+def test_step_without_position_fails(cursor):
+    assert cursor.step_next() == BtrieveClient.STATUS_INVALID_POSITIONING
+
+
+# Extended operations
+
+def test_step_extended_filters_and_projects(client):
+    fields = [ExtractField(0, 4)]
+    terms = [FilterTerm(0, 4, EXT_GREATER, CODE_KEY.build(20), KEY_TYPE_INTEGER)]
+    batches = list(client.iter_extended(FILENAME, fields, terms, batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [code_of(data) for batch in batches for _, data in batch] == [30, 50, 40]
+
+
+def test_get_extended_uses_key_order(client):
+    fields = [ExtractField(4, 8), ExtractField(0, 4)]
+    records = [data for batch in client.iter_extended(FILENAME, fields, key_num=0) for _, data in batch]
+    assert [code_of(data[8:]) for data in records] == [10, 20, 30, 40, 50]
+    assert records[0][:8] == b'banana\x00\x00'
+
+
+def test_extended_reject_count(client, cursor):
+    terms = [FilterTerm(0, 4, EXT_EQUAL, CODE_KEY.build(40), KEY_TYPE_INTEGER)]
+    assert cursor.step_first() == BtrieveClient.STATUS_SUCCESS
+    status, records = client.get_next_extended(cursor, [ExtractField(0, 4)], terms, max_reject=2,
+                                               use_current=True, step=True)
+    assert status == BtrieveClient.STATUS_REJECT_COUNT_REACHED
+    assert records == []
+    # Found with the default reject limit
+    rows = [data for batch in client.iter_extended(cursor, [ExtractField(0, 4)], terms) for _, data in batch]
+    assert [code_of(data) for data in rows] == [40]
+
+
+def test_extended_positions_match_get_direct(client, cursor):
+    positions = {code_of(data): position
+                 for batch in client.iter_extended(cursor, [ExtractField(0, 4)]) for position, data in batch}
+    for code, position in positions.items():
+        assert cursor.get_direct(position) == BtrieveClient.STATUS_SUCCESS
+        assert code_of(cursor.record) == code
+
+
+# Position / Get Direct
+
+def test_get_position_and_direct(client, cursor):
+    assert cursor.get_equal(CODE_KEY.build(50)) == BtrieveClient.STATUS_SUCCESS
+    status, position = cursor.get_position()
+    assert status == BtrieveClient.STATUS_SUCCESS
+    assert cursor.get_first() == BtrieveClient.STATUS_SUCCESS
+
+    assert cursor.get_direct(position, 0) == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 50
+    # Get Direct establishes the key position for Get Next
+    assert cursor.get_previous() == BtrieveClient.STATUS_SUCCESS
+    assert code_of(cursor.record) == 40
+    assert cursor.get_direct(position + 1) == BtrieveClient.STATUS_INVALID_RECORD_ADDRESS
+
+    listed = list(client.iter_records(cursor, positions=True))
+    assert [code_of(record) for _, record in listed] == [code for code, _ in ROWS]
+    assert len({position for position, _ in listed}) == len(ROWS)
+
+
+def test_stat_describes_file(client, engine):
+    stat = client.stat(FILENAME)
+    assert stat.num_records == len(ROWS)
+    assert stat.record_length == RECORD_LENGTH
+    assert stat.num_keys == 2
+    assert stat.find_key(4).key_num == 1
+    assert stat.find_key(2) is None
+
+
+def test_open_unknown_file(client):
+    with pytest.raises(RuntimeError):
+        client.open_cursor('MISSING.BTR')
+
+
+# Writes and transactions
+
+def test_insert_update_delete(client, cursor):
+    assert cursor.insert(make_record(25, 'fig')) == BtrieveClient.STATUS_SUCCESS
+    assert cursor.get_equal(CODE_KEY.build(25)) == BtrieveClient.STATUS_SUCCESS
+    assert cursor.update(make_record(25, 'grape')) == BtrieveClient.STATUS_SUCCESS
+    assert cursor.get_equal(NAME_KEY.build('grape'), 1) == BtrieveClient.STATUS_SUCCESS
+    assert not cursor.key_exists(NAME_KEY.build('fig'), 1)
+    assert cursor.delete() == BtrieveClient.STATUS_SUCCESS
+    assert cursor.get_equal(CODE_KEY.build(25)) == BtrieveClient.STATUS_KEY_NOT_FOUND
+    assert client.stat(cursor).num_records == len(ROWS)
+
+
+def test_transaction_commit(client, cursor):
+    with client.transaction():
+        assert cursor.insert(make_record(60, 'fig')) == BtrieveClient.STATUS_SUCCESS
+    assert cursor.key_exists(CODE_KEY.build(60))
+
+
+def test_transaction_abort_restores_records(client, cursor):
+    with pytest.raises(ValueError):
+        with client.transaction():
+            cursor.insert(make_record(60, 'fig'))
+            cursor.get_equal(CODE_KEY.build(10))
+            cursor.update(make_record(10, 'kiwi'))
+            cursor.get_equal(CODE_KEY.build(30))
+            cursor.delete()
+            raise ValueError("rollback")
+
+    assert not cursor.key_exists(CODE_KEY.build(60))
+    assert cursor.get_equal(CODE_KEY.build(10)) == BtrieveClient.STATUS_SUCCESS
+    assert bytes(cursor.record[4:10]) == b'banana'
+    assert cursor.key_exists(NAME_KEY.build('cherry'), 1)
+    assert [code_of(r) for r in client.iter_records(cursor)] == [code for code, _ in ROWS]
+
+
+def test_transaction_state_errors(client):
+    assert client.end_transaction() == BtrieveClient.STATUS_NO_TRANSACTION
+    assert client.begin_transaction() == BtrieveClient.STATUS_SUCCESS
+    assert client.begin_transaction() == BtrieveClient.STATUS_TRANSACTION_ACTIVE
+    assert client.abort_transaction() == BtrieveClient.STATUS_SUCCESS
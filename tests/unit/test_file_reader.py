@@ -0,0 +1,238 @@
+"""
+BtrieveFileReader / FileBackend over .BTR files
+
+Synthetic files follow the page layout documented in btrieve.file_reader.
+tests/fixtures/SAMPLE.BTR (a small fixed-length file copied from a real
+NEX installation) is used when present.
+"""
+import os
+import struct
+from pathlib import Path
+
+import pytest
+
+from btrieve import BtrieveClient, KeySpec, KEY_TYPE_INTEGER
+from btrieve.backends import FileBackend
+from btrieve.file_reader import (
+    BtrieveFile,
+    BtrieveFileReader,
+    FILE_FLAG_DATA_COMPRESSION,
+    FILE_FLAG_PREALLOCATION,
+    FILE_FLAG_VARIABLE_LENGTH,
+)
+
+PAGE_SIZE = 1024
+RECORD_LENGTH = 20
+SLOT_SIZE = 24
+KEYS = {0: KeySpec(0, 4, KEY_TYPE_INTEGER)}
+DATA, INDEX = ord('D'), ord('I')
+
+SAMPLE_FIXTURE = Path(__file__).parent.parent / 'fixtures' / 'SAMPLE.BTR'
+
+
+def make_record(code: int) -> bytes:
+    return struct.pack('<i', code) + b'name%04d' % code + bytes(8)
+
+
+def fcr_page(count: int, file_flags: int = 0, usage: int = 1) -> bytes:
+    page = bytearray(PAGE_SIZE)
+    page[0:2] = b'FC'
+    struct.pack_into('<I', page, 0x04, usage)
+    struct.pack_into('<H', page, 0x08, PAGE_SIZE)
+    struct.pack_into('<H', page, 0x0A, file_flags)
+    struct.pack_into('<H', page, 0x14, 1)
+    struct.pack_into('<HH', page, 0x16, RECORD_LENGTH, SLOT_SIZE)
+    struct.pack_into('<HH', page, 0x1C, count >> 16, count & 0xFFFF)
+    return bytes(page)
+
+
+def pat_page(entries, usage: int) -> bytes:
+    """PAT page, entries = (page type, physical page) per logical page"""
+    page = bytearray(PAGE_SIZE)
+    page[0:2] = b'PP'
+    struct.pack_into('<I', page, 0x04, usage)
+    for logical, (page_type, physical) in enumerate(entries):
+        struct.pack_into('<I', page, 8 + 4 * logical, page_type << 24 | physical)
+    return bytes(page)
+
+
+def data_page(logical: int, records) -> bytes:
+    """Data page: 6-byte header (logical page, usage count), slots, None = unused slot"""
+    page = bytearray(b'\xff' * PAGE_SIZE)
+    struct.pack_into('<IH', page, 0, logical, 1)
+    offset = 6
+    for record in records:
+        page[offset:offset + SLOT_SIZE] = (record or b'\xff' * RECORD_LENGTH).ljust(SLOT_SIZE, b'\x00')
+        offset += SLOT_SIZE
+    return bytes(page)
+
+
+def write_btrieve_file(path: Path, codes, file_flags: int = 0, num_records=None, swap_pat: bool = False) -> Path:
+    """
+    FCR pair, PAT pair, data page with a deleted slot, index page, stale
+    shadow image of the first data page (only the old PAT copy maps it),
+    second data page
+    """
+    records = [make_record(code) for code in codes]
+    count = len(records) if num_records is None else num_records
+    half = len(records) // 2
+    current = pat_page([(DATA, 4), (INDEX, 5), (DATA, 7)], usage=2)
+    old = pat_page([(DATA, 6), (INDEX, 5)], usage=1)
+    pats = [old, current] if swap_pat else [current, old]
+    pages = [
+        fcr_page(count, file_flags, usage=1),
+        fcr_page(0, file_flags, usage=0),
+        *pats,
+        data_page(0, records[:half] + [None]),
+        bytes(PAGE_SIZE),
+        data_page(0, [make_record(100), make_record(101)]),
+        data_page(2, records[half:]),
+    ]
+    path.write_bytes(b''.join(pages))
+    return path
+
+
+def codes_of(records):
+    return [struct.unpack_from('<i', record)[0] for record in records]
+
+
+@pytest.fixture
+def btr_path(tmp_path):
+    return write_btrieve_file(tmp_path / 'T.BTR', [5, 3, 9, 1, 7, 2])
+
+
+def test_physical_and_keyed_order(btr_path):
+    reader = BtrieveFileReader()
+    btrieve_file = reader.open(btr_path, KEYS)
+    try:
+        assert btrieve_file.fcr.record_length == RECORD_LENGTH
+        assert btrieve_file.num_records == 6
+        assert codes_of(reader.iter_records(btr_path)) == [5, 3, 9, 1, 7, 2]
+        assert codes_of(reader.iter_records(btrieve_file, key_num=0)) == [1, 2, 3, 5, 7, 9]
+        assert codes_of(reader.iter_records(btrieve_file, key_num=0, start_key=struct.pack('<i', 4))) == [5, 7, 9]
+    finally:
+        reader.close_all()
+
+
+def test_layout_neutral_flags_are_accepted(tmp_path):
+    path = write_btrieve_file(tmp_path / 'P.BTR', [1, 2], file_flags=FILE_FLAG_PREALLOCATION)
+    with BtrieveFile(path) as btrieve_file:
+        assert codes_of(btrieve_file.record_at(position) for position, _ in btrieve_file.iter_physical()) == [1, 2]
+
+
+@pytest.mark.parametrize('flag, message', [
+    (FILE_FLAG_VARIABLE_LENGTH, 'variable-length records'),
+    (FILE_FLAG_DATA_COMPRESSION, 'data compression'),
+    (0x4000, 'unknown 0x4000'),
+])
+def test_unsupported_flags_are_rejected(tmp_path, flag, message):
+    path = write_btrieve_file(tmp_path / 'F.BTR', [1, 2], file_flags=flag)
+    with pytest.raises(ValueError, match=message):
+        BtrieveFile(path)
+
+
+@pytest.mark.parametrize('swap_pat', [False, True])
+def test_shadow_pages_are_resolved_through_pat(tmp_path, swap_pat):
+    """Only pages the current PAT copy maps are read, stale page images are not"""
+    path = write_btrieve_file(tmp_path / 'S.BTR', [5, 3, 9, 1, 7, 2], swap_pat=swap_pat)
+    with BtrieveFile(path) as btrieve_file:
+        assert btrieve_file.data_pages() == [4 * PAGE_SIZE, 7 * PAGE_SIZE]
+        assert codes_of(record for _, record in btrieve_file.iter_physical()) == [5, 3, 9, 1, 7, 2]
+
+
+@pytest.mark.parametrize('num_records, found', [(10, 6), (4, 6)])
+def test_record_count_mismatch_raises(tmp_path, num_records, found):
+    """More used slots than the FCR count is as wrong as fewer, nothing is yielded"""
+    path = write_btrieve_file(tmp_path / 'M.BTR', [5, 3, 9, 1, 7, 2], num_records=num_records)
+    with BtrieveFile(path) as btrieve_file:
+        records = btrieve_file.iter_physical()
+        with pytest.raises(ValueError, match=f'found {found} of {num_records} records'):
+            next(records)
+
+
+def test_page_not_matching_pat_is_rejected(tmp_path, btr_path):
+    data = bytearray(btr_path.read_bytes())
+    struct.pack_into('<I', data, 7 * PAGE_SIZE, 5)  # Second data page claims another logical page
+    path = tmp_path / 'BAD.BTR'
+    path.write_bytes(bytes(data))
+    with BtrieveFile(path) as btrieve_file:
+        with pytest.raises(ValueError, match='does not hold logical page 2'):
+            btrieve_file.data_pages()
+
+
+def test_missing_pat_is_rejected(tmp_path, btr_path):
+    data = bytearray(btr_path.read_bytes())
+    data[3 * PAGE_SIZE:3 * PAGE_SIZE + 2] = b'\x00\x00'
+    path = tmp_path / 'NOPAT.BTR'
+    path.write_bytes(bytes(data))
+    with BtrieveFile(path) as btrieve_file:
+        with pytest.raises(ValueError, match='no page allocation table at page 3'):
+            list(btrieve_file.iter_physical())
+
+
+def test_pre_6_file_is_rejected(tmp_path, btr_path):
+    data = bytearray(btr_path.read_bytes())
+    data[0:2] = data[PAGE_SIZE:PAGE_SIZE + 2] = b'\x00\x00'
+    path = tmp_path / 'V5.BTR'
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match='pre-6.x'):
+        BtrieveFile(path)
+
+
+def test_truncated_file_is_rejected(tmp_path, btr_path):
+    path = tmp_path / 'TRUNC.BTR'
+    path.write_bytes(btr_path.read_bytes()[:PAGE_SIZE + 100])
+    with pytest.raises(ValueError, match='page size'):
+        BtrieveFile(path)
+
+
+def test_file_backend_serves_client(btr_path):
+    backend = FileBackend({'T.BTR': KEYS})
+    client = BtrieveClient(backend=backend)
+    try:
+        assert codes_of(client.iter_records(btr_path)) == [5, 3, 9, 1, 7, 2]
+        assert client.stat(btr_path).num_records == 6
+        with client.open_cursor(str(btr_path)) as cursor:
+            assert cursor.get_equal(struct.pack('<i', 7), 0) == BtrieveClient.STATUS_SUCCESS
+            assert cursor.record_bytes()[:4] == struct.pack('<i', 7)
+            assert cursor.insert(make_record(99)) == BtrieveClient.STATUS_ACCESS_DENIED
+    finally:
+        backend.close()
+
+
+def test_file_backend_reloads_changed_file(btr_path):
+    backend = FileBackend({'T.BTR': KEYS})
+    client = BtrieveClient(backend=backend)
+    try:
+        assert client.stat(btr_path).num_records == 6
+        write_btrieve_file(btr_path, [4, 8])
+        st = os.stat(btr_path)
+        os.utime(btr_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert client.stat(btr_path).num_records == 2
+        assert codes_of(client.iter_records(btr_path)) == [4, 8]
+    finally:
+        backend.close()
+
+
+def test_file_backend_reports_unsupported_file(tmp_path):
+    path = write_btrieve_file(tmp_path / 'V.BTR', [1], file_flags=FILE_FLAG_VARIABLE_LENGTH)
+    client = BtrieveClient(backend=FileBackend())
+    with pytest.raises(RuntimeError):
+        client.open_cursor(str(path))
+
+
+@pytest.mark.skipif(not SAMPLE_FIXTURE.exists(), reason="tests/fixtures/SAMPLE.BTR not available")
+def test_real_file_fixture():
+    """Every record the FCR counts is found, Stat and Step agree through FileBackend"""
+    with BtrieveFile(SAMPLE_FIXTURE) as btrieve_file:
+        records = [bytes(record) for _, record in btrieve_file.iter_physical()]
+        assert len(records) == btrieve_file.num_records
+        assert all(len(record) == btrieve_file.record_length for record in records)
+
+    backend = FileBackend()
+    try:
+        client = BtrieveClient(backend=backend)
+        assert client.stat(SAMPLE_FIXTURE).num_records == len(records)
+        assert list(client.iter_records(SAMPLE_FIXTURE)) == records
+    finally:
+        backend.close()
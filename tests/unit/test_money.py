@@ -0,0 +1,103 @@
+"""
+Money - whole cents with Decimal.quantize(Decimal('0.01')) rounding
+"""
+import pickle
+from decimal import Decimal
+
+import pytest
+
+from models import Money
+from models.money import ZERO, calculate_item_price, total
+
+CENT = Decimal('0.01')
+
+
+@pytest.mark.parametrize('value, cents', [
+    ('1.005', 100),  # half-even: ties go to the even cent
+    ('1.015', 102),
+    ('1.0051', 101),
+    ('-1.005', -100),
+    (Decimal('2.675'), 268),
+    (12, 1200),
+    (0.1, 10),
+    (2.675, 268),  # float through str, not its binary value 2.67499...
+])
+def test_of_rounds_half_even(value, cents):
+    assert Money.of(value).cents == cents
+    assert Money.of(value).to_decimal() == Decimal(str(value)).quantize(CENT)
+
+
+def test_from_float_matches_decimal_str_round():
+    for value in (0.125, 0.135, 19.999, 1e-9, 123456.785, -0.005):
+        assert Money.from_float(value).to_decimal() == Decimal(str(round(value, 2))).quantize(CENT)
+    assert Money.from_float(float('nan')) == ZERO
+    assert Money.from_float(float('inf')) == ZERO
+
+
+@pytest.mark.parametrize('unit_price, rabat, quantity', [
+    ('10.00', '0', '1'),
+    ('1.2345', '15', '3'),
+    ('0.333', '33.3', '7.5'),
+    ('99.99', '12.5', '0.125'),
+    (Decimal('4.445'), Decimal('10'), 2),
+])
+def test_calculate_item_price_matches_decimal(unit_price, rabat, quantity):
+    unit_price, rabat, quantity = Decimal(unit_price), Decimal(rabat), Decimal(quantity)
+    expected_price = (unit_price * (1 - rabat / 100)).quantize(CENT)
+    price, total_price = calculate_item_price(unit_price, rabat, quantity)
+    assert price.to_decimal() == expected_price
+    assert total_price.to_decimal() == (expected_price * quantity).quantize(CENT)
+
+
+def test_arithmetic():
+    price = Money.of('10.10')
+    assert price + Money.of('0.05') == Money.of('10.15')
+    assert price - Money.of('0.10') == Money.of(10)
+    assert price * 3 == Money.of('30.30')
+    assert Decimal('0.5') * price == Money.of('5.05')
+    assert price.discount(10) == Money.of('9.09')
+    assert -price == Money.of('-10.10') and abs(-price) == price
+    assert sum([price, price]) == total([price, price]) == Money.of('20.20')
+    assert not ZERO and price
+    with pytest.raises(TypeError):
+        price + 1
+
+
+@pytest.mark.parametrize('other', [1, Decimal('1.00'), Decimal('1'), 1.0])
+def test_compares_with_numbers(other):
+    one = Money.of(1)
+    assert one == other and other == one
+    assert Money.of('0.99') < other < Money.of('1.01')
+    assert Money.of('1.01') > other
+    assert one <= other and one >= other
+
+
+def test_compares_floats_through_str():
+    assert Money.of(0.1) == 0.1
+    assert Money.of(0.1) + Money.of(0.2) == 0.3
+    assert Money.of('0.30') < 0.31
+    assert not Money.of('0.10') < 0.1
+    assert Money(1) == 0.01
+    assert Money(1) != 0.011
+
+
+def test_hash_and_identity():
+    assert hash(Money.of('1.50')) == hash(Decimal('1.5'))
+    assert hash(Money.of(2)) == hash(2)
+    assert {Money.of('1.50'): 'x'}[Decimal('1.50')] == 'x'
+    assert Money.of('1.50') != 'abc'
+    assert pickle.loads(pickle.dumps(Money.of('1.50'))) == Money.of('1.50')
+
+
+def test_immutable_and_int_only():
+    with pytest.raises(AttributeError):
+        Money(1).cents = 2
+    with pytest.raises(TypeError):
+        Money(1.5)
+
+
+def test_str_and_repr():
+    assert str(Money.of('-0.05')) == '-0.05'
+    assert str(Money(123456)) == '1234.56'
+    assert repr(Money.of(3)) == "Money('3.00')"
+    assert float(Money.of('2.50')) == 2.5
@@ -0,0 +1,256 @@
+"""
+NexLookupService over the synthetic catalog (FakeBtrieveEngine)
+
+Finders, GSCAT-before-BARCODE precedence, blank EANs, the error contract
+(status 4 = not found, anything else raises) and lookup_many modes.
+"""
+import pytest
+
+from btrieve import BtrieveClient, FakeBtrieveEngine, KeySpec, KEY_TYPE_INTEGER
+from business.nex_lookup_service import BARCODE_KEYS, GSCAT_KEYS, NexLookupService
+from fake_nex_catalog import barcode_ean, build_fake_nex, gscat_ean, gscat_record
+from models.barcode import BarcodeRecord
+from models.gscat import GSCATRecord
+from models.mglst import MGLST_LAYOUT, MGLSTRecord
+
+PRODUCTS = 200
+SHARED_EAN = gscat_ean(5)  # Also stored in BARCODE.BTR for PLU 8
+
+
+def make_service(engine: FakeBtrieveEngine, nex_path, **options) -> NexLookupService:
+    return NexLookupService(str(nex_path), client=BtrieveClient(backend=engine), **options)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    engine, nex_path = build_fake_nex(PRODUCTS, nex_path=tmp_path / 'nex')
+    with BtrieveClient(backend=engine).open_cursor(str(nex_path / 'STORES' / 'BARCODE.BTR')) as cursor:
+        cursor.insert(BarcodeRecord(8, SHARED_EAN).to_bytes())
+    return engine, nex_path
+
+
+@pytest.fixture(params=[False, True], ids=['keyed', 'index'])
+def service(request, catalog):
+    service = make_service(*catalog, use_index=request.param)
+    yield service
+    service.close()
+
+
+def test_lookup_primary_and_secondary(service):
+    product = service.lookup_by_ean(gscat_ean(7))
+    assert product['plu'] == 7 and product['source'] == 'GSCAT'
+    assert product['name'] == 'Produkt 7' and product['in_nex'] is True
+    assert product['price_sell'] == round(7 / 5, 2)
+
+    product = service.lookup_by_ean(barcode_ean(10))
+    assert product['plu'] == 10 and product['source'] == 'BARCODE'
+    assert service.lookup_by_ean(barcode_ean(11)) is None  # 11 has no BARCODE record
+    assert service.lookup_by_ean('8580000000000') is None
+
+
+def test_gscat_has_precedence_over_barcode(service):
+    product = service.lookup_by_ean(SHARED_EAN)
+    assert (product['plu'], product['source']) == (5, 'GSCAT')
+
+
+def test_blank_ean(service):
+    # Even PLUs have an empty BarCode - a blank EAN must not find them
+    assert service.lookup_by_ean('') is None
+    assert service.lookup_by_ean('   ') is None
+    assert not service.ean_exists('')
+    assert not service.ean_exists('  ')
+
+
+def test_ean_exists_and_validate(service):
+    assert service.ean_exists(gscat_ean(3))
+    assert service.ean_exists(barcode_ean(4))
+    assert not service.ean_exists('8580000000000')
+    assert service.validate_eans([gscat_ean(3), '', '8580000000000', gscat_ean(3)]) == {
+        gscat_ean(3): True, '8580000000000': False}
+    # Keys are stripped and blank values skipped, as in lookup_many
+    eans = [f' {gscat_ean(3)} ', '   ', None, gscat_ean(3), barcode_ean(4) + ' ']
+    assert service.validate_eans(eans) == {gscat_ean(3): True, barcode_ean(4): True}
+    assert set(service.validate_eans(eans)) == set(service.lookup_many(eans)['results'])
+
+
+def test_get_product_by_position(service, catalog):
+    engine, nex_path = catalog
+    with BtrieveClient(backend=engine).open_cursor(str(nex_path / 'STORES' / 'GSCAT.BTR')) as cursor:
+        cursor.get_equal(GSCAT_KEYS[GSCATRecord.KEY_GSCODE].build(42))
+        _, position = cursor.get_position()
+    assert service.get_product_by_position(position)['plu'] == 42
+    assert service.get_product_by_position(position + 1) is None
+
+
+def test_bar_code_key_number_from_stat(tmp_path):
+    """BarCode index under another key number is still found (Stat), not guessed"""
+    engine = FakeBtrieveEngine()
+    stores = tmp_path / 'STORES'
+    stores.mkdir()
+    for name in ('GSCAT.BTR', 'BARCODE.BTR'):
+        (stores / name).touch()
+    keys = {0: GSCAT_KEYS[GSCATRecord.KEY_GSCODE], 1: GSCAT_KEYS[GSCATRecord.KEY_BARCODE]}
+    engine.add_file(str(stores / 'GSCAT.BTR'), keys, [gscat_record(code) for code in range(1, 20)],
+                    record_length=GSCATRecord.RECORD_SIZE)
+    engine.add_file(str(stores / 'BARCODE.BTR'), BARCODE_KEYS, [BarcodeRecord(4, barcode_ean(4)).to_bytes()])
+
+    service = make_service(engine, tmp_path)
+    assert service._barcode_key()[0] == 1
+    assert service.lookup_by_ean(gscat_ean(9))['plu'] == 9
+    assert service.ean_exists(gscat_ean(9))
+    assert service.lookup_by_ean(barcode_ean(4))['plu'] == 4
+
+
+def test_without_bar_code_index_scans(tmp_path):
+    engine, nex_path = build_fake_nex(30, nex_path=tmp_path / 'nex')
+    gscat = engine.add_file(str(nex_path / 'STORES' / 'GSCAT.BTR'), {0: GSCAT_KEYS[GSCATRecord.KEY_GSCODE]},
+                            [gscat_record(code) for code in range(1, 31)], record_length=GSCATRecord.RECORD_SIZE)
+    service = make_service(engine, nex_path)
+    assert service._barcode_key() is None
+    assert gscat.stat().num_keys == 1
+    assert service.lookup_by_ean(gscat_ean(9))['plu'] == 9
+    assert service.lookup_by_ean(barcode_ean(10))['plu'] == 10
+    assert service.ean_exists(gscat_ean(9)) and not service.ean_exists('8580000000000')
+
+
+def test_btrieve_errors_are_raised(tmp_path):
+    """Status other than 4 is an error, not "EAN not found\""""
+    engine, nex_path = build_fake_nex(10, nex_path=tmp_path / 'nex')
+    engine.files.clear()  # Files exist on disk, the engine cannot open them
+    service = make_service(engine, nex_path)
+    with pytest.raises(RuntimeError):
+        service.lookup_by_ean(gscat_ean(3))
+    with pytest.raises(RuntimeError):
+        service.ean_exists(gscat_ean(3))
+
+
+def test_missing_catalog(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        NexLookupService(str(tmp_path), client=BtrieveClient(backend=FakeBtrieveEngine()))
+
+
+def test_index_failure_falls_back_to_keyed(catalog, monkeypatch, caplog):
+    service = make_service(*catalog, use_index=True)
+
+    def unavailable(rebuild=False):
+        raise RuntimeError("GSCAT.BTR locked")
+
+    monkeypatch.setattr(service, 'get_index', unavailable)
+    assert service.lookup_by_ean(gscat_ean(3))['plu'] == 3
+    assert 'falling back to keyed lookup' in caplog.text
+    result = service.lookup_many([gscat_ean(3), barcode_ean(4)])
+    assert result['stats']['mode'] == 'keyed' and result['stats']['found'] == 2
+
+
+def test_stale_index_position_is_rebuilt(catalog):
+    engine, nex_path = catalog
+    service = make_service(engine, nex_path, use_index=True)
+    assert service.lookup_by_ean(gscat_ean(7))['plu'] == 7
+
+    # Product moves to another physical position after the index was built
+    with BtrieveClient(backend=engine).open_cursor(str(nex_path / 'STORES' / 'GSCAT.BTR')) as cursor:
+        cursor.get_equal(GSCAT_KEYS[GSCATRecord.KEY_GSCODE].build(7))
+        cursor.delete()
+        cursor.insert(gscat_record(7))
+    assert service.lookup_by_ean(gscat_ean(7))['plu'] == 7
+
+
+def test_index_file_is_closed_before_rebuild_and_on_close(catalog, tmp_path):
+    service = make_service(*catalog, use_index=True, index_dir=str(tmp_path / 'cache'))
+    old = service.get_index()
+    new = service.get_index(rebuild=True)
+    assert new is not old and old._map.closed and not new._map.closed
+    service.close()
+    assert new._map.closed and service._index is None
+
+
+# lookup_many
+
+def eans_for(plus):
+    """Primary EAN for odd PLUs, BARCODE.BTR EAN (only PLU % 3 == 1 has one) for even"""
+    return [gscat_ean(plu) if plu % 2 else barcode_ean(plu) for plu in plus]
+
+
+def test_lookup_many_modes(catalog):
+    few = eans_for([1, 4])
+    many = eans_for(range(1, 11))  # >= SCAN_MIN_RATIO of the catalog
+    assert len(few) < NexLookupService.SCAN_MIN_RATIO * PRODUCTS <= len(many)
+
+    service = make_service(*catalog)
+    assert service.lookup_many(few)['stats']['mode'] == 'keyed'
+    assert service.lookup_many(many)['stats']['mode'] == 'scan'
+    assert service.lookup_many([])['stats']['mode'] == 'keyed'
+    assert make_service(*catalog, use_index=True).lookup_many(few)['stats']['mode'] == 'index'
+
+
+@pytest.mark.parametrize('use_index, count', [(False, 2), (False, 40), (True, 40)])
+def test_lookup_many_matches_lookup_by_ean(catalog, use_index, count):
+    service = make_service(*catalog, use_index=use_index)
+    eans = eans_for(range(1, count + 1)) + [SHARED_EAN, '8580000000000']
+    results = service.lookup_many(eans, workers=4)['results']
+    assert results == {ean: service.lookup_by_ean(ean) for ean in eans}
+    assert results[SHARED_EAN]['source'] == 'GSCAT'
+
+
+@pytest.mark.parametrize('use_index, extra', [(False, 0), (False, 20), (True, 0)])
+def test_lookup_many_stats(catalog, use_index, extra):
+    service = make_service(*catalog, use_index=use_index)
+    # 1, 3 primary / 4 secondary / 11 missing (no BARCODE record) / duplicates / blanks
+    eans = [gscat_ean(1), f" {gscat_ean(1)} ", gscat_ean(3), barcode_ean(4), barcode_ean(11), '', None, '  ']
+    eans += [gscat_ean(plu) for plu in range(101, 101 + 2 * extra, 2)]
+    result = service.lookup_many(eans)
+    stats = result['stats']
+    assert stats['total'] == len(eans)
+    assert stats['blank'] == 3
+    assert stats['unique'] == 4 + extra
+    assert stats['found'] == 3 + extra
+    assert stats['missing'] == 1
+    assert stats['gscat'] + stats['barcode'] == stats['found']
+    assert stats['barcode'] == 1
+    assert stats['seconds'] >= 0
+    assert set(result['results']) == {ean.strip() for ean in eans if ean and ean.strip()}
+
+
+# Category tree
+
+def test_load_category_tree(catalog):
+    engine, nex_path = catalog
+    mglst_path = nex_path / 'STORES' / 'MGLST.BTR'
+    service = make_service(engine, nex_path)
+    with pytest.raises(FileNotFoundError):
+        service.load_category_tree()
+
+    mglst_path.touch()
+    records = [MGLSTRecord(1, 'Potraviny'), MGLSTRecord(12, 'Mliečne výrobky', parent_code=1)]
+    engine.add_file(str(mglst_path), {0: KeySpec(0, 4, KEY_TYPE_INTEGER)},
+                    [MGLST_LAYOUT.encode(record) for record in records])
+    tree = service.load_category_tree()
+    assert tree.full_path(12) == 'Potraviny > Mliečne výrobky'
+    assert service.load_category_tree() is tree
+
+    with BtrieveClient(backend=engine).open_cursor(str(mglst_path)) as cursor:
+        cursor.insert(MGLST_LAYOUT.encode(MGLSTRecord(13, 'Pečivo', parent_code=1)))
+    reloaded = service.load_category_tree()
+    assert reloaded is not tree and 13 in reloaded
+
+
+def test_change_checks_run_on_registry_handles(catalog, monkeypatch):
+    """Index and category tree checks Stat through pooled handles, no Open per check"""
+    engine, nex_path = catalog
+    mglst_path = nex_path / 'STORES' / 'MGLST.BTR'
+    mglst_path.touch()
+    engine.add_file(str(mglst_path), {0: KeySpec(0, 4, KEY_TYPE_INTEGER)},
+                    [MGLST_LAYOUT.encode(MGLSTRecord(1, 'Potraviny'))])
+    service = make_service(engine, nex_path, use_index=True)
+    service.INDEX_CHECK_INTERVAL = 0
+    index, tree = service.get_index(), service.load_category_tree()
+    service.get_index()
+
+    opens = []
+    original_open = engine._open
+    monkeypatch.setattr(engine, '_open', lambda *args: opens.append(args) or original_open(*args))
+    for _ in range(3):
+        assert service.get_index() is index
+        assert service.load_category_tree() is tree
+    assert opens == []
+    service.close()
@@ -0,0 +1,150 @@
+"""
+RecordLayout codecs of NEX Genesis records
+
+from_bytes / to_bytes round-trips, lazy views, MGLST records shorter than
+the full layout (fields with min_length).
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from models import (
+    BarcodeRecord,
+    CompactGSCAT,
+    Field,
+    GSCATRecord,
+    GSCATView,
+    MGLSTRecord,
+    MGLSTView,
+    Money,
+    RecordLayout,
+)
+from models.layout import INTEGER, STRING
+from models.mglst import MGLST_LAYOUT
+
+
+# Time fields decode onto today's date, 0 (not stored) is midnight
+MOD_TIME = datetime.combine(datetime.today(), datetime(2000, 1, 1, 8, 30, 15).time())
+
+
+def make_gscat() -> GSCATRecord:
+    return GSCATRecord(
+        gs_code=1234,
+        gs_name="Mlieko polotučné 1l",
+        gs_name2="Milk 1l",
+        mglst_code=12,
+        unit='ks',
+        unit_coef=Decimal('1.5'),
+        price_buy=Money.of('0.79'),
+        price_sell=Money.of('1.19'),
+        vat_rate=Decimal('20.0'),
+        stock_current=Decimal('42.25'),
+        discontinued=True,
+        supplier_code=77,
+        supplier_item_code='D-1234',
+        note='Chladený tovar',
+        mod_user='ADMIN',
+        mod_date=datetime(2025, 3, 14),
+        mod_time=MOD_TIME,
+        created_date=datetime(2020, 1, 2),
+    )
+
+
+def make_mglst(**values) -> MGLSTRecord:
+    values.setdefault('mglst_code', 12)
+    values.setdefault('mglst_name', 'Mliečne výrobky')
+    return MGLSTRecord(parent_code=1, level=2, note='Chladené', description='Mlieko, syry', **values)
+
+
+def test_gscat_round_trip():
+    record = make_gscat()
+    data = record.to_bytes()
+    assert len(data) == GSCATRecord.RECORD_SIZE
+    decoded = GSCATRecord.from_bytes(data)
+    assert decoded == record
+    assert isinstance(decoded.price_buy, Money)
+    assert GSCATRecord.from_bytes(decoded.to_bytes()) == decoded
+
+
+def test_gscat_empty_dates_and_strings():
+    decoded = GSCATRecord.from_bytes(GSCATRecord(gs_code=1).to_bytes())
+    assert decoded.mod_date is None and decoded.created_date is None
+    assert decoded.gs_name == '' and decoded.note == ''
+    assert decoded.price_sell == Money(0)
+
+
+def test_gscat_name_does_not_overlap_bar_code():
+    record = make_gscat()
+    record.gs_name = 'N' * 80  # Longer than the field - truncated to 55 characters
+    data = bytearray(record.to_bytes())
+    data[GSCATRecord.BAR_CODE_OFFSET:GSCATRecord.BAR_CODE_OFFSET + 14] = b'\x0d8590000000017'
+    assert GSCATRecord.read_bar_code(bytes(data)) == '8590000000017'
+    assert GSCATRecord.from_bytes(bytes(data)).gs_name == 'N' * 55
+    assert GSCATRecord.read_bar_code(bytes(data[:60])) == ''
+
+
+def test_gscat_rejects_short_record():
+    with pytest.raises(ValueError, match='Invalid record size'):
+        GSCATRecord.from_bytes(bytes(100))
+
+
+def test_gscat_view_matches_record():
+    data = make_gscat().to_bytes()
+    view = GSCATView(data)
+    assert view.gs_name == "Mlieko polotučné 1l"
+    assert view.price_sell == Money.of('1.19')
+    assert view.to_record() == GSCATRecord.from_bytes(data)
+
+
+def test_compact_gscat_round_trip():
+    record = make_gscat()
+    compact = CompactGSCAT.from_bytes(record.to_bytes())
+    assert compact.price_buy_cents == 79
+    assert compact.to_record() == GSCATRecord.from_bytes(record.to_bytes())
+    assert CompactGSCAT.from_record(record).mod_date_days == compact.mod_date_days
+
+
+def test_barcode_round_trip():
+    record = BarcodeRecord(1234, '8590000000017', mod_date=datetime(2024, 5, 6), mod_time=MOD_TIME)
+    assert BarcodeRecord.from_bytes(record.to_bytes()) == record
+
+
+def test_mglst_full_record_round_trip():
+    record = make_mglst(mod_user='ADMIN', mod_date=datetime(2024, 12, 1), mod_time=MOD_TIME)
+    data = MGLST_LAYOUT.encode(record)
+    assert len(data) == MGLST_LAYOUT.record_size
+    assert MGLSTRecord.from_bytes(data) == record
+
+
+def test_mglst_short_record_uses_defaults():
+    """Records stored without the audit block (min_length) decode without it"""
+    full = make_mglst(mod_user='ADMIN', mod_date=datetime(2024, 12, 1))
+    data = MGLST_LAYOUT.encode(full)[:456]
+    decoded = MGLSTRecord.from_bytes(data)
+    assert decoded.mglst_name == 'Mliečne výrobky'
+    assert decoded.description == 'Mlieko, syry'
+    assert decoded.mod_user == '' and decoded.mod_date is None and decoded.mod_time is None
+
+    # min_length decides, not the field end - 470 bytes hold mod_date but not the whole block
+    assert MGLSTRecord.from_bytes(MGLST_LAYOUT.encode(full)[:470]).mod_date is None
+
+    view = MGLSTView(data)
+    assert view.mod_user == '' and view.mod_date is None
+    assert view.to_record() == decoded
+
+
+def test_mglst_minimum_size():
+    data = MGLST_LAYOUT.encode(make_mglst())
+    assert MGLSTRecord.from_bytes(data[:200]).mglst_code == 12
+    with pytest.raises(ValueError, match='expected >= 200'):
+        MGLSTRecord.from_bytes(data[:199])
+
+
+def test_layout_rejects_bad_declarations():
+    with pytest.raises(ValueError, match='overlaps'):
+        RecordLayout('T', 20, [Field('a', 0, INTEGER), Field('b', 2, INTEGER)])
+    with pytest.raises(ValueError, match='exceeds record size'):
+        RecordLayout('T', 20, [Field('a', 0, STRING, 30)])
+    with pytest.raises(ValueError, match='requires length'):
+        Field('a', 0, STRING)